@@ -0,0 +1,2 @@
+# Пакет с нагрузочными тестами и бенчмарками.
+# Запуск: python -m benchmarks.<модуль>
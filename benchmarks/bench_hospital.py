@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк горячих путей Hospital и HospitalApp.
+
+Для каждого размера больницы измеряются пропускная способность и перцентили
+задержки (p50/p90/p99/max) операций:
+    get_patient_status, set_patient_status, discharge (начало/середина/конец),
+    calculate_statistics и воспроизведение сценария команд через HospitalApp.
+Случайные ID берутся из генератора с фиксированным зерном, поэтому прогоны
+воспроизводимы; каждый замер повторяется --repeat раз и берётся лучший
+(как в timeit), чтобы сгладить шум машины. Результаты выводятся в JSON; с флагом --compare они сверяются
+с сохранённым эталоном, и регрессии отмечаются (код возврата 1).
+
+Запуск:
+    python -m benchmarks.bench_hospital --sizes 1000 100000 --output results.json
+    python -m benchmarks.bench_hospital --compare results.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from io import StringIO
+
+from hospital.app import HospitalApp
+from hospital.models import Hospital
+from hospital.numpy_backend import HAS_NUMPY
+from hospital.storage import ListStorage, ByteArrayStorage, PagedStorage, SparseStorage
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+STORAGES = {"list": ListStorage, "bytearray": ByteArrayStorage, "paged": PagedStorage,
+            "sparse": SparseStorage}
+if HAS_NUMPY:
+    from hospital.numpy_backend import NumpyStorage
+    STORAGES["numpy"] = NumpyStorage
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Перцентиль по отсортированной выборке (метод ближайшего ранга).
+    """
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def summarize(name, size, samples):
+    """
+    Сводка по выборке задержек одной операции.
+    :param samples: задержки отдельных вызовов в наносекундах
+    :return: словарь с результатом для JSON
+    """
+    samples = sorted(samples)
+    total = sum(samples) or 1
+    return {
+        "name": name,
+        "size": size,
+        "ops": len(samples),
+        "ops_per_sec": round(len(samples) * 1e9 / total, 1),
+        "p50_ns": percentile(samples, 0.50),
+        "p90_ns": percentile(samples, 0.90),
+        "p99_ns": percentile(samples, 0.99),
+        "max_ns": samples[-1],
+    }
+
+
+def measure(call, arguments):
+    """
+    Вызывает call для каждого набора аргументов и замеряет каждый вызов.
+    :return: список задержек в наносекундах
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    for args in arguments:
+        started = clock()
+        call(*args)
+        samples.append(clock() - started)
+    return samples
+
+
+class TimedApp(HospitalApp):
+    """
+    Приложение, замеряющее время выполнения каждой команды сценария.
+    """
+    def __init__(self, hospital):
+        super().__init__(hospital)
+        self.samples = []
+
+    def execute(self, command):
+        started = time.perf_counter_ns()
+        super().execute(command)
+        self.samples.append(time.perf_counter_ns() - started)
+
+
+def make_script(rng, size, commands):
+    """
+    Сценарий смены: смесь команд с корректными ID, каждая - отдельными строками.
+    """
+    lines = []
+    for _ in range(commands):
+        roll = rng.random()
+        patient_id = str(rng.randint(1, size))
+        if roll < 0.4:
+            lines += ["get status", patient_id]
+        elif roll < 0.6:
+            lines += ["status up", patient_id, "нет"]
+        elif roll < 0.8:
+            lines += ["status down", patient_id]
+        elif roll < 0.95:
+            lines += ["calculate statistics"]
+        else:
+            lines += ["discharge", str(rng.randint(1, max(1, size // 2)))]
+    return lines
+
+
+def bench_size(size, ops, storage, tombstones, rng):
+    """
+    Все замеры для одного размера больницы.
+    :return: список результатов
+    """
+    results = []
+    hospital = Hospital(size, storage=storage, tombstones=tombstones)
+    ids = [(rng.randint(1, size),) for _ in range(ops)]
+    results.append(summarize("get_patient_status", size,
+                             measure(hospital.get_patient_status, ids)))
+    updates = [(patient_id, rng.randrange(4)) for (patient_id,) in ids]
+    results.append(summarize("set_patient_status", size,
+                             measure(hospital.set_patient_status, updates)))
+    results.append(summarize("calculate_statistics", size,
+                             measure(hospital.calculate_statistics, [()] * ops)))
+
+    # Выписка сокращает базу, поэтому число выписок ограничено долей размера
+    discharges = max(1, min(ops, size // 10))
+    results.append(summarize("discharge_head", size,
+                             measure(hospital.discharge, [(1,)] * discharges)))
+    middle = [(len(hospital.patients) // 2 - i // 2,) for i in range(discharges)]
+    results.append(summarize("discharge_middle", size, measure(hospital.discharge, middle)))
+    tail = [(len(hospital.patients) - i,) for i in range(discharges)]
+    results.append(summarize("discharge_tail", size, measure(hospital.discharge, tail)))
+
+    app = TimedApp(Hospital(size, storage=storage, tombstones=tombstones))
+    app.run_script(make_script(rng, size, ops), out=StringIO())
+    results.append(summarize("app_replay", size, app.samples))
+    return results
+
+
+def run(sizes, ops, storage="list", tombstones=False, seed=0, repeat=3):
+    """
+    Полный прогон бенчмарка.
+    :return: словарь с метаданными и результатами (для JSON)
+    """
+    # Прогрев интерпретатора и аллокатора, результаты не учитываются
+    bench_size(min(sizes), ops, STORAGES[storage], tombstones, random.Random(seed))
+    results = []
+    for size in sizes:
+        best = {}
+        for _ in range(repeat):
+            # Одинаковое зерно в каждом повторе - одинаковые операции
+            for item in bench_size(size, ops, STORAGES[storage], tombstones,
+                                   random.Random(seed + size)):
+                if item["name"] not in best or item["ops_per_sec"] > best[item["name"]]["ops_per_sec"]:
+                    best[item["name"]] = item
+        results.extend(best.values())
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "storage": storage,
+            "tombstones": tombstones,
+            "ops": ops,
+            "repeat": repeat,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Сверяет результаты с эталоном.
+    Регрессия - падение пропускной способности или рост p99 больше чем на threshold.
+    :return: список описаний регрессий
+    """
+    reference = {(item["name"], item["size"]): item for item in baseline["results"]}
+    regressions = []
+    for item in current["results"]:
+        base = reference.get((item["name"], item["size"]))
+        if base is None:
+            continue
+        if item["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{item['name']}[{item['size']}]: ops_per_sec "
+                f"{base['ops_per_sec']} -> {item['ops_per_sec']}")
+        if item["p99_ns"] > base["p99_ns"] * (1 + threshold):
+            regressions.append(
+                f"{item['name']}[{item['size']}]: p99_ns {base['p99_ns']} -> {item['p99_ns']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк Hospital и HospitalApp")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--ops", type=int, default=2000, help="замеров на операцию")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="list")
+    parser.add_argument("--tombstones", action="store_true", help="выписка через TombstoneStorage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера")
+    parser.add_argument("--output", metavar="FILE", help="сохранить результаты в JSON-файл")
+    parser.add_argument("--compare", metavar="FILE", help="сравнить с эталонным JSON-файлом")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое ухудшение при сравнении (доля, по умолчанию 0.2)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.ops, args.storage, args.tombstones, args.seed, args.repeat)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк разбора однострочных команд (hospital.commands).
+
+Измеряются:
+    parse_command     - только разбор строки вида «status up 42» / «get status 1-10»;
+    two_line_command  - команда и ID отдельными строками (прежний путь через read_patient_id);
+    one_line_command  - та же команда одной строкой;
+    one_line_batch    - «get status» / «discharge» с несколькими ID (одна пакетная операция).
+Накладные расходы разбора на команду - разница средних one_line_command и two_line_command
+(поле overhead_ns в JSON).
+
+Запуск:
+    python -m benchmarks.bench_parser --ops 20000
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from io import StringIO
+
+from benchmarks.bench_hospital import TimedApp, measure, summarize
+from hospital.commands import parse_command
+from hospital.models import Hospital
+
+# Команды без запроса подтверждения, чтобы обе формы читали одинаковый ввод
+COMMANDS = ("get status", "status down")
+
+
+def make_lines(rng, size, ops):
+    """
+    Пары (двухстрочная форма, однострочная форма) одних и тех же команд.
+    """
+    pairs = []
+    for _ in range(ops):
+        command = rng.choice(COMMANDS)
+        patient_id = str(rng.randint(1, size))
+        pairs.append(([command, patient_id], f"{command} {patient_id}"))
+    return pairs
+
+
+def replay(size, lines):
+    """
+    Выполняет сценарий и возвращает задержки отдельных команд.
+    """
+    app = TimedApp(Hospital(size))
+    app.run_script(lines, out=StringIO())
+    return app.samples
+
+
+def run(size=10000, ops=5000, batch=10, seed=0):
+    """
+    :return: словарь с метаданными и результатами (для JSON)
+    """
+    rng = random.Random(seed)
+    pairs = make_lines(rng, size, ops)
+    two_line = [line for lines, _ in pairs for line in lines]
+    one_line = [line for _, line in pairs]
+    ranges = []
+    for _ in range(ops):
+        first = rng.randint(1, size - batch)
+        ranges.append(f"get status {first}-{first + batch - 1}")
+
+    # Прогрев, результаты не учитываются
+    replay(size, one_line[:100])
+    results = [
+        summarize("parse_command", size,
+                  measure(parse_command, [(line,) for line in one_line + ranges])),
+        summarize("two_line_command", size, replay(size, two_line)),
+        summarize("one_line_command", size, replay(size, one_line)),
+        summarize("one_line_batch", size, replay(size, ranges)),
+    ]
+    # Каждая выписка убирает двоих, поэтому их число ограничено четвертью размера
+    discharges = []
+    for _ in range(max(1, min(ops, size // 4))):
+        first = rng.randint(1, size // 2 - 1)
+        discharges.append(f"discharge {first},{first + 1}")
+    results.append(summarize("one_line_batch_discharge", size, replay(size, discharges)))
+    mean = {item["name"]: 1e9 / item["ops_per_sec"] for item in results}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "ops": ops,
+            "batch": batch,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "overhead_ns": round(mean["one_line_command"] - mean["two_line_command"], 1),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк однострочных команд")
+    parser.add_argument("--size", type=int, default=10000, help="пациентов в больнице")
+    parser.add_argument("--ops", type=int, default=5000, help="команд в каждом замере")
+    parser.add_argument("--batch", type=int, default=10, help="ID в пакетной команде")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.size, args.ops, args.batch, args.seed), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк времени запуска main.py: холодный запуск против клиента демона.
+
+Для одной команды измеряется время от запуска процесса до его завершения:
+    interpreter   - пустой запуск интерпретатора (python -c pass), нижняя граница;
+    cold          - python main.py --script - : запуск интерпретатора, импорт пакета
+                    hospital, создание Hospital(200) и выполнение команды;
+    warm_client   - python main.py --client SOCKET "команда" при запущенном демоне
+                    (python main.py --daemon SOCKET), который держит больницу в памяти;
+    send_commands - та же команда через main.send_commands из уже запущенного процесса
+                    (только обмен с демоном, без запуска интерпретатора).
+Ответы холодного запуска и клиента сверяются (поле same_output), поэтому команда
+по умолчанию не меняет базу.
+
+Запуск:
+    python -m benchmarks.bench_startup --runs 50
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import main as entry
+from benchmarks.bench_hospital import measure, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+
+def run_process(args, text=""):
+    """
+    Запускает процесс и ждёт завершения.
+    :return: стандартный вывод процесса
+    """
+    return subprocess.run(args, input=text, capture_output=True, check=True, cwd=ROOT,
+                          text=True, encoding="utf-8").stdout
+
+
+def start_daemon(path, timeout=10.0):
+    """
+    Запускает демон и ждёт, пока он начнёт принимать подключения.
+    :return: объект subprocess.Popen
+    :raises RuntimeError: если демон не запустился за timeout секунд
+    """
+    daemon = subprocess.Popen([sys.executable, MAIN, "--daemon", path], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if daemon.poll() is not None:
+            break
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(path)
+            return daemon
+        except OSError:
+            time.sleep(0.01)
+    daemon.kill()
+    daemon.wait()
+    raise RuntimeError(f"Ошибка. Демон не запустился на сокете {path}")
+
+
+def run(runs=20, command="get status 1"):
+    """
+    :param runs: запусков каждого варианта
+    :param command: строка команды
+    :return: словарь с метаданными и результатами (для JSON)
+    """
+    python = sys.executable
+    variants = {
+        "interpreter": ([python, "-c", "pass"], ""),
+        "cold": ([python, MAIN, "--script", "-"], command + "\n"),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hospital.sock")
+        daemon = start_daemon(path)
+        try:
+            variants["warm_client"] = ([python, MAIN, "--client", path, command], "")
+            outputs = {}
+            results = []
+            for name, (args, text) in variants.items():
+                # Прогрев (компиляция .pyc, кэш файловой системы), результаты не учитываются
+                outputs[name] = run_process(args, text)
+                results.append(summarize(name, runs, measure(run_process, [(args, text)] * runs)))
+            results.append(summarize("send_commands", runs,
+                                     measure(entry.send_commands, [(path, [command])] * runs)))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    mean = {item["name"]: 1e9 / item["ops_per_sec"] for item in results}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "runs": runs,
+            "command": command,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "same_output": outputs["cold"] == outputs["warm_client"],
+        "speedup": round(mean["cold"] / mean["warm_client"], 2),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска main.py")
+    parser.add_argument("--runs", type=int, default=20, help="запусков каждого варианта")
+    parser.add_argument("--command", default="get status 1", help="строка команды")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.runs, args.command), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Генератор нагрузки и длительный (soak) тест HospitalApp.
+
+Синтезирует поток однострочных команд с заданной смесью видов
+(узнать статус, повысить, понизить, выписать, статистика, ошибочный ввод)
+и выполняет их через HospitalApp.execute - тот же путь, что и ввод с консоли.
+Поддерживается целевая частота команд (--rate); без неё команды идут подряд.
+
+Каждые --report-every секунд выводится строка JSON в stderr, в конце - итоговый JSON:
+    - пропускная способность;
+    - хвосты задержки (p50/p90/p99/p99.9/max). При заданной частоте задержка
+      отсчитывается от запланированного момента команды, поэтому отставание
+      от графика тоже попадает в хвост; время самой команды - в поле service;
+    - рост памяти по tracemalloc относительно конца первого интервала
+      (tracemalloc замедляет работу, отключается флагом --no-trace-memory);
+    - нарушения инвариантов: сумма статистики не равна числу пациентов,
+      отрицательные счётчики, расхождение счётчиков с полным пересчётом
+      (на границах интервалов), исключения при выполнении команд.
+Код возврата 1, если были нарушения.
+
+Выписка уменьшает больницу, поэтому при --min-size пациентов и меньше
+выписки заменяются командой «узнать статус».
+
+Запуск:
+    python -m benchmarks.loadgen --size 100000 --duration 3600 --rate 2000
+    python -m benchmarks.loadgen --mix get=50,up=20,down=20,stats=5,invalid=5 --ops 100000
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_hospital import STORAGES
+from hospital.app import HospitalApp
+from hospital.metrics import LatencyHistogram
+from hospital.models import Hospital
+from hospital.output import BufferedSink
+
+# Смесь по умолчанию: вид команды -> относительный вес
+DEFAULT_MIX = {"get": 40, "up": 20, "down": 20, "discharge": 2, "stats": 10, "invalid": 8}
+# Сколько первых нарушений сохранять в отчёте
+MAX_VIOLATION_SAMPLES = 10
+
+
+def parse_mix(text):
+    """
+    Разбирает смесь команд вида «get=40,up=20,stats=5».
+    :return: словарь {вид команды: вес}
+    :raises ValueError: неизвестный вид, некорректный или отрицательный вес, все веса нулевые
+    """
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"Ошибка. Неизвестный вид команды: {kind!r}")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise ValueError(f"Ошибка. Некорректный вес команды {kind}: {weight!r}") from None
+        if mix[kind] < 0:
+            raise ValueError(f"Ошибка. Отрицательный вес команды {kind}")
+    if not any(mix.values()):
+        raise ValueError("Ошибка. Все веса смеси команд нулевые")
+    return mix
+
+
+class CommandMix:
+    """
+    Источник случайных однострочных команд с заданными весами видов.
+    """
+    def __init__(self, mix, rng):
+        """
+        :param mix: словарь {вид команды: вес}
+        :param rng: генератор случайных чисел (random.Random)
+        """
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.rng = rng
+
+    def next(self, size, allow_discharge=True):
+        """
+        :param size: текущее число пациентов
+        :param allow_discharge: можно ли выписывать (иначе выписка заменяется запросом статуса)
+        :return: пара (вид команды, строка команды)
+        """
+        rng = self.rng
+        kind = rng.choices(self.kinds, self.weights)[0]
+        if kind == "discharge" and not allow_discharge:
+            kind = "get"
+        if kind == "stats":
+            return kind, "calculate statistics"
+        if kind == "invalid":
+            return kind, rng.choice((
+                f"get status {size + rng.randint(1, 1000)}",
+                "status up 0",
+                "status down abc",
+                f"discharge {rng.randint(2, 1000)}-1",
+                "выписать всех пациентов",
+            ))
+        patient_id = rng.randint(1, size) if size else 1
+        if kind == "get":
+            return kind, f"get status {patient_id}"
+        if kind == "up":
+            # У «Готов к выписке» повышение спрашивает подтверждение; выписку задаёт вид discharge
+            return kind, f"status up {patient_id} нет"
+        if kind == "down":
+            return kind, f"status down {patient_id}"
+        return kind, f"discharge {patient_id}"
+
+
+class NullStream:
+    """
+    Поток, отбрасывающий вывод приложения (считается только объём).
+    """
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+        return len(text)
+
+
+def check_invariants(hospital, full=False):
+    """
+    Проверяет согласованность больницы.
+    :param full: также сверить счётчики с полным пересчётом (проход по всей базе)
+    :return: список описаний нарушений
+    """
+    violations = []
+    stats = hospital.calculate_statistics()
+    total = sum(stats.values())
+    if total != len(hospital):
+        violations.append(f"сумма статистики {total} не равна числу пациентов {len(hospital)}")
+    if any(count < 0 for count in stats.values()):
+        violations.append(f"отрицательный счётчик в {stats}")
+    if full:
+        actual = hospital.recalculate_statistics()
+        if actual != stats:
+            violations.append(f"счётчики {stats} расходятся с пересчётом {actual}")
+    return violations
+
+
+def latency_summary(histogram):
+    """
+    :return: словарь перцентилей гистограммы задержек в наносекундах
+    """
+    return {
+        "p50_ns": histogram.percentile(0.50),
+        "p90_ns": histogram.percentile(0.90),
+        "p99_ns": histogram.percentile(0.99),
+        "p999_ns": histogram.percentile(0.999),
+        "max_ns": histogram.max,
+    }
+
+
+def run(size=10000, duration=10.0, rate=0.0, mix=None, ops=None, seed=0, storage="list",
+        report_every=5.0, check_every=1000, min_size=None, trace_memory=True,
+        on_report=None, clock=time.perf_counter_ns, sleep=time.sleep):
+    """
+    Один прогон генератора нагрузки.
+    :param size: пациентов в больнице на старте
+    :param duration: длительность в секундах (None - до ops команд или Ctrl+C)
+    :param rate: целевая частота команд в секунду (0 - без ограничения)
+    :param mix: словарь {вид команды: вес} (по умолчанию DEFAULT_MIX)
+    :param ops: предельное число команд (None - без ограничения)
+    :param storage: имя хранилища из benchmarks.bench_hospital.STORAGES
+    :param report_every: длина интервала отчёта в секундах
+    :param check_every: проверять сумму статистики каждые check_every команд
+    :param min_size: не выписывать, если пациентов столько или меньше (по умолчанию size // 2)
+    :param trace_memory: замерять память через tracemalloc
+    :param on_report: функция, получающая словарь каждого интервала
+    :return: словарь с итоговым отчётом (для JSON)
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    min_size = size // 2 if min_size is None else min_size
+    rng = random.Random(seed)
+    commands = CommandMix(mix, rng)
+    stream = NullStream()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    hospital = Hospital(size, storage=STORAGES[storage])
+    app = HospitalApp(hospital, output=BufferedSink(stream, flush_every=1000))
+
+    latency, service = LatencyHistogram(), LatencyHistogram()
+    counts = dict.fromkeys(mix, 0)
+    violations = []
+    violation_count = 0
+    intervals = []
+    memory = {"baseline": None, "current": None, "peak": None}
+
+    def violate(found):
+        nonlocal violation_count
+        violation_count += len(found)
+        violations.extend(found[:MAX_VIOLATION_SAMPLES - len(violations)])
+
+    def report(now, interval, interval_ops, interval_started):
+        violate(check_invariants(hospital, full=True))
+        elapsed = (now - interval_started) / 1e9
+        item = {
+            "elapsed_s": round((now - started) / 1e9, 3),
+            "ops": done,
+            "ops_per_sec": round(interval_ops / elapsed, 1) if elapsed > 0 else 0.0,
+            **latency_summary(interval),
+            "ward_size": len(hospital),
+            "violations": violation_count,
+        }
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if memory["baseline"] is None:
+                memory["baseline"] = current
+            memory["current"], memory["peak"] = current, peak
+            item["memory_bytes"] = current
+            item["memory_growth_bytes"] = current - memory["baseline"]
+        intervals.append(item)
+        if on_report is not None:
+            on_report(item)
+
+    interval = LatencyHistogram()
+    step = 1e9 / rate if rate else 0
+    report_ns = int(report_every * 1e9)
+    done = 0
+    started = clock()
+    deadline = None if duration is None else started + int(duration * 1e9)
+    interval_started = scheduled = started
+    interval_ops = 0
+    try:
+        while (ops is None or done < ops) and (deadline is None or clock() < deadline):
+            kind, line = commands.next(len(hospital), len(hospital) > min_size)
+            if step:
+                scheduled += step
+                ahead = scheduled - clock()
+                if ahead > 0:
+                    sleep(ahead / 1e9)
+                begin = clock()
+            else:
+                begin = scheduled = clock()
+            try:
+                app.execute(line)
+            except Exception as error:
+                violate([f"исключение в команде {line!r}: {error!r}"])
+            end = clock()
+            # Часы сна неточны: команда могла начаться чуть раньше запланированного
+            delay = max(0, end - int(scheduled))
+            latency.record(delay)
+            interval.record(delay)
+            service.record(end - begin)
+            counts[kind] = counts.get(kind, 0) + 1
+            done += 1
+            interval_ops += 1
+            if check_every and done % check_every == 0:
+                violate(check_invariants(hospital))
+            if end - interval_started >= report_ns:
+                report(end, interval, interval_ops, interval_started)
+                interval, interval_ops, interval_started = LatencyHistogram(), 0, end
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.output.flush()
+        end = clock()
+        if interval_ops or not intervals:
+            report(end, interval, interval_ops, interval_started)
+        if started_tracing:
+            tracemalloc.stop()
+
+    elapsed = (end - started) / 1e9
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "size": size,
+            "storage": storage,
+            "rate": rate,
+            "mix": mix,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "ops": done,
+        "elapsed_s": round(elapsed, 3),
+        "ops_per_sec": round(done / elapsed, 1) if elapsed > 0 else 0.0,
+        "commands": counts,
+        "latency": latency_summary(latency),
+        "service": latency_summary(service),
+        "memory": {
+            "baseline_bytes": memory["baseline"],
+            "current_bytes": memory["current"],
+            "peak_bytes": memory["peak"],
+            "growth_bytes": (None if memory["baseline"] is None
+                             else memory["current"] - memory["baseline"]),
+        },
+        "output_chars": stream.size,
+        "ward_size": len(hospital),
+        "violations": violation_count,
+        "violation_samples": violations,
+        "intervals": intervals,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для HospitalApp")
+    parser.add_argument("--size", type=int, default=10000, help="пациентов на старте")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="длительность в секундах (0 - до --ops или Ctrl+C)")
+    parser.add_argument("--ops", type=int, help="предельное число команд")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="целевая частота команд в секунду (0 - без ограничения)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="веса видов команд, например get=40,up=20,down=20,discharge=2,"
+                             "stats=10,invalid=8")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="list")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-every", type=float, default=5.0, help="интервал отчёта в секундах")
+    parser.add_argument("--check-every", type=int, default=1000,
+                        help="проверять сумму статистики каждые N команд (0 - только в отчётах)")
+    parser.add_argument("--min-size", type=int, help="не выписывать ниже этого числа пациентов")
+    parser.add_argument("--no-trace-memory", action="store_true", help="не включать tracemalloc")
+    parser.add_argument("--output", metavar="FILE", help="сохранить итоговый отчёт в JSON-файл")
+    args = parser.parse_args(argv)
+
+    report = run(args.size, args.duration or None, args.rate, args.mix, args.ops, args.seed,
+                 args.storage, args.report_every, args.check_every, args.min_size,
+                 not args.no_trace_memory,
+                 on_report=lambda item: print(json.dumps(item, ensure_ascii=False),
+                                              file=sys.stderr, flush=True))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    for violation in report["violation_samples"]:
+        print(f"НАРУШЕНИЕ: {violation}", file=sys.stderr)
+    return 1 if report["violations"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
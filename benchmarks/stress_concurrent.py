@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест потокобезопасной больницы (ConcurrentHospital).
+
+Каждый поток-«стойка приёма» владеет своим непересекающимся набором пациентов
+и выполняет над ними случайную смесь операций (смена статуса, чтение, выписка),
+а отдельные потоки-читатели постоянно запрашивают статистику. Проверяется:
+    - каждое чтение своего пациента возвращает последнее записанное значение;
+    - итоговая база совпадает с последовательной моделью операций;
+    - наблюдаемое число пациентов в статистике только убывает;
+    - итоговая статистика совпадает с полным пересчётом.
+Затем выводится пропускная способность для разного числа потоков.
+
+Запуск: python -m benchmarks.stress_concurrent [--patients N] [--ops N] [--threads 1 2 4 8]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from hospital.concurrent import ConcurrentHospital
+from hospital.storage import ByteArrayStorage
+
+
+def run_desk(hospital, patient_ids, ops, seed, errors):
+    """
+    Работа одной стойки: случайные операции над своими пациентами.
+    :return: словарь {ID: ожидаемый статус или None, если выписан}
+    """
+    rng = random.Random(seed)
+    expected = {patient_id: 1 for patient_id in patient_ids}
+    alive = list(patient_ids)
+    for _ in range(ops):
+        if not alive:
+            break
+        patient_id = rng.choice(alive)
+        roll = rng.random()
+        if roll < 0.6:
+            status = rng.randrange(4)
+            hospital.set_patient_status(patient_id, status)
+            expected[patient_id] = status
+        elif roll < 0.95:
+            status = hospital.get_patient_status(patient_id)
+            if status != expected[patient_id]:
+                errors.append(f"ID {patient_id}: прочитано {status}, ожидалось {expected[patient_id]}")
+        else:
+            hospital.discharge(patient_id)
+            expected[patient_id] = None
+            alive.remove(patient_id)
+    return expected
+
+
+def run_reader(hospital, stop, errors):
+    """
+    Читатель статистики: число пациентов не должно расти, счётчики - быть отрицательными.
+    """
+    previous = None
+    while not stop.is_set():
+        stats = hospital.calculate_statistics()
+        total = sum(stats.values())
+        if any(count < 0 for count in stats.values()):
+            errors.append(f"отрицательный счётчик в {stats}")
+        if previous is not None and total > previous:
+            errors.append(f"число пациентов выросло: {previous} -> {total}")
+        previous = total
+
+
+def stress(patients, ops, threads, readers=1, seed=0):
+    """
+    Один прогон: threads стоек и readers читателей над общей больницей.
+    :return: (операций в секунду, список нарушений)
+    """
+    hospital = ConcurrentHospital(patients, storage=ByteArrayStorage, stable_ids=True)
+    ids = list(range(1, patients + 1))
+    random.Random(seed).shuffle(ids)
+    shares = [ids[i::threads] for i in range(threads)]
+    results = [None] * threads
+    errors = []
+    stop = threading.Event()
+
+    def desk(index):
+        results[index] = run_desk(hospital, shares[index], ops, seed + index, errors)
+
+    workers = [threading.Thread(target=desk, args=(i,)) for i in range(threads)]
+    watchers = [threading.Thread(target=run_reader, args=(hospital, stop, errors))
+                for _ in range(readers)]
+    for thread in watchers:
+        thread.start()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in watchers:
+        thread.join()
+
+    for expected in results:
+        for patient_id, status in expected.items():
+            if status is None:
+                if hospital.has_patient(patient_id):
+                    errors.append(f"ID {patient_id} должен быть выписан")
+            elif hospital.get_patient_status(patient_id) != status:
+                errors.append(f"ID {patient_id}: итоговый статус не совпал с моделью")
+    if hospital.calculate_statistics() != hospital.recalculate_statistics():
+        errors.append("итоговая статистика расходится с пересчётом")
+    return threads * ops / elapsed, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест ConcurrentHospital")
+    parser.add_argument("--patients", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=20_000, help="операций на поток")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'потоков':>8} {'оп/с':>12} {'ускорение':>10}")
+    baseline = None
+    failed = False
+    for threads in args.threads:
+        throughput, errors = stress(args.patients, args.ops, threads, seed=args.seed)
+        baseline = baseline or throughput
+        print(f"{threads:>8} {throughput:>12.0f} {throughput / baseline:>10.2f}")
+        for error in errors[:10]:
+            print(f"  нарушение: {error}")
+        failed = failed or bool(errors)
+    # В CPython операции над базой выполняются под GIL, поэтому ускорение
+    # ограничено; тест прежде всего подтверждает корректность под нагрузкой.
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
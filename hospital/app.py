@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """
 Модуль приложения для управления больницей.
-Содержит класс HospitalApp, реализующий консольное взаимодействие с пользователем.
+Содержит класс HospitalApp, реализующий консольное взаимодействие с пользователем
+и пакетный режим выполнения сценариев команд. Ответы выводятся через приёмник
+вывода из hospital.output.
 """
 
+import sys
+from collections import deque
+
+from hospital.commands import parse_command
 from hospital.models import Hospital, STATUS_TEXT
+from hospital.output import BufferedSink, ConsoleSink, Templates
 
 
 class HospitalApp:
@@ -12,9 +19,15 @@ class HospitalApp:
     Класс приложения для управления больницей.
     Обрабатывает команды пользователя и взаимодействует с модулем управления пациентами (Hospital).
     """
-    def __init__(self):
-        self.hospital = Hospital(200)
+    def __init__(self, hospital=None, output=None):
+        """
+        :param hospital: больница, с которой работает приложение
+            (по умолчанию - новая больница на 200 пациентов)
+        :param output: приёмник вывода (по умолчанию - ConsoleSink)
+        """
+        self.hospital = Hospital(200) if hospital is None else hospital
         self.status_text = STATUS_TEXT
+        self.output = ConsoleSink() if output is None else output
         # Словарь доступных команд (на русском и английском) и соответствующих методов.
         self.commands = {
             "узнать статус пациента": self.cmd_get_status,
@@ -31,34 +44,158 @@ class HospitalApp:
             "stop": self.cmd_stop,
         }
         self.running = True
+        # В пакетном режиме: итератор строк сценария.
+        self._script = None
+        # Тексты ответов для self.status_text и кэш отчёта статистики:
+        # ((больница, версия гистограммы, тексты), строки отчёта)
+        self._templates = None
+        self._report = None
+        # Аргументы однострочной команды, которые обработчик прочитает вместо ввода.
+        self._queued = deque()
 
     def run(self):
         """
         Основной цикл обработки команд пользователя.
         """
         while self.running:
-            command = input("Введите команду: ").strip().lower()
-            if command in self.commands:
-                self.commands[command]()
-            else:
-                print("Неизвестная команда! Попробуйте ещё раз")
+            self.execute(self.read_line("Введите команду: "))
+
+    def run_script(self, lines, out=None, flush_every=1000):
+        """
+        Пакетный режим: выполняет сценарий команд без приглашений ввода.
+        Строки сценария обрабатываются потоково, вывод копится в BufferedSink
+        и записывается пачками по flush_every строк.
+        Результат совпадает с вводом тех же строк в интерактивном режиме.
+        :param lines: итерируемый источник строк (файл, sys.stdin, список)
+        :param out: поток вывода (по умолчанию sys.stdout)
+        :param flush_every: размер пачки вывода в строках
+        """
+        previous = self.output
+        self.output = BufferedSink(out or sys.stdout, flush_every)
+        self._script = (line.rstrip("\r\n") for line in lines)
+        try:
+            while self.running:
+                try:
+                    self.execute(self.read_line("Введите команду: "))
+                except EOFError:
+                    # Сценарий закончился (в том числе посреди многошаговой команды)
+                    break
+        finally:
+            self.output.flush()
+            self.output = previous
+            self._script = None
+
+    def execute(self, command):
+        """
+        Выполняет одну команду из таблицы self.commands.
+        Команды с ID пациентов можно записать одной строкой (см. hospital.commands):
+        «status up 42», «выписать пациента 7,8,9», «get status 10-20».
+        :param command: строка команды в том виде, как её ввёл пользователь
+        """
+        command = command.strip().lower()
+        handler = self.commands.get(command)
+        if handler is not None:
+            handler()
+            return
+        try:
+            parsed = parse_command(command)
+        except ValueError as e:
+            self.write(str(e))
+            return
+        if parsed is None or parsed.name not in self.commands:
+            self.write("Неизвестная команда! Попробуйте ещё раз")
+        else:
+            self.run_command(parsed)
+
+    def run_command(self, command):
+        """
+        Выполняет разобранную однострочную команду.
+        Несколько ID в «узнать статус» и «выписать» обрабатываются одной пакетной
+        операцией: все ID проверяются заранее и относятся к состоянию до команды.
+        Повышение и понижение статуса выполняются по очереди для каждого ID, как если
+        бы команда вводилась отдельно; при нескольких ID запрос подтверждения выписки
+        без ответа в строке считается ответом «нет».
+        :param command: объект Command
+        """
+        ids = command.ids
+        if len(ids) > 1 and command.kind == "get":
+            try:
+                statuses = self.hospital.get_statuses(ids)
+            except ValueError as e:
+                self.write(str(e))
+                return
+            quoted = self._messages().quoted
+            for patient_id, status in zip(ids, statuses):
+                self.write(f'Статус пациента {patient_id}: {quoted[status]}')
+            return
+        if len(ids) > 1 and command.kind == "discharge":
+            try:
+                self.hospital.discharge_many(ids)
+            except ValueError as e:
+                self.write(str(e))
+                return
+            self.write(f"Пациенты выписаны из больницы: {len(set(ids))} чел.")
+            return
+        handler = self.commands[command.name]
+        answer = command.answer or ("нет" if len(ids) > 1 else None)
+        for patient_id in ids:
+            self._queued.append(str(patient_id))
+            if answer is not None:
+                self._queued.append(answer)
+            try:
+                handler()
+            finally:
+                self._queued.clear()
+
+    def read_line(self, prompt):
+        """
+        Считывает строку ввода: из сценария в пакетном режиме, иначе с консоли.
+        :param prompt: приглашение ввода (в пакетном режиме не выводится)
+        :return: строка ввода
+        :raises EOFError: если ввод закончился
+        """
+        if self._queued:
+            return self._queued.popleft()
+        if self._script is None:
+            return input(prompt)
+        try:
+            return next(self._script)
+        except StopIteration:
+            raise EOFError from None
+
+    def write(self, text):
+        """
+        Выводит строку ответа в приёмник self.output.
+        :param text: строка ответа
+        """
+        self.output.write(text)
+
+    def _messages(self):
+        """
+        :return: объект Templates для текущей таблицы self.status_text
+            (пересоздаётся, если таблицу заменили)
+        """
+        templates = self._templates
+        if templates is None or templates.status_text is not self.status_text:
+            templates = self._templates = Templates(self.status_text)
+        return templates
 
     def read_patient_id(self):
         """
         Считывает ID пациента с консоли и проверяет корректность.
         :return: ID пациента (целое число) или None в случае ошибки
         """
-        pid_str = input("Введите ID пациента: ").strip()
+        pid_str = self.read_line("Введите ID пациента: ").strip()
         try:
             pid = int(pid_str)
             if pid <= 0:
                 raise ValueError
-            if pid > len(self.hospital.patients):
-                print("Ошибка. В больнице нет пациента с таким ID")
+            if not self.hospital.has_patient(pid):
+                self.write("Ошибка. В больнице нет пациента с таким ID")
                 return None
             return pid
         except ValueError:
-            print("Ошибка. ID пациента должно быть числом (целым, положительным)")
+            self.write("Ошибка. ID пациента должно быть числом (целым, положительным)")
             return None
 
     def cmd_get_status(self):
@@ -71,9 +208,9 @@ class HospitalApp:
             return
         try:
             status_code = self.hospital.get_patient_status(pid)
-            print(f'Статус пациента: "{self.status_text[status_code]}"')
+            self.write(self._messages().status[status_code])
         except ValueError as e:
-            print(e)
+            self.write(str(e))
 
     def cmd_status_up(self):
         """
@@ -87,21 +224,21 @@ class HospitalApp:
         try:
             current_status = self.hospital.get_patient_status(pid)
         except ValueError as e:
-            print(e)
+            self.write(str(e))
             return
         if current_status < 3:
             new_status = current_status + 1
             self.hospital.set_patient_status(pid, new_status)
-            print(f'Новый статус пациента: "{self.status_text[new_status]}"')
+            self.write(self._messages().new_status[new_status])
         else:
-            answer = input("Желаете этого клиента выписать? (да/нет): ").strip().lower()
+            answer = self.read_line("Желаете этого клиента выписать? (да/нет): ").strip().lower()
             if answer == "да":
                 self.hospital.discharge(pid)
-                print("Пациент выписан из больницы")
+                self.write("Пациент выписан из больницы")
             elif answer == "нет":
-                print(f'Пациент остался в статусе "{self.status_text[current_status]}"')
+                self.write(self._messages().stayed[current_status])
             else:
-                print(f'Пациент остался в статусе "{self.status_text[current_status]}"')
+                self.write(self._messages().stayed[current_status])
 
     def cmd_status_down(self):
         """
@@ -115,14 +252,14 @@ class HospitalApp:
         try:
             current_status = self.hospital.get_patient_status(pid)
         except ValueError as e:
-            print(e)
+            self.write(str(e))
             return
         if current_status > 0:
             new_status = current_status - 1
             self.hospital.set_patient_status(pid, new_status)
-            print(f'Новый статус пациента: "{self.status_text[new_status]}"')
+            self.write(self._messages().new_status[new_status])
         else:
-            print("Ошибка. Нельзя понизить самый низкий статус (наши пациенты не умирают)")
+            self.write("Ошибка. Нельзя понизить самый низкий статус (наши пациенты не умирают)")
 
     def cmd_discharge(self):
         """
@@ -134,27 +271,34 @@ class HospitalApp:
             return
         try:
             self.hospital.discharge(pid)
-            print("Пациент выписан из больницы")
+            self.write("Пациент выписан из больницы")
         except ValueError as e:
-            print(e)
+            self.write(str(e))
 
     def cmd_calculate_statistics(self):
         """
         Обработка команды "рассчитать статистику" / "calculate statistics".
         Выводит статистику по количеству пациентов в каждом статусе.
+        Готовый отчёт кэшируется и строится заново, только если гистограмма
+        изменилась (по stats_version больницы). В режиме проверки статистики
+        и у больниц без stats_version отчёт строится каждый раз.
         """
-        stats = self.hospital.calculate_statistics()
-        total = len(self.hospital.patients)
-        print(f'В больнице на данный момент находится {total} чел., из них:')
-        for code in sorted(self.status_text.keys()):
-            count = stats.get(code, 0)
-            if count > 0:
-                print(f'\t- в статусе "{self.status_text[code]}": {count} чел.')
+        hospital = self.hospital
+        # Версия читается до расчёта: изменение во время расчёта лишь сбросит кэш
+        version = getattr(hospital, "stats_version", None)
+        templates = self._messages()
+        key = (hospital, version, templates)
+        if (version is None or getattr(hospital, "check_statistics", False)
+                or self._report is None or self._report[0] != key):
+            report = templates.report(len(hospital), hospital.calculate_statistics())
+            self._report = (key, report)
+        for line in self._report[1]:
+            self.write(line)
 
     def cmd_stop(self):
         """
         Обработка команды "стоп" / "stop".
         Завершает сеанс работы приложения.
         """
-        print("Сеанс завершён.")
+        self.write("Сеанс завершён.")
         self.running = False
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Модуль однострочных команд.
+Содержит разбор строк вида «status up 42», «выписать пациента 7,8,9» или
+«get status 10-20» в объекты Command. Грамматика компилируется в одно
+регулярное выражение при импорте модуля.
+"""
+
+import re
+
+# Команды, после которых в той же строке можно указать ID пациентов, и их вид.
+PATIENT_COMMANDS = {
+    "узнать статус пациента": "get",
+    "get status": "get",
+    "повысить статус пациента": "up",
+    "status up": "up",
+    "понизить статус пациента": "down",
+    "status down": "down",
+    "выписать пациента": "discharge",
+    "discharge": "discharge",
+}
+
+# Ответы на запрос подтверждения выписки.
+ANSWERS = ("да", "нет")
+
+# Наибольшее число ID в одной команде (после раскрытия диапазонов): короткая строка
+# «get status 1-20000000» не должна занимать память и время на миллионы ID.
+MAX_IDS = 10000
+
+_ID = r"\d+(?:\s*-\s*\d+)?"
+_NAMES = "|".join(re.escape(name) for name in sorted(PATIENT_COMMANDS, key=len, reverse=True))
+# Разделитель ID: запятая с пробелами вокруг или только пробелы. Ветви не пересекаются
+# (первая требует запятую), поэтому каждая строка разбирается единственным способом
+# и неподходящая строка отвергается за линейное время, без перебора вариантов.
+_SEPARATOR = r"(?:\s*,\s*|\s+)"
+# Имя команды, затем ID или диапазоны через запятую или пробел, затем необязательный ответ.
+_LINE = re.compile(
+    rf"(?P<name>{_NAMES})\s+(?P<ids>{_ID}(?:{_SEPARATOR}{_ID})*)(?:\s+(?P<answer>{'|'.join(ANSWERS)}))?")
+# Строка, начинающаяся с имени команды (для сообщения о неверных аргументах).
+_PREFIX = re.compile(rf"(?P<name>{_NAMES})\s")
+_RANGE = re.compile(r"(\d+)(?:\s*-\s*(\d+))?")
+
+
+class Command:
+    """
+    Разобранная однострочная команда.
+    """
+    __slots__ = ("name", "kind", "ids", "answer")
+
+    def __init__(self, name, kind, ids, answer=None):
+        """
+        :param name: имя команды, как в таблице HospitalApp.commands
+        :param kind: вид команды ("get", "up", "down", "discharge")
+        :param ids: список ID пациентов в порядке записи (диапазоны раскрыты)
+        :param answer: ответ на запрос подтверждения выписки ("да"/"нет") или None
+        """
+        self.name = name
+        self.kind = kind
+        self.ids = ids
+        self.answer = answer
+
+    def __eq__(self, other):
+        return (isinstance(other, Command)
+                and (self.name, self.kind, self.ids, self.answer)
+                == (other.name, other.kind, other.ids, other.answer))
+
+    def __repr__(self):
+        return f"Command({self.name!r}, {self.kind!r}, {self.ids!r}, {self.answer!r})"
+
+
+def parse_command(line):
+    """
+    Разбирает однострочную команду с ID пациентов.
+    :param line: строка в нижнем регистре без пробелов по краям
+    :return: объект Command или None, если строка не начинается с команды, принимающей ID
+    :raises ValueError: если после имени команды записаны некорректные ID или диапазон
+        либо ID больше MAX_IDS
+    """
+    match = _LINE.fullmatch(line)
+    if match is None:
+        if _PREFIX.match(line):
+            raise ValueError("Ошибка. ID пациента должно быть числом (целым, положительным)")
+        return None
+    name, text, answer = match.group("name", "ids", "answer")
+    if text.isdigit():
+        # Частый случай - один ID, без разбора диапазонов
+        return Command(name, PATIENT_COMMANDS[name], [int(text)], answer)
+    # Сначала границы всех диапазонов и общее число ID, раскрытие - только после проверки
+    ranges = []
+    total = 0
+    for first, last in _RANGE.findall(text):
+        first = int(first)
+        last = int(last) if last else first
+        if first > last:
+            raise ValueError(f"Ошибка. Некорректный диапазон ID: {first}-{last}")
+        total += last - first + 1
+        if total > MAX_IDS:
+            raise ValueError(f"Ошибка. Слишком много ID в одной команде (больше {MAX_IDS})")
+        ranges.append(range(first, last + 1))
+    ids = []
+    for patient_ids in ranges:
+        ids.extend(patient_ids)
+    return Command(name, PATIENT_COMMANDS[name], ids, answer)
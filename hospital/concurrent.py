@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Модуль потокобезопасной больницы.
+Содержит блокировку чтения/записи ReadWriteLock и класс ConcurrentHospital
+для одновременной работы нескольких стоек приёма из разных потоков.
+"""
+
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from hospital.models import Hospital
+
+# Сколько подряд идущих ID защищает одна блокировка полосы.
+STRIPE_RANGE = 1024
+
+
+class ReadWriteLock:
+    """
+    Блокировка чтения/записи: читатели не блокируют друг друга,
+    писатель получает исключительный доступ. Ожидающий писатель
+    не пропускает вперёд новых читателей (чтобы не голодать).
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        """
+        Разделяемый доступ (для читателей).
+        """
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """
+        Исключительный доступ (для писателей).
+        """
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class ConcurrentHospital(Hospital):
+    """
+    Потокобезопасная больница.
+    Чтения (get_patient_status, calculate_statistics) идут под разделяемой блокировкой
+    и не мешают друг другу. Смена статуса одного пациента тоже берёт разделяемую
+    блокировку больницы и дополнительно - блокировку полосы ID (STRIPE_RANGE пациентов),
+    поэтому писатели в разных полосах работают параллельно. Операции, меняющие
+    структуру базы (выписка, пакетные изменения), получают исключительный доступ.
+    После каждого изменения гистограммы писатель публикует её неизменяемую копию,
+    и calculate_statistics читает эту копию, не беря блокировку гистограммы.
+    """
+    def __init__(self, count=200, stripes=64, **options):
+        """
+        :param count: количество пациентов на начало сеанса
+        :param stripes: количество блокировок полос
+        :param options: остальные параметры Hospital (storage, stable_ids, ...)
+        """
+        self._ward_lock = ReadWriteLock()
+        self._stripe_locks = [threading.Lock() for _ in range(stripes)]
+        # Короткая блокировка гистограммы: её меняют писатели из разных полос
+        self._stats_lock = threading.Lock()
+        super().__init__(count, **options)
+
+    def _attach(self, patients, stats, stable_ids):
+        super()._attach(patients, stats, stable_ids)
+        self._publish_statistics()
+
+    def _publish_statistics(self):
+        """
+        Публикует неизменяемую копию гистограммы для читателей.
+        Вызывается писателем, когда гистограмма согласована; замена атрибута
+        атомарна, поэтому читатель видит либо прежнюю, либо новую копию целиком.
+        """
+        self._published_stats = MappingProxyType(dict(self._stats))
+
+    def get_patient_status(self, patient_id):
+        with self._ward_lock.reading():
+            return super().get_patient_status(patient_id)
+
+    def get_statuses(self, patient_ids):
+        with self._ward_lock.reading():
+            return super().get_statuses(patient_ids)
+
+    def has_patient(self, patient_id):
+        with self._ward_lock.reading():
+            return super().has_patient(patient_id)
+
+    def set_patient_status(self, patient_id, status):
+        stripe = self._stripe_locks[(patient_id // STRIPE_RANGE) % len(self._stripe_locks)]
+        with self._ward_lock.reading(), stripe:
+            super().set_patient_status(patient_id, status)
+
+    def set_statuses(self, patient_ids, status):
+        with self._ward_lock.writing():
+            super().set_statuses(patient_ids, status)
+
+    def change_statuses(self, patient_ids, delta):
+        with self._ward_lock.writing():
+            return super().change_statuses(patient_ids, delta)
+
+    def discharge(self, patient_id):
+        with self._ward_lock.writing():
+            super().discharge(patient_id)
+            self._publish_statistics()
+
+    def discharge_many(self, patient_ids):
+        with self._ward_lock.writing():
+            super().discharge_many(patient_ids)
+
+    def snapshot(self):
+        # Снимок с PagedStorage - O(1), писатели ждут только это мгновение
+        with self._ward_lock.writing():
+            return super().snapshot()
+
+    def calculate_statistics(self):
+        if self.check_statistics:
+            self.verify_statistics()
+        with self._ward_lock.reading():
+            return dict(self._published_stats)
+
+    def verify_statistics(self):
+        # Полный пересчёт должен видеть базу без параллельных изменений
+        with self._ward_lock.writing():
+            super().verify_statistics()
+
+    def _apply_statistics(self, changes):
+        # Пакетные изменения идут под исключительной блокировкой больницы
+        super()._apply_statistics(changes)
+        self._publish_statistics()
+
+    def _move_in_statistics(self, old_status, status, position):
+        with self._stats_lock:
+            super()._move_in_statistics(old_status, status, position)
+            self._publish_statistics()
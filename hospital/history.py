@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Модуль истории переходов пациентов между статусами.
+Содержит класс TransitionHistory: журнал событий «пациент перешёл из статуса
+в статус» (или выписан) с отметками времени, хранящийся по столбцам в блоках
+фиксированного размера. Старые блоки выгружаются на диск, в памяти остаются
+только последние, поэтому расход памяти ограничен.
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+
+# Заголовок блока на диске: магия, время первого события (мс), количество событий.
+CHUNK_HEADER = struct.Struct("<4sqI")
+CHUNK_MAGIC = b"HHST"
+
+# Упаковка перехода в один байт: биты 0-1 - прежний статус, 2-3 - новый, бит 4 - выписка.
+DISCHARGE_FLAG = 0x10
+# Наибольшая разница соседних отметок времени, которая помещается в столбец (мс).
+MAX_DELTA = 0xFFFFFFFF
+
+
+class _Chunk:
+    """
+    Блок событий: столбцы разностей отметок времени (мс), номеров слотов пациентов
+    и упакованных переходов. 9 байт на событие.
+    """
+    __slots__ = ("base", "last", "deltas", "keys", "states")
+
+    def __init__(self, base):
+        self.base = base
+        self.last = base
+        self.deltas = array("I")
+        self.keys = array("I")
+        self.states = array("B")
+
+    def __len__(self):
+        return len(self.states)
+
+    def events(self):
+        """
+        :return: генератор событий (время в мс, слот, упакованный переход)
+        """
+        moment = self.base
+        for delta, key, state in zip(self.deltas, self.keys, self.states):
+            moment += delta
+            yield moment, key, state
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, self.base, len(self)))
+            file.write(self.deltas.tobytes())
+            file.write(self.keys.tobytes())
+            file.write(self.states.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            magic, base, count = CHUNK_HEADER.unpack(file.read(CHUNK_HEADER.size))
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"Ошибка. Файл {path} не является блоком истории")
+            chunk = cls(base)
+            chunk.deltas.fromfile(file, count)
+            chunk.keys.fromfile(file, count)
+            chunk.states.fromfile(file, count)
+        return chunk
+
+
+class TransitionHistory:
+    """
+    История переходов пациентов между статусами.
+    Пациент идентифицируется неподвижным номером слота (ID в режиме стабильных ID
+    минус 1), поэтому история подключается к больнице с TombstoneStorage
+    (см. параметр history у Hospital).
+    Заполненные блоки сразу записываются в каталог directory, в памяти хранятся
+    только max_chunks последних; запросы читают остальные с диска по порядку.
+    """
+    def __init__(self, directory=None, chunk_size=4096, max_chunks=8, clock=time.time):
+        """
+        :param directory: каталог для блоков (по умолчанию - временный, удаляется при close)
+        :param chunk_size: событий в одном блоке
+        :param max_chunks: сколько заполненных блоков держать в памяти
+        :param clock: источник времени в секундах
+        """
+        self._temporary = directory is None
+        self.directory = tempfile.mkdtemp(prefix="hospital-history-") if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.clock = clock
+        self.count = 0
+        self.initial_status = 1
+        self.start = None
+        self._size = 0
+        # Заполненные блоки: (время первого, время последнего события, путь) по порядку
+        self._sealed = []
+        # Кэш последних заполненных блоков {путь: блок}
+        self._cached = {}
+        self._active = None
+
+    def __len__(self):
+        return self._size
+
+    def begin(self, count, status=1):
+        """
+        Начало истории: count пациентов (слоты 0..count-1) в статусе status.
+        """
+        self.count = count
+        self.initial_status = status
+        self.start = self._now()
+
+    def record(self, key, old_status, status):
+        """
+        Записывает переход пациента.
+        :param key: номер слота пациента
+        :param old_status: прежний код статуса
+        :param status: новый код статуса или None при выписке
+        """
+        now = self._now()
+        chunk = self._active
+        if chunk is None or len(chunk) >= self.chunk_size or now - chunk.last > MAX_DELTA:
+            chunk = self._open_chunk(now if chunk is None else max(now, chunk.last))
+        # Часы могут пойти назад (time.time) - такое событие считается одновременным
+        delta = now - chunk.last if now > chunk.last else 0
+        chunk.last += delta
+        chunk.deltas.append(delta)
+        chunk.keys.append(key)
+        if status is None:
+            chunk.states.append(old_status | DISCHARGE_FLAG)
+        else:
+            chunk.states.append(old_status | status << 2)
+        self._size += 1
+
+    def transitions(self, start=None, stop=None):
+        """
+        Перечисляет переходы в интервале времени [start, stop).
+        :param start: начало интервала в секундах (по умолчанию - начало истории)
+        :param stop: конец интервала в секундах (по умолчанию - без ограничения)
+        :return: генератор кортежей (время, номер слота, прежний статус, новый статус
+            или None при выписке)
+        """
+        low = None if start is None else _milliseconds(start)
+        high = None if stop is None else _milliseconds(stop)
+        for moment, key, state in self._events(low, high):
+            if low is None or moment >= low:
+                yield moment / 1000, key, state & 3, None if state & DISCHARGE_FLAG else state >> 2 & 3
+
+    def dwell_times(self, start=None, stop=None):
+        """
+        Суммарное время, проведённое всеми пациентами в каждом статусе за [start, stop).
+        Требует прохода по истории от начала до stop (блоки читаются с диска по порядку).
+        :param start: начало интервала в секундах (по умолчанию - начало истории)
+        :param stop: конец интервала в секундах (по умолчанию - текущее время)
+        :return: словарь {код статуса: секунды}
+        """
+        if self.start is None:
+            return {}
+        low = self.start if start is None else max(_milliseconds(start), self.start)
+        high = self._now() if stop is None else _milliseconds(stop)
+        totals = {}
+        if high <= low:
+            return totals
+        statuses = bytearray([self.initial_status]) * self.count
+        since = array("q", [self.start]) * self.count
+        for moment, key, state in self._events(None, high):
+            old_status = state & 3
+            _add_overlap(totals, old_status, since[key], moment, low, high)
+            since[key] = moment
+            statuses[key] = 0xFF if state & DISCHARGE_FLAG else state >> 2 & 3
+        for key, status in enumerate(statuses):
+            if status != 0xFF:
+                _add_overlap(totals, status, since[key], high, low, high)
+        return {status: total / 1000 for status, total in sorted(totals.items())}
+
+    def close(self):
+        """
+        Освобождает память; временный каталог удаляется вместе с блоками.
+        """
+        self._cached.clear()
+        self._active = None
+        if self._temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _now(self):
+        return _milliseconds(self.clock())
+
+    def _open_chunk(self, now):
+        """
+        Запечатывает текущий блок (записывает на диск) и начинает новый.
+        """
+        if self._active is not None and len(self._active):
+            self._seal(self._active)
+        self._active = _Chunk(now)
+        return self._active
+
+    def _seal(self, chunk):
+        path = os.path.join(self.directory, f"chunk-{len(self._sealed):06d}.bin")
+        chunk.save(path)
+        self._sealed.append((chunk.base + chunk.deltas[0], chunk.last, path))
+        self._cached[path] = chunk
+        if len(self._cached) > self.max_chunks:
+            # Словарь хранит порядок вставки - первым выгружается самый старый блок
+            del self._cached[next(iter(self._cached))]
+
+    def _events(self, low, high):
+        """
+        События всех блоков по порядку; блоки целиком вне интервала [low, high) пропускаются.
+        """
+        for first, last, path in self._sealed:
+            if high is not None and first >= high:
+                return
+            if low is not None and last < low:
+                continue
+            chunk = self._cached.get(path)
+            yield from _until(chunk.events() if chunk is not None else _Chunk.load(path).events(), high)
+        if self._active is not None:
+            yield from _until(self._active.events(), high)
+
+
+def _until(events, high):
+    for event in events:
+        if high is not None and event[0] >= high:
+            return
+        yield event
+
+
+def _add_overlap(totals, status, begin, end, low, high):
+    """
+    Добавляет к totals[status] пересечение отрезков [begin, end) и [low, high).
+    """
+    overlap = min(end, high) - max(begin, low)
+    if overlap > 0:
+        totals[status] = totals.get(status, 0) + overlap
+
+
+def _milliseconds(seconds):
+    return int(round(seconds * 1000))
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Модуль журнала операций (write-ahead log) для класса Hospital.
+Каждое изменение базы пациентов дописывается в журнал компактной двоичной записью
+и сразу передаётся ОС (переживает падение процесса); сброс на диск (fsync)
+выполняется группами - по числу записей или по времени.
+После сбоя состояние восстанавливается из последнего снимка и журнала (recover),
+а контрольная точка (checkpoint) сворачивает журнал в новый снимок.
+Журнал хранит ID пациентов как есть, поэтому в заголовке записан режим ID
+(сдвигаемые или стабильные), и применить журнал можно только к больнице того же режима.
+"""
+
+import os
+import struct
+import threading
+import time
+
+from hospital.models import Hospital
+from hospital.snapshot import save_snapshot, load_snapshot, read_generation
+from hospital.storage import ListStorage
+
+# Заголовок файла журнала: сигнатура, версия, флаги и поколение (номер контрольной точки).
+HEADER = struct.Struct("<4sBBxxQ")
+MAGIC = b"HWAL"
+VERSION = 1
+# Флаг: ID в записях - стабильные ID (Hospital(stable_ids=True)), а не сдвигаемые.
+FLAG_STABLE_IDS = 1
+# Запись: код операции, значение (статус или приращение), количество ID; затем сами ID.
+RECORD = struct.Struct("<BbI")
+PATIENT_ID = struct.Struct("<I")
+
+OP_SET = 1
+OP_DISCHARGE = 2
+OP_CHANGE = 3
+
+
+class Journal:
+    """
+    Журнал операций над больницей с групповой фиксацией.
+    Подключается к больнице через атрибут Hospital.journal.
+    Запись и фиксация потокобезопасны. Фиксацию по времени выполняет фоновый
+    таймер, поэтому записи попадают на диск не позже чем через group_interval
+    секунд, даже если новых операций больше нет.
+    """
+    def __init__(self, path, group_size=64, group_interval=0.05, clock=time.monotonic,
+                 stable_ids=None):
+        """
+        :param path: путь к файлу журнала
+        :param group_size: фиксировать после стольких записей
+        :param group_interval: фиксировать, если с прошлой фиксации прошло столько секунд
+        :param clock: источник времени (для тестов)
+        :param stable_ids: режим ID больницы; None - взять из существующего журнала
+            (новый журнал по умолчанию создаётся для сдвигаемых ID)
+        :raises ValueError: если файл не является журналом больницы или записан
+            в другом режиме ID
+        """
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self._clock = clock
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            self.stable_ids = bool(stable_ids)
+            self._write_empty(0)
+        self.generation, self.stable_ids, valid_length = self._scan()
+        if stable_ids is not None and self.stable_ids != stable_ids:
+            raise ValueError("Ошибка. Журнал операций записан в другом режиме ID пациентов")
+        # Без буфера Python: каждая запись сразу уходит в ОС
+        self._file = open(path, "ab", buffering=0)
+        if self._file.tell() != valid_length:
+            # Отрезаем недописанную при сбое последнюю запись
+            self._file.truncate(valid_length)
+            self._file.seek(valid_length)
+        self._pending = 0
+        self._last_commit = clock()
+        self._lock = threading.Lock()
+        # Таймер фиксации по времени; запускается первой незафиксированной записью
+        self._timer = None
+
+    def log_set(self, patient_ids, status):
+        """
+        Записывает установку статуса (set_patient_status / set_statuses).
+        """
+        self._append(OP_SET, status, patient_ids)
+
+    def log_discharge(self, patient_ids):
+        """
+        Записывает выписку (discharge / discharge_many).
+        """
+        self._append(OP_DISCHARGE, 0, patient_ids)
+
+    def log_change(self, patient_ids, delta):
+        """
+        Записывает изменение статусов на приращение (change_statuses).
+        """
+        # Приращения больше диапазона статусов эквивалентны граничным
+        self._append(OP_CHANGE, max(-128, min(delta, 127)), patient_ids)
+
+    def commit(self):
+        """
+        Фиксирует все записанные операции на диске (fsync).
+        """
+        with self._lock:
+            self._commit()
+
+    def replay(self, hospital):
+        """
+        Применяет к больнице все операции из журнала.
+        На время воспроизведения журнал больницы отключается, чтобы не дублировать записи.
+        :param hospital: объект Hospital
+        :return: количество применённых операций
+        :raises ValueError: если режим ID больницы не совпадает с режимом журнала
+        """
+        if hospital.stable_ids != self.stable_ids:
+            raise ValueError("Ошибка. Журнал операций записан в другом режиме ID пациентов")
+        journal, hospital.journal = hospital.journal, None
+        applied = 0
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+            for op, value, patient_ids in _records(data):
+                if op == OP_SET:
+                    hospital.set_statuses(patient_ids, value)
+                elif op == OP_DISCHARGE:
+                    hospital.discharge_many(patient_ids)
+                else:
+                    hospital.change_statuses(patient_ids, value)
+                applied += 1
+        finally:
+            hospital.journal = journal
+        return applied
+
+    def checkpoint(self, hospital, snapshot_path):
+        """
+        Контрольная точка: сохраняет снимок больницы и начинает журнал заново.
+        Снимок помечается новым поколением журнала, поэтому сбой между записью
+        снимка и очисткой журнала не приведёт к повторному применению операций.
+        :param hospital: объект Hospital
+        :param snapshot_path: путь к файлу снимка
+        """
+        self.commit()
+        generation = self.generation + 1
+        save_snapshot(hospital, snapshot_path, generation)
+        self.reset(generation)
+
+    def reset(self, generation):
+        """
+        Заменяет журнал пустым журналом заданного поколения.
+        :param generation: поколение нового журнала
+        """
+        with self._lock:
+            self._file.close()
+            self._write_empty(generation)
+            self.generation = generation
+            self._file = open(self.path, "ab", buffering=0)
+            self._pending = 0
+            self._last_commit = self._clock()
+
+    def close(self):
+        """
+        Фиксирует оставшиеся операции и закрывает файл журнала.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._commit()
+            self._file.close()
+
+    def _append(self, op, value, patient_ids):
+        """
+        Дописывает запись и при необходимости выполняет групповую фиксацию.
+        """
+        record = RECORD.pack(op, value, len(patient_ids)) + struct.pack(
+            f"<{len(patient_ids)}I", *patient_ids)
+        with self._lock:
+            self._file.write(record)
+            self._pending += 1
+            if (self._pending >= self.group_size
+                    or self._clock() - self._last_commit >= self.group_interval):
+                self._commit()
+            elif self._timer is None:
+                # Уже запущенный таймер сработает раньше, чем истечёт интервал этой записи
+                self._timer = threading.Timer(self.group_interval, self._commit_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _commit_on_timer(self):
+        """
+        Фиксация по времени из потока таймера.
+        """
+        with self._lock:
+            self._timer = None
+            if self._pending and not self._file.closed:
+                self._commit()
+
+    def _commit(self):
+        """
+        Выполняет fsync (вызывается под блокировкой).
+        """
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_commit = self._clock()
+
+    def _scan(self):
+        """
+        Читает заголовок и находит конец последней целой записи.
+        :return: (поколение, режим стабильных ID, длина корректной части файла)
+        :raises ValueError: если файл не является журналом больницы
+        """
+        with open(self.path, "rb") as file:
+            data = file.read()
+        magic, version, flags, generation = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Ошибка. Файл не является журналом операций больницы")
+        length = HEADER.size
+        for _, _, patient_ids in _records(data):
+            length += RECORD.size + PATIENT_ID.size * len(patient_ids)
+        return generation, bool(flags & FLAG_STABLE_IDS), length
+
+    def _write_empty(self, generation):
+        """
+        Атомарно записывает пустой журнал с заголовком (режим ID - self.stable_ids).
+        """
+        flags = FLAG_STABLE_IDS if self.stable_ids else 0
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, flags, generation))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def recover(snapshot_path, journal_path, count=200, stable_ids=False, storage=ListStorage,
+            **journal_options):
+    """
+    Восстанавливает больницу после перезапуска: загружает снимок (если он есть)
+    и применяет журнал операций; журнал остаётся подключённым к больнице.
+    :param snapshot_path: путь к файлу снимка
+    :param journal_path: путь к файлу журнала
+    :param count: количество пациентов, если снимка ещё нет
+    :param stable_ids: режим ID больницы; снимок и журнал должны быть записаны в нём же
+    :param storage: класс хранилища статусов, если снимка ещё нет
+        (снимок всегда открывается поверх mmap)
+    :param journal_options: параметры групповой фиксации для Journal
+    :return: объект Hospital
+    :raises ValueError: если журнал новее снимка (снимок утерян) или снимок
+        либо журнал записаны в другом режиме ID
+    """
+    if os.path.exists(snapshot_path):
+        hospital = load_snapshot(snapshot_path)
+        if hospital.stable_ids != stable_ids:
+            raise ValueError("Ошибка. Снимок записан в другом режиме ID пациентов")
+        generation = read_generation(snapshot_path)
+    else:
+        hospital = Hospital(count, storage=storage, stable_ids=stable_ids)
+        generation = 0
+    journal = Journal(journal_path, stable_ids=stable_ids, **journal_options)
+    if journal.generation < generation:
+        # Журнал уже свёрнут в снимок, но не успел очиститься
+        journal.reset(generation)
+    elif journal.generation > generation:
+        journal.close()
+        raise ValueError("Ошибка. Журнал операций не соответствует снимку")
+    else:
+        journal.replay(hospital)
+    hospital.journal = journal
+    return hospital
+
+
+def _records(data):
+    """
+    Разбирает записи журнала, останавливаясь на недописанной записи.
+    :param data: содержимое файла журнала
+    :return: генератор кортежей (код операции, значение, список ID)
+    """
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        op, value, count = RECORD.unpack_from(data, offset)
+        end = offset + RECORD.size + PATIENT_ID.size * count
+        if end > len(data) or op not in (OP_SET, OP_DISCHARGE, OP_CHANGE):
+            return
+        yield op, value, list(struct.unpack_from(f"<{count}I", data, offset + RECORD.size))
+        offset = end
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Модуль метрик больницы.
+Содержит гистограмму задержек LatencyHistogram, накопитель метрик Metrics
+и функцию instrument, которая подключает сбор метрик к конкретному объекту
+Hospital или HospitalApp. Без вызова instrument код больницы не меняется
+и ничего не тратит на метрики.
+"""
+
+import json
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Операции Hospital, которые замеряет instrument.
+HOSPITAL_OPERATIONS = (
+    "get_patient_status", "set_patient_status", "discharge", "has_patient",
+    "get_statuses", "set_statuses", "change_statuses", "discharge_many",
+    "calculate_statistics",
+)
+# Операции, после которых меняется размер больницы.
+WARD_SIZE_OPERATIONS = ("discharge", "discharge_many")
+
+# Ошибки группируются по шаблону сообщения: числа из ввода пользователя заменяются на N.
+_NUMBER = re.compile(r"\d+")
+# Предел числа различных видов ошибок; остальные учитываются под OTHER_ERROR.
+MAX_ERROR_KINDS = 100
+OTHER_ERROR = "Прочие ошибки"
+
+# Подкорзин на каждую степень двойки: относительная погрешность не больше 1/8.
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в наносекундах с логарифмическими корзинами (как HDR Histogram):
+    каждая степень двойки делится на SUB_BUCKETS равных корзин. Запись - O(1),
+    память - по одному счётчику на занятую корзину.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._buckets = {}
+
+    def record(self, value):
+        """
+        :param value: задержка в наносекундах (неотрицательное целое)
+        """
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        index = bucket_index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, fraction):
+        """
+        Перцентиль (верхняя граница корзины, в которую он попал).
+        :param fraction: доля от 0 до 1
+        :return: задержка в наносекундах (0 для пустой гистограммы)
+        """
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(bucket_upper(index), self.max)
+        return 0
+
+    def cumulative(self):
+        """
+        Накопленные счётчики по занятым корзинам (для экспорта в Prometheus).
+        :return: список пар (верхняя граница корзины в нс, количество значений не больше неё)
+        """
+        seen = 0
+        result = []
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            result.append((bucket_upper(index), seen))
+        return result
+
+
+def error_kind(message):
+    """
+    Шаблон сообщения об ошибке: «Некорректный диапазон ID: 9-3» -> «... ID: N-N».
+    """
+    return _NUMBER.sub("N", message)
+
+
+def bucket_index(value):
+    """
+    Номер корзины для значения: малые значения - точно, дальше - по SUB_BUCKETS на октаву.
+    """
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (value >> shift)
+
+
+def bucket_upper(index):
+    """
+    Наибольшее значение, попадающее в корзину index.
+    """
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index - shift * SUB_BUCKETS + 1) << shift) - 1
+
+
+class Metrics:
+    """
+    Накопитель метрик: задержки и число вызовов каждой операции,
+    число ошибок по операции и шаблону сообщения (см. error_kind), выборка размера
+    больницы во времени. Число видов ошибок ограничено MAX_ERROR_KINDS, поэтому
+    набор меток не растёт от ввода пользователя.
+    Можно использовать из нескольких потоков.
+    """
+    def __init__(self, sample_interval=1.0, max_samples=1024,
+                 clock=time.perf_counter_ns, wall_clock=time.time):
+        """
+        :param sample_interval: минимальный интервал между замерами размера больницы, с
+        :param max_samples: сколько последних замеров размера хранить
+        :param clock: источник времени для задержек (в наносекундах)
+        :param wall_clock: источник времени для отметок замеров размера (в секундах)
+        """
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.sample_interval = sample_interval
+        self.latency = {}
+        self.errors = {}
+        self.ward_size = deque(maxlen=max_samples)
+        self._last_sample = None
+        self._lock = threading.Lock()
+
+    def observe(self, operation, nanoseconds):
+        """
+        Учитывает один вызов операции.
+        """
+        with self._lock:
+            histogram = self.latency.get(operation)
+            if histogram is None:
+                histogram = self.latency[operation] = LatencyHistogram()
+            histogram.record(nanoseconds)
+
+    def error(self, operation, message):
+        """
+        Учитывает ошибку операции (ошибки группируются по шаблону сообщения).
+        """
+        key = (operation, error_kind(message))
+        with self._lock:
+            if key not in self.errors and len(self.errors) >= MAX_ERROR_KINDS:
+                key = (operation, OTHER_ERROR)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def sample_ward(self, size, force=False):
+        """
+        Запоминает размер больницы, если с прошлого замера прошло sample_interval секунд.
+        :param size: количество пациентов
+        :param force: записать замер независимо от интервала
+        """
+        now = self.wall_clock()
+        with self._lock:
+            if (force or self._last_sample is None
+                    or now - self._last_sample >= self.sample_interval):
+                self._last_sample = now
+                self.ward_size.append((now, size))
+
+    def to_dict(self):
+        """
+        :return: снимок метрик в виде словаря (для JSON)
+        """
+        with self._lock:
+            return {
+                "operations": {
+                    name: {
+                        "count": histogram.count,
+                        "sum_ns": histogram.total,
+                        "p50_ns": histogram.percentile(0.50),
+                        "p90_ns": histogram.percentile(0.90),
+                        "p99_ns": histogram.percentile(0.99),
+                        "max_ns": histogram.max,
+                    }
+                    for name, histogram in sorted(self.latency.items())
+                },
+                "errors": [
+                    {"operation": operation, "message": message, "count": count}
+                    for (operation, message), count in sorted(self.errors.items())
+                ],
+                "ward_size": [list(sample) for sample in self.ward_size],
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + "\n"
+
+    def to_prometheus(self):
+        """
+        :return: снимок метрик в текстовом формате Prometheus
+        """
+        lines = [
+            "# HELP hospital_operation_seconds Задержка операций (_count - число вызовов).",
+            "# TYPE hospital_operation_seconds histogram",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self.latency.items()):
+                label = f'operation="{_escape(name)}"'
+                for upper, seen in histogram.cumulative():
+                    lines.append(f'hospital_operation_seconds_bucket{{{label},le="{upper / 1e9:.9g}"}} {seen}')
+                lines.append(f'hospital_operation_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+                lines.append(f"hospital_operation_seconds_sum{{{label}}} {histogram.total / 1e9:.9g}")
+                lines.append(f"hospital_operation_seconds_count{{{label}}} {histogram.count}")
+            lines.append("# HELP hospital_errors_total Ошибки операций по шаблону сообщения.")
+            lines.append("# TYPE hospital_errors_total counter")
+            for (operation, message), count in sorted(self.errors.items()):
+                lines.append(f'hospital_errors_total{{operation="{_escape(operation)}",'
+                             f'message="{_escape(message)}"}} {count}')
+            if self.ward_size:
+                lines.append("# HELP hospital_ward_size Количество пациентов в больнице.")
+                lines.append("# TYPE hospital_ward_size gauge")
+                lines.append(f"hospital_ward_size {self.ward_size[-1][1]}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, target, fmt="prometheus"):
+        """
+        Выгружает снимок метрик.
+        :param target: путь к файлу (перезаписывается атомарно) или адрес (host, port),
+            куда снимок отправляется по TCP
+        :param fmt: "prometheus" или "json"
+        :raises ValueError: если формат неизвестен
+        """
+        if fmt == "prometheus":
+            text = self.to_prometheus()
+        elif fmt == "json":
+            text = self.to_json()
+        else:
+            raise ValueError(f"Ошибка. Неизвестный формат метрик: {fmt}")
+        data = text.encode("utf-8")
+        if isinstance(target, tuple):
+            with socket.create_connection(target) as connection:
+                connection.sendall(data)
+            return
+        directory = os.path.dirname(os.path.abspath(target))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def instrument(target, metrics):
+    """
+    Подключает сбор метрик к объекту: методы заменяются обёртками только у этого
+    экземпляра, класс и остальные объекты не затрагиваются.
+        - Hospital (и совместимые классы): замеряются операции HOSPITAL_OPERATIONS,
+          ValueError учитываются как ошибки, после выписки снимается размер больницы.
+        - HospitalApp: замеряется каждая команда из таблицы commands, сообщения
+          об ошибках учитываются как ошибки команды; больница приложения тоже
+          подключается, если ещё не подключена.
+    :param target: объект Hospital или HospitalApp
+    :param metrics: накопитель Metrics
+    :return: target
+    """
+    if hasattr(target, "commands"):
+        return _instrument_app(target, metrics)
+    return _instrument_hospital(target, metrics)
+
+
+def _instrument_hospital(hospital, metrics):
+    if getattr(hospital, "metrics", None) is not None:
+        return hospital
+    for name in HOSPITAL_OPERATIONS:
+        method = getattr(hospital, name, None)
+        if method is not None:
+            setattr(hospital, name, _timed(hospital, name, method, metrics))
+    hospital.metrics = metrics
+    metrics.sample_ward(len(hospital), force=True)
+    return hospital
+
+
+def _timed(hospital, name, method, metrics):
+    clock = metrics.clock
+    sample = name in WARD_SIZE_OPERATIONS
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        started = clock()
+        try:
+            return method(*args, **kwargs)
+        except ValueError as e:
+            metrics.error(name, str(e))
+            raise
+        finally:
+            metrics.observe(name, clock() - started)
+            if sample:
+                metrics.sample_ward(len(hospital))
+    return wrapper
+
+
+def _instrument_app(app, metrics):
+    _instrument_hospital(app.hospital, metrics)
+    clock = metrics.clock
+    # Команда, выполняемая сейчас (для привязки сообщений об ошибках)
+    current = ["execute"]
+    wrapped = {}
+    for command, handler in app.commands.items():
+        # Синонимы команд указывают на один обработчик - обёртка тоже одна
+        if handler not in wrapped:
+            wrapped[handler] = _timed_command(app, handler, metrics, clock, current)
+        app.commands[command] = wrapped[handler]
+
+    write = app.write
+
+    def write_with_errors(text):
+        if text.startswith("Ошибка") or text.startswith("Неизвестная команда"):
+            metrics.error(current[0], text)
+        write(text)
+    app.write = write_with_errors
+    app.metrics = metrics
+    return app
+
+
+def _timed_command(app, handler, metrics, clock, current):
+    name = getattr(handler, "__name__", "command")
+
+    @wraps(handler)
+    def wrapper():
+        current[0] = name
+        started = clock()
+        try:
+            return handler()
+        finally:
+            metrics.observe(name, clock() - started)
+            current[0] = "execute"
+            metrics.sample_ward(len(app.hospital))
+    return wrapper
+
+
+def _escape(value):
+    """
+    Экранирование значения метки Prometheus.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
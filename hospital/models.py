@@ -4,6 +4,11 @@
 Содержит определения бизнес-логики: класс Hospital и словарь описания статусов пациентов.
 """
 
+from itertools import islice
+
+from hospital.status_index import StatusIndex
+from hospital.storage import ListStorage, PagedStorage, TombstoneStorage
+
 # Словарь с описанием статусов пациентов.
 STATUS_TEXT = {
     0: "Тяжело болен",
@@ -16,12 +21,87 @@ STATUS_TEXT = {
 class Hospital:
     """
     Класс, представляющий больницу и базу пациентов.
-    База пациентов реализована как список целых чисел (коды статусов).
+    База пациентов хранится в подключаемом хранилище кодов статусов (см. hospital.storage),
+    по умолчанию - в эталонном ListStorage на основе списка.
     Пациенты идентифицируются по порядковому номеру (ID = индекс + 1).
+    В режиме стабильных ID (stable_ids=True) ID = номер слота + 1 и после выписки
+    других пациентов не меняется.
+    Статистика по статусам поддерживается инкрементально и возвращается за O(1).
+    Если задан журнал операций (атрибут journal, см. hospital.journal),
+    каждое успешное изменение базы записывается в него.
+    С индексом статусов (status_index=True) пациентов в заданном статусе можно
+    перечислять и считать в диапазоне ID без полного прохода по базе.
+    С историей переходов (параметр history, см. hospital.history) каждая смена
+    статуса и выписка записываются с отметкой времени.
     """
-    def __init__(self, count=200):
+    def __init__(self, count=200, check_statistics=False, storage=ListStorage,
+                 tombstones=False, stable_ids=False, status_index=False,
+                 history=None):
+        """
+        :param count: количество пациентов на начало сеанса
+        :param check_statistics: режим проверки согласованности - при каждом расчёте
+            статистики гистограмма пересчитывается заново и сверяется со счётчиками
+        :param storage: класс хранилища статусов (ListStorage, ByteArrayStorage, ...)
+        :param tombstones: выписка за O(log n) через TombstoneStorage вместо сдвига базы
+            (доступ по ID при этом тоже стоит O(log n))
+        :param stable_ids: ID пациентов не сдвигаются после выписки (включает tombstones)
+        :param status_index: вести индекс пациентов по статусам (включает tombstones,
+            так как индекс ссылается на неподвижные слоты); индекс занимает 4 байта
+            на пациента для каждого статуса плюс 4 байта индекса занятых слотов,
+            то есть 20 байт на пациента при четырёх статусах
+        :param history: история переходов TransitionHistory (включает tombstones:
+            пациенты в истории идентифицируются номером слота)
+        """
         # Инициализируем больницу с count пациентами, все в статусе "Болен" (код 1)
-        self.patients = [1] * count
+        patients = storage(count, 1)
+        if tombstones or stable_ids or status_index or history is not None:
+            patients = TombstoneStorage(patients)
+        self.check_statistics = check_statistics
+        self.journal = None
+        self._attach(patients, {1: len(patients)} if len(patients) else {}, stable_ids)
+        self._status_index = StatusIndex(count, STATUS_TEXT) if status_index else None
+        self.history = history
+        if history is not None:
+            history.begin(count, 1)
+
+    @classmethod
+    def from_storage(cls, patients, stats=None, stable_ids=False, check_statistics=False):
+        """
+        Создаёт больницу поверх готового хранилища (например, загруженного снимка).
+        :param patients: хранилище статусов (в режиме стабильных ID - TombstoneStorage)
+        :param stats: готовая гистограмма статусов; если не задана, пересчитывается
+        :param stable_ids: режим стабильных ID
+        :param check_statistics: режим проверки согласованности статистики
+        :return: объект Hospital
+        """
+        hospital = cls(0, check_statistics=check_statistics)
+        hospital._attach(patients, stats, stable_ids)
+        hospital._status_index = None
+        hospital.history = None
+        return hospital
+
+    def _attach(self, patients, stats, stable_ids):
+        """
+        Подключает базу пациентов и гистограмму статусов.
+        :param stats: гистограмма статусов или None для пересчёта полным проходом
+        """
+        self.patients = patients
+        self.stable_ids = stable_ids
+        # В режиме стабильных ID обращение идёт к слотам напрямую, минуя пересчёт индекса
+        self._records = patients.slots if stable_ids else patients
+        # Гистограмма статусов {код статуса: количество пациентов} без нулевых значений
+        self._stats = self.recalculate_statistics() if stats is None else {
+            status: count for status, count in stats.items() if count
+        }
+        # Версия гистограммы растёт при каждом её изменении (для кэшей отчётов);
+        # при повторном подключении базы не сбрасывается
+        self.stats_version = getattr(self, "stats_version", 0) + 1
+
+    def __len__(self):
+        """
+        Количество пациентов в больнице.
+        """
+        return len(self.patients)
 
     def get_patient_status(self, patient_id):
         """
@@ -30,22 +110,24 @@ class Hospital:
         :return: код статуса пациента
         :raises ValueError: если ID некорректен
         """
-        index = patient_id - 1
-        if index < 0 or index >= len(self.patients):
-            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
-        return self.patients[index]
+        return self._records[self._position(patient_id)]
 
     def set_patient_status(self, patient_id, status):
         """
         Устанавливает статус пациента по его ID.
         :param patient_id: целое число, 1-индексированный ID пациента
         :param status: новый код статуса
-        :raises ValueError: если ID некорректен
+        :raises ValueError: если ID или код статуса некорректен
         """
-        index = patient_id - 1
-        if index < 0 or index >= len(self.patients):
-            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
-        self.patients[index] = status
+        position = self._position(patient_id)
+        if status not in STATUS_TEXT:
+            raise ValueError("Ошибка. Некорректный код статуса пациента")
+        old_status = self._records[position]
+        self._records[position] = status
+        if old_status != status:
+            self._move_in_statistics(old_status, status, position)
+        if self.journal is not None:
+            self.journal.log_set([patient_id], status)
 
     def discharge(self, patient_id):
         """
@@ -53,17 +135,330 @@ class Hospital:
         :param patient_id: целое число, 1-индексированный ID пациента
         :raises ValueError: если ID некорректен
         """
-        index = patient_id - 1
-        if index < 0 or index >= len(self.patients):
-            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
-        del self.patients[index]
+        position = self._position(patient_id)
+        old_status = self._records[position]
+        self._remove_from_statistics(old_status)
+        if self._status_index is not None:
+            self._status_index.remove(self._slot(position), old_status)
+        if self.history is not None:
+            self.history.record(self._slot(position), old_status, None)
+        if self.stable_ids:
+            self.patients.discard(position)
+        else:
+            del self.patients[position]
+        if self.journal is not None:
+            self.journal.log_discharge([patient_id])
+
+    def get_statuses(self, patient_ids):
+        """
+        Получает статусы нескольких пациентов.
+        :param patient_ids: последовательность ID пациентов
+        :return: список кодов статусов в том же порядке
+        :raises ValueError: если хотя бы один ID некорректен
+        """
+        records = self._records
+        return [records[position] for position in self._positions(patient_ids)]
+
+    def set_statuses(self, patient_ids, status):
+        """
+        Устанавливает один и тот же статус нескольким пациентам.
+        Все ID проверяются до первого изменения.
+        :param patient_ids: последовательность ID пациентов
+        :param status: новый код статуса
+        :raises ValueError: если хотя бы один ID или код статуса некорректен
+        """
+        patient_ids = list(patient_ids)
+        positions = self._positions(patient_ids)
+        if status not in STATUS_TEXT:
+            raise ValueError("Ошибка. Некорректный код статуса пациента")
+        records = self._records
+        index = self._status_index
+        history = self.history
+        changes = {}
+        for position in positions:
+            old_status = records[position]
+            changes[old_status] = changes.get(old_status, 0) - 1
+            records[position] = status
+            if index is not None:
+                index.move(self._slot(position), old_status, status)
+            if history is not None and old_status != status:
+                history.record(self._slot(position), old_status, status)
+        changes[status] = changes.get(status, 0) + len(positions)
+        self._apply_statistics(changes)
+        if self.journal is not None:
+            self.journal.log_set(patient_ids, status)
+
+    def change_statuses(self, patient_ids, delta):
+        """
+        Повышает (delta > 0) или понижает (delta < 0) статус нескольких пациентов.
+        Статус ограничивается диапазоном кодов от 0 до 3.
+        Все ID проверяются до первого изменения.
+        :param patient_ids: последовательность ID пациентов
+        :param delta: приращение кода статуса
+        :return: список новых кодов статусов в том же порядке
+        :raises ValueError: если хотя бы один ID некорректен
+        """
+        patient_ids = list(patient_ids)
+        positions = self._positions(patient_ids)
+        lowest, highest = min(STATUS_TEXT), max(STATUS_TEXT)
+        records = self._records
+        index = self._status_index
+        history = self.history
+        changes = {}
+        result = []
+        for position in positions:
+            old_status = records[position]
+            new_status = min(max(old_status + delta, lowest), highest)
+            if new_status != old_status:
+                records[position] = new_status
+                changes[old_status] = changes.get(old_status, 0) - 1
+                changes[new_status] = changes.get(new_status, 0) + 1
+                if index is not None:
+                    index.move(self._slot(position), old_status, new_status)
+                if history is not None:
+                    history.record(self._slot(position), old_status, new_status)
+            result.append(new_status)
+        self._apply_statistics(changes)
+        if self.journal is not None:
+            self.journal.log_change(patient_ids, delta)
+        return result
+
+    def discharge_many(self, patient_ids):
+        """
+        Выписывает нескольких пациентов за один проход по базе.
+        ID относятся к состоянию базы до вызова, повторы игнорируются.
+        Все ID проверяются до первого изменения.
+        :param patient_ids: последовательность ID пациентов
+        :raises ValueError: если хотя бы один ID некорректен
+        """
+        patient_ids = list(patient_ids)
+        positions = sorted(set(self._positions(patient_ids)))
+        records = self._records
+        index = self._status_index
+        history = self.history
+        changes = {}
+        for position in positions:
+            old_status = records[position]
+            changes[old_status] = changes.get(old_status, 0) - 1
+            if index is not None:
+                index.remove(self._slot(position), old_status)
+            if history is not None:
+                history.record(self._slot(position), old_status, None)
+        if self.stable_ids:
+            for position in positions:
+                self.patients.discard(position)
+        else:
+            self.patients.delete_many(positions)
+        self._apply_statistics(changes)
+        if self.journal is not None:
+            self.journal.log_discharge(patient_ids)
+
+    def patients_in_status(self, status, first_id=1):
+        """
+        Перечисляет по возрастанию ID пациентов в заданном статусе (нужен индекс статусов).
+        Стоимость - O(log n) на каждого найденного пациента, база не просматривается.
+        Во время перечисления базу менять нельзя.
+        :param status: код статуса
+        :param first_id: начинать с этого ID
+        :return: генератор ID пациентов
+        :raises RuntimeError: если индекс статусов не включён
+        """
+        index = self._require_status_index()
+        start = self._slot_bound(first_id - 1)
+        if self.stable_ids:
+            return (slot + 1 for slot in index.slots(status, start))
+        return (self.patients.index_of(slot) + 1 for slot in index.slots(status, start))
+
+    def first_patients_in_status(self, status, limit):
+        """
+        Возвращает ID первых limit пациентов в заданном статусе (нужен индекс статусов).
+        :param status: код статуса
+        :param limit: максимальное количество ID
+        :return: список ID пациентов
+        :raises RuntimeError: если индекс статусов не включён
+        """
+        return list(islice(self.patients_in_status(status), limit))
+
+    def count_in_status(self, status, first_id, last_id):
+        """
+        Считает пациентов в заданном статусе с ID от first_id до last_id включительно
+        за O(log n) (нужен индекс статусов).
+        :param status: код статуса
+        :param first_id: первый ID диапазона
+        :param last_id: последний ID диапазона
+        :return: количество пациентов
+        :raises RuntimeError: если индекс статусов не включён
+        """
+        index = self._require_status_index()
+        if first_id > last_id:
+            return 0
+        return index.count(status, self._slot_bound(first_id - 1), self._slot_bound(last_id))
+
+    def snapshot(self):
+        """
+        Согласованный снимок больницы только для чтения: статусы, статистика и поиск
+        по ID в нём не меняются, пока исходная больница продолжает работать.
+        С хранилищем PagedStorage снимок создаётся за O(1) (страницы копируются
+        при записи), с остальными хранилищами база копируется.
+        :return: объект HospitalSnapshot
+        """
+        patients = self.patients
+        if not hasattr(patients, "snapshot"):
+            patients = PagedStorage.from_bytes(patients.tobytes())
+        return HospitalSnapshot.from_storage(patients.snapshot(), dict(self._stats),
+                                             self.stable_ids)
+
+    def has_patient(self, patient_id):
+        """
+        Проверяет, есть ли в больнице пациент с таким ID.
+        :param patient_id: целое число, 1-индексированный ID пациента
+        """
+        try:
+            self._position(patient_id)
+        except ValueError:
+            return False
+        return True
 
     def calculate_statistics(self):
         """
-        Рассчитывает статистику по статусам пациентов.
+        Возвращает статистику по статусам пациентов (за O(1), по счётчикам).
+        :return: словарь {код статуса: количество пациентов}
+        :raises RuntimeError: в режиме проверки, если счётчики разошлись с базой
+        """
+        if self.check_statistics:
+            self.verify_statistics()
+        return dict(self._stats)
+
+    def verify_statistics(self):
+        """
+        Пересчитывает гистограмму заново и сверяет её со счётчиками.
+        :raises RuntimeError: если счётчики разошлись с базой пациентов
+        """
+        actual = self.recalculate_statistics()
+        if actual != self._stats:
+            raise RuntimeError(
+                f"Ошибка. Статистика рассогласована: счётчики {self._stats}, база {actual}"
+            )
+
+    def recalculate_statistics(self):
+        """
+        Рассчитывает статистику полным проходом по базе пациентов (эталон для проверки).
         :return: словарь {код статуса: количество пациентов}
         """
         stats = {}
-        for status in self.patients:
-            stats[status] = stats.get(status, 0) + 1
+        for status in STATUS_TEXT:
+            count = self.patients.count(status)
+            if count:
+                stats[status] = count
         return stats
+
+    def _position(self, patient_id):
+        """
+        Проверяет ID пациента и переводит его в позицию в self._records.
+        :param patient_id: целое число, 1-индексированный ID пациента
+        :return: индекс в базе (или номер слота в режиме стабильных ID)
+        :raises ValueError: если пациента с таким ID нет
+        """
+        index = patient_id - 1
+        if self.stable_ids:
+            if not self.patients.is_alive(index):
+                raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+        elif index < 0 or index >= len(self.patients):
+            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+        return index
+
+    def _slot(self, position):
+        """
+        Номер физического слота для позиции в self._records.
+        """
+        return position if self.stable_ids else self.patients.slot_of(position)
+
+    def _slot_bound(self, index):
+        """
+        Переводит границу диапазона индексов пациентов (с нуля) в границу диапазона слотов:
+        все пациенты с индексом меньше index лежат в слотах меньше результата.
+        """
+        if self.stable_ids:
+            return min(max(index, 0), len(self.patients.slots))
+        if index <= 0:
+            return 0
+        if index >= len(self.patients):
+            return len(self.patients.slots)
+        return self.patients.slot_of(index)
+
+    def _require_status_index(self):
+        """
+        :return: индекс статусов
+        :raises RuntimeError: если индекс статусов не включён
+        """
+        if self._status_index is None:
+            raise RuntimeError("Ошибка. Индекс статусов не включён (status_index=True)")
+        return self._status_index
+
+    def _positions(self, patient_ids):
+        """
+        Проверяет набор ID и переводит их в позиции в self._records.
+        Для сдвигаемых ID границы проверяются один раз на весь набор.
+        :param patient_ids: последовательность ID пациентов
+        :return: список позиций в том же порядке
+        :raises ValueError: если хотя бы одного пациента нет
+        """
+        patient_ids = list(patient_ids)
+        if self.stable_ids:
+            return [self._position(patient_id) for patient_id in patient_ids]
+        if patient_ids and (min(patient_ids) < 1 or max(patient_ids) > len(self.patients)):
+            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+        return [patient_id - 1 for patient_id in patient_ids]
+
+    def _apply_statistics(self, changes):
+        """
+        Применяет к гистограмме набор изменений, удаляя нулевые значения.
+        :param changes: словарь {код статуса: изменение количества}
+        """
+        self.stats_version += 1
+        for status, change in changes.items():
+            count = self._stats.get(status, 0) + change
+            if count:
+                self._stats[status] = count
+            else:
+                self._stats.pop(status, None)
+
+    def _move_in_statistics(self, old_status, status, position):
+        """
+        Переносит одного пациента между статусами в гистограмме и индексе статусов
+        и записывает переход в историю.
+        :param old_status: прежний код статуса
+        :param status: новый код статуса
+        :param position: позиция пациента в self._records
+        """
+        self._remove_from_statistics(old_status)
+        self._stats[status] = self._stats.get(status, 0) + 1
+        if self._status_index is not None:
+            self._status_index.move(self._slot(position), old_status, status)
+        if self.history is not None:
+            self.history.record(self._slot(position), old_status, status)
+
+    def _remove_from_statistics(self, status):
+        """
+        Уменьшает счётчик статуса на единицу, удаляя нулевые значения из гистограммы.
+        :param status: код статуса
+        """
+        # Отсюда же идёт _move_in_statistics, поэтому версия меняется только здесь
+        self.stats_version += 1
+        count = self._stats[status] - 1
+        if count:
+            self._stats[status] = count
+        else:
+            del self._stats[status]
+
+
+class HospitalSnapshot(Hospital):
+    """
+    Снимок больницы только для чтения (см. Hospital.snapshot).
+    Операции чтения и статистика работают как у Hospital, изменения запрещены.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Ошибка. Снимок больницы доступен только для чтения")
+
+    set_patient_status = set_statuses = change_statuses = _read_only
+    discharge = discharge_many = _read_only
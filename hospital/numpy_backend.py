@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Модуль векторизованной больницы на NumPy.
+Содержит хранилище NumpyStorage (массив uint8, один байт на пациента),
+класс NumpyHospital с пакетными операциями через маски и индексные массивы
+и аналитикой (гистограммы по диапазонам ID, матрица переходов), а также
+фабрику create_hospital, которая без NumPy возвращает обычный Hospital.
+NumPy - необязательная зависимость: модуль импортируется и без неё.
+"""
+
+from hospital.models import Hospital, STATUS_TEXT
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class NumpyStorage:
+    """
+    Хранилище статусов в массиве numpy.uint8 (1 байт на пациента).
+    Поддерживает тот же интерфейс, что и хранилища из hospital.storage;
+    индексация возвращает обычные int.
+    """
+    def __init__(self, count=0, status=1):
+        """
+        :param count: количество пациентов
+        :param status: начальный код статуса всех пациентов
+        """
+        if not HAS_NUMPY:
+            raise ImportError("Ошибка. Для NumpyStorage нужен пакет numpy")
+        self.array = np.full(count, status, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        return int(self.array[index])
+
+    def __setitem__(self, index, status):
+        self.array[index] = status
+
+    def __delitem__(self, index):
+        self.array = np.delete(self.array, index)
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def count(self, status):
+        """
+        Подсчитывает пациентов в заданном статусе (векторно).
+        """
+        return int(np.count_nonzero(self.array == status))
+
+    def delete_many(self, indices):
+        """
+        Удаляет несколько элементов одной маской.
+        :param indices: возрастающая последовательность различных индексов
+        """
+        keep = np.ones(len(self.array), dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        self.array = self.array[keep]
+
+    def tobytes(self):
+        return self.array.tobytes()
+
+
+class NumpyHospital(Hospital):
+    """
+    Больница с базой в NumpyStorage.
+    Одиночные операции наследуются от Hospital, пакетные выполняются над
+    индексными массивами без цикла Python по пациентам, полный пересчёт
+    статистики - через np.bincount. Работает только в режиме сдвигаемых ID
+    (tombstones, stable_ids, status_index и history не поддерживаются).
+    """
+    def __init__(self, count=200, check_statistics=False):
+        """
+        :param count: количество пациентов на начало сеанса
+        :param check_statistics: режим проверки согласованности статистики
+        """
+        super().__init__(count, check_statistics, storage=NumpyStorage)
+
+    def get_statuses(self, patient_ids):
+        return self.patients.array[self._index_array(patient_ids)].tolist()
+
+    def set_statuses(self, patient_ids, status):
+        patient_ids = list(patient_ids)
+        # Повторы ID не должны учитываться в статистике дважды
+        positions = np.unique(self._index_array(patient_ids))
+        if status not in STATUS_TEXT:
+            raise ValueError("Ошибка. Некорректный код статуса пациента")
+        data = self.patients.array
+        changes = self._histogram(data[positions], -1)
+        data[positions] = status
+        changes[status] = changes.get(status, 0) + len(positions)
+        self._apply_statistics(changes)
+        if self.journal is not None:
+            self.journal.log_set(patient_ids, status)
+
+    def change_statuses(self, patient_ids, delta):
+        patient_ids = list(patient_ids)
+        positions = self._index_array(patient_ids)
+        if len(np.unique(positions)) != len(positions):
+            # Повторный ID меняется несколько раз подряд - это последовательная семантика
+            return super().change_statuses(patient_ids, delta)
+        data = self.patients.array
+        old = data[positions]
+        new = np.clip(old.astype(np.int64) + delta, min(STATUS_TEXT), max(STATUS_TEXT)).astype(np.uint8)
+        data[positions] = new
+        changes = self._histogram(old, -1)
+        for status, count in self._histogram(new, 1).items():
+            changes[status] = changes.get(status, 0) + count
+        self._apply_statistics(changes)
+        if self.journal is not None:
+            self.journal.log_change(patient_ids, delta)
+        return new.tolist()
+
+    def discharge_many(self, patient_ids):
+        patient_ids = list(patient_ids)
+        positions = np.unique(self._index_array(patient_ids))
+        self._apply_statistics(self._histogram(self.patients.array[positions], -1))
+        self.patients.delete_many(positions)
+        if self.journal is not None:
+            self.journal.log_discharge(patient_ids)
+
+    def recalculate_statistics(self):
+        """
+        Пересчитывает гистограмму одним вызовом np.bincount.
+        :return: словарь {код статуса: количество пациентов}
+        """
+        return self._histogram(self.patients.array, 1)
+
+    def range_histogram(self, first_id, last_id):
+        """
+        Статистика по статусам для пациентов с ID от first_id до last_id включительно.
+        :return: словарь {код статуса: количество пациентов}
+        """
+        first = max(first_id, 1) - 1
+        return self._histogram(self.patients.array[first:max(last_id, first)], 1)
+
+    def range_histograms(self, size):
+        """
+        Статистика по статусам для последовательных диапазонов по size ID.
+        :param size: количество ID в диапазоне
+        :return: список кортежей (первый ID, последний ID, {код статуса: количество})
+        """
+        data = self.patients.array
+        result = []
+        for first in range(0, len(data), size):
+            last = min(first + size, len(data))
+            result.append((first + 1, last, self._histogram(data[first:last], 1)))
+        return result
+
+    def status_array(self):
+        """
+        :return: копия массива статусов (например, для последующей transition_matrix)
+        """
+        return self.patients.array.copy()
+
+    def transition_matrix(self, before, after=None):
+        """
+        Матрица переходов между двумя состояниями базы одинакового размера:
+        элемент [i][j] - сколько пациентов было в статусе i и стало в статусе j.
+        :param before: массив статусов из status_array()
+        :param after: второй массив (по умолчанию - текущее состояние)
+        :return: список списков размером (количество статусов) x (количество статусов)
+        :raises ValueError: если размеры состояний различаются (между ними была выписка)
+        """
+        after = self.patients.array if after is None else after
+        if len(before) != len(after):
+            raise ValueError("Ошибка. Состояния базы разного размера: между ними была выписка")
+        size = len(STATUS_TEXT)
+        pairs = before.astype(np.intp) * size + after
+        return np.bincount(pairs, minlength=size * size).reshape(size, size).tolist()
+
+    def _index_array(self, patient_ids):
+        """
+        Проверяет набор ID и переводит его в массив позиций.
+        :raises ValueError: если хотя бы одного пациента нет
+        """
+        positions = np.asarray(list(patient_ids), dtype=np.intp) - 1
+        if len(positions) and (positions.min() < 0 or positions.max() >= len(self.patients)):
+            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+        return positions
+
+    @staticmethod
+    def _histogram(statuses, sign):
+        """
+        Гистограмма массива статусов, умноженная на sign (1 или -1).
+        :return: словарь {код статуса: ±количество} без нулевых значений
+        """
+        counts = np.bincount(statuses, minlength=len(STATUS_TEXT))
+        return {status: sign * int(count) for status, count in enumerate(counts) if count}
+
+
+def create_hospital(count=200, check_statistics=False):
+    """
+    Больница с векторизованными операциями, если установлен NumPy, иначе обычный Hospital.
+    :param count: количество пациентов на начало сеанса
+    :param check_statistics: режим проверки согласованности статистики
+    :return: NumpyHospital или Hospital
+    """
+    if HAS_NUMPY:
+        return NumpyHospital(count, check_statistics)
+    return Hospital(count, check_statistics)
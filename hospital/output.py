@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Модуль вывода ответов приложения.
+Содержит приёмники вывода (ConsoleSink - построчно на консоль, BufferedSink -
+накопление в буфере с записью пачками) и класс Templates с заранее
+подготовленными текстами ответов для каждого статуса.
+"""
+
+import sys
+
+
+class ConsoleSink:
+    """
+    Вывод на консоль: каждая строка сразу печатается через print.
+    sys.stdout берётся в момент записи, поэтому подмена потока (например, в тестах)
+    учитывается.
+    """
+    def write(self, text):
+        """
+        :param text: строка ответа без символа перевода строки
+        """
+        print(text)
+
+    def flush(self):
+        """
+        Строки не накапливаются - сбрасывать нечего.
+        """
+
+
+class BufferedSink:
+    """
+    Вывод с буферизацией: строки копятся в списке lines и записываются
+    в поток одним вызовом, когда их набирается flush_every, или при flush().
+    """
+    def __init__(self, stream=None, flush_every=1000):
+        """
+        :param stream: поток вывода (по умолчанию - sys.stdout в момент сброса)
+        :param flush_every: размер пачки в строках; None - только явный flush()
+        """
+        self.stream = stream
+        self.flush_every = flush_every
+        self.lines = []
+
+    def write(self, text):
+        """
+        :param text: строка ответа без символа перевода строки
+        """
+        self.lines.append(text)
+        if self.flush_every is not None and len(self.lines) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Записывает накопленные строки в поток одним вызовом.
+        """
+        if self.lines:
+            stream = sys.stdout if self.stream is None else self.stream
+            stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+    def take(self):
+        """
+        Забирает накопленные строки, не записывая их в поток.
+        :return: список строк
+        """
+        lines, self.lines = self.lines, []
+        return lines
+
+
+class Templates:
+    """
+    Тексты ответов, заранее подготовленные для каждого статуса из таблицы status_text,
+    чтобы не форматировать их при каждой команде.
+    """
+    def __init__(self, status_text):
+        """
+        :param status_text: словарь {код статуса: название статуса}
+        """
+        self.status_text = status_text
+        # Название статуса в кавычках (для ответов с ID пациента)
+        self.quoted = {code: f'"{text}"' for code, text in status_text.items()}
+        self.status = {code: f'Статус пациента: "{text}"' for code, text in status_text.items()}
+        self.new_status = {code: f'Новый статус пациента: "{text}"'
+                           for code, text in status_text.items()}
+        self.stayed = {code: f'Пациент остался в статусе "{text}"'
+                       for code, text in status_text.items()}
+        # Начало строки статистики; количество дописывается при построении отчёта
+        self.statistics = [(code, f'\t- в статусе "{status_text[code]}": ')
+                           for code in sorted(status_text)]
+
+    def report(self, total, stats):
+        """
+        Отчёт команды «рассчитать статистику».
+        :param total: количество пациентов в больнице
+        :param stats: гистограмма статусов {код статуса: количество}
+        :return: список строк отчёта
+        """
+        lines = [f'В больнице на данный момент находится {total} чел., из них:']
+        for code, prefix in self.statistics:
+            count = stats.get(code, 0)
+            if count > 0:
+                lines.append(f'{prefix}{count} чел.')
+        return lines
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Модуль рангового индекса.
+Содержит класс RankIndex - дерево Фенвика над неотрицательными весами позиций.
+"""
+
+from array import array
+
+
+class RankIndex:
+    """
+    Дерево Фенвика (двоичное индексированное дерево) над весами позиций 0..size-1.
+    Изменение веса, префиксная сумма и поиск позиции по рангу выполняются за O(log n).
+    """
+    def __init__(self, size, weight=1, typecode='q'):
+        """
+        :param size: количество позиций
+        :param weight: начальный вес каждой позиции
+        :param typecode: тип элементов массива дерева ('q' - 8 байт на позицию;
+            'i' - 4 байта, если суммы весов заведомо меньше 2**31)
+        """
+        self.size = max(size, 0)
+        self.total = weight * self.size
+        # tree[i] хранит сумму весов на отрезке длины lowbit(i), заканчивающемся позицией i - 1.
+        self._tree = array(typecode, [0]) * (self.size + 1)
+        if weight:
+            step = 1
+            while step <= self.size:
+                # Позиции с младшим битом step: step, 3 * step, 5 * step, ...
+                count = len(range(step, self.size + 1, 2 * step))
+                self._tree[step::2 * step] = array(typecode, [weight * step]) * count
+                step *= 2
+        self._top = 1 << self.size.bit_length() >> 1 if self.size else 0
+
+    def add(self, position, delta):
+        """
+        Изменяет вес позиции.
+        :param position: позиция (с нуля)
+        :param delta: приращение веса
+        """
+        self.total += delta
+        i = position + 1
+        tree = self._tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, position):
+        """
+        Сумма весов позиций 0..position-1.
+        :param position: граница отрезка (не включительно)
+        :return: сумма весов
+        """
+        result = 0
+        i = position
+        tree = self._tree
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, rank):
+        """
+        Находит позицию единицы веса с номером rank (с нуля),
+        то есть наименьшую позицию p, для которой prefix(p + 1) > rank.
+        :param rank: ранг, 0 <= rank < total
+        :return: позиция (с нуля)
+        """
+        position = 0
+        step = self._top
+        tree = self._tree
+        while step:
+            nxt = position + step
+            if nxt <= self.size and tree[nxt] <= rank:
+                position = nxt
+                rank -= tree[nxt]
+            step >>= 1
+        return position
+
+    def copy(self):
+        """
+        Независимая копия индекса за O(n) (копирование массива дерева того же типа).
+        """
+        clone = RankIndex(0)
+        clone.size = self.size
+        clone.total = self.total
+        clone._tree = self._tree[:]
+        clone._top = self._top
+        return clone
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Модуль сетевого доступа к больнице.
+Содержит asyncio-сервер со строковым протоколом: клиент присылает те же строки,
+что вводил бы в консоли (команды, ID, ответы «да/нет»), и получает те же ответы.
+Все подключения работают с одной общей больницей, у каждого - свой сеанс.
+Тот же протокол доступен через Unix-сокет (start_unix_server) - так работает
+локальный демон, которому короткоживущий клиент передаёт одну команду.
+"""
+
+import asyncio
+import os
+import signal
+
+from hospital.app import HospitalApp
+from hospital.output import BufferedSink
+
+# Предельная длина строки от клиента; при превышении соединение закрывается.
+MAX_LINE = 64 * 1024
+# Предельная длина выполняемой строки команды: более длинная строка не разбирается,
+# клиент получает ошибку. Разбор идёт в цикле событий, поэтому его время ограничено.
+MAX_COMMAND_LINE = 4096
+
+
+class NeedMoreInput(Exception):
+    """
+    Команде не хватает строк ввода; prompt - приглашение, которое ждёт ответа.
+    """
+    def __init__(self, prompt):
+        super().__init__(prompt)
+        self.prompt = prompt
+
+
+class HospitalSession(HospitalApp):
+    """
+    Сеанс одного клиента: принимает строки по мере поступления и выполняет
+    команды из той же таблицы self.commands, что и консольное приложение.
+
+    Если команде не хватает ввода (например, ждём подтверждения выписки),
+    попытка прерывается и повторяется целиком, когда придёт следующая строка.
+    Это безопасно, потому что все обработчики сначала читают весь ввод
+    и только потом меняют базу.
+
+    Непредвиденное исключение в команде не обрывает сеанс: клиент получает
+    строку с ошибкой, а строки этой команды считаются использованными.
+    Строки длиннее MAX_COMMAND_LINE не выполняются: вместо них клиент получает ошибку.
+    """
+    def __init__(self, hospital):
+        # Ответы копятся до конца команды и отдаются из feed, а не печатаются
+        super().__init__(hospital, BufferedSink(flush_every=None))
+        # Полученные, но ещё не использованные строки и позиция чтения в них
+        self._pending = []
+        self._cursor = 0
+        # Приглашение, с которым ждёт ввода незавершённая команда (None - не ждёт)
+        self.prompt = None
+
+    def feed(self, *lines):
+        """
+        Принимает строки от клиента и выполняет все команды, для которых хватает ввода.
+        :param lines: строки без символа перевода строки
+        :return: список строк ответа; если последняя команда ждёт ввода,
+            последней строкой идёт приглашение к вводу
+        """
+        responses = []
+        for line in lines:
+            if len(line) > MAX_COMMAND_LINE:
+                responses.append(f"Ошибка. Строка длиннее {MAX_COMMAND_LINE} символов не выполняется")
+            else:
+                self._pending.append(line)
+        # Незавершённая команда остаётся в _pending и ниже снова попросит ввод
+        self.prompt = None
+        while self.running and self._pending:
+            self._cursor = 0
+            try:
+                self.execute(self.read_line("Введите команду: "))
+            except NeedMoreInput as need:
+                # Ответы прерванной попытки отбрасываются: команда повторится целиком
+                self.output.take()
+                self.prompt = need.prompt
+                responses.append(need.prompt)
+                break
+            except Exception as error:
+                self.write(f"Ошибка. Команда не выполнена из-за внутренней ошибки "
+                           f"({type(error).__name__})")
+            del self._pending[:self._cursor]
+            responses.extend(self.output.take())
+        return responses
+
+    def read_line(self, prompt):
+        if self._queued:
+            return self._queued.popleft()
+        if self._cursor < len(self._pending):
+            line = self._pending[self._cursor]
+            self._cursor += 1
+            return line
+        raise NeedMoreInput(prompt)
+
+
+async def handle_client(hospital, reader, writer):
+    """
+    Обслуживает одно подключение до команды «стоп» или разрыва связи.
+    Клиент может присылать строки пачкой, не дожидаясь ответов (конвейер):
+    все полученные целые строки обрабатываются по порядку, а ответы на них
+    отправляются одной записью. Между строками задача отдаёт управление циклу
+    событий, поэтому длинная пачка команд одного клиента не задерживает
+    остальных: работа одной строки ограничена её длиной (MAX_COMMAND_LINE)
+    и числом ID в команде (hospital.commands.MAX_IDS).
+    Медленный клиент тормозит только собственную задачу (writer.drain).
+    """
+    session = HospitalSession(hospital)
+    buffer = b""
+    try:
+        while session.running:
+            chunk = await reader.read(MAX_LINE)
+            if not chunk:
+                break
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            if len(buffer) > MAX_LINE:
+                break
+            responses = []
+            waiting = False
+            for line in lines:
+                if not session.running:
+                    break
+                if waiting:
+                    # Приглашение нужно только после последней строки пачки
+                    responses.pop()
+                responses.extend(session.feed(line.decode("utf-8", "replace").rstrip("\r")))
+                waiting = session.prompt is not None
+                await asyncio.sleep(0)
+            if responses:
+                writer.write(("\n".join(responses) + "\n").encode("utf-8"))
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start_server(hospital, host="127.0.0.1", port=8765):
+    """
+    Запускает сервер, обслуживающий больницу.
+    :param hospital: общая для всех клиентов больница
+    :param host: адрес для прослушивания
+    :param port: порт (0 - выбрать свободный)
+    :return: объект asyncio.Server
+    """
+    return await asyncio.start_server(
+        lambda reader, writer: handle_client(hospital, reader, writer), host, port)
+
+
+async def start_unix_server(hospital, path):
+    """
+    Запускает сервер на Unix-сокете (оставшийся от прошлого запуска сокет заменяется,
+    обычный файл по этому пути - нет).
+    Клиент может отправить строки, закрыть соединение на запись и читать ответ
+    до конца потока: после конца ввода сервер отвечает на всё полученное и закрывает соединение.
+    :param hospital: общая для всех клиентов больница
+    :param path: путь к файлу сокета
+    :return: объект asyncio.Server
+    """
+    return await asyncio.start_unix_server(
+        lambda reader, writer: handle_client(hospital, reader, writer), path)
+
+
+def serve_forever(hospital, host="127.0.0.1", port=8765, path=None):
+    """
+    Запускает сервер и обслуживает клиентов до прерывания (Ctrl+C).
+    :param path: путь к Unix-сокету; если задан, host и port не используются,
+        сервер завершается также по SIGTERM, а файл сокета при завершении удаляется
+    """
+    async def main():
+        if path is None:
+            server = await start_server(hospital, host, port)
+            async with server:
+                await server.serve_forever()
+            return
+        server = await start_unix_server(hospital, path)
+        # Демон останавливают и сигналом SIGTERM (например, из systemd или cron)
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        async with server:
+            await stopped.wait()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
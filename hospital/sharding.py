@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Модуль сети больниц (шардирование).
+Содержит класс ShardedHospital - фасад с интерфейсом Hospital, который делит
+пациентов между несколькими объектами Hospital (шардами) и направляет каждую
+операцию в нужный шард по глобальному ID.
+"""
+
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from hospital.models import Hospital, STATUS_TEXT
+from hospital.rank_index import RankIndex
+
+
+class ShardedHospital:
+    """
+    Больница из нескольких шардов, каждый - отдельный Hospital с непрерывным
+    диапазоном пациентов. Глобальный ID переводится в (шард, локальный ID):
+        - при сдвигаемых ID - через RankIndex над размерами шардов, который
+          обновляется при каждой выписке (O(log N) на операцию);
+        - в режиме стабильных ID - по неизменным границам диапазонов.
+    """
+    def __init__(self, count=200, shards=4, **options):
+        """
+        :param count: общее количество пациентов
+        :param shards: количество шардов
+        :param options: параметры каждого шарда Hospital (storage, stable_ids, ...)
+        """
+        shards = max(1, shards)
+        sizes = [count // shards + (1 if i < count % shards else 0) for i in range(shards)]
+        self.shards = [Hospital(size, **options) for size in sizes]
+        self.stable_ids = options.get("stable_ids", False)
+        # Первый глобальный индекс каждого шарда (для стабильных ID)
+        self._starts = [sum(sizes[:i]) for i in range(shards)]
+        self._sizes = RankIndex(shards, weight=0)
+        for number, size in enumerate(sizes):
+            self._sizes.add(number, size)
+
+    def __len__(self):
+        return self._sizes.total
+
+    def get_patient_status(self, patient_id):
+        shard, local_id = self._route(patient_id)
+        return self.shards[shard].get_patient_status(local_id)
+
+    def set_patient_status(self, patient_id, status):
+        shard, local_id = self._route(patient_id)
+        self.shards[shard].set_patient_status(local_id, status)
+
+    def discharge(self, patient_id):
+        shard, local_id = self._route(patient_id)
+        self.shards[shard].discharge(local_id)
+        self._sizes.add(shard, -1)
+
+    def has_patient(self, patient_id):
+        try:
+            self._route(patient_id)
+        except ValueError:
+            return False
+        return True
+
+    def get_statuses(self, patient_ids):
+        return [self.get_patient_status(patient_id) for patient_id in patient_ids]
+
+    def set_statuses(self, patient_ids, status):
+        """
+        Пакетная установка статуса: все ID проверяются до первого изменения.
+        """
+        if status not in STATUS_TEXT:
+            raise ValueError("Ошибка. Некорректный код статуса пациента")
+        for shard, local_ids in self._group(patient_ids).items():
+            self.shards[shard].set_statuses(local_ids, status)
+
+    def change_statuses(self, patient_ids, delta):
+        """
+        Пакетное изменение статуса: все ID проверяются до первого изменения.
+        :return: список новых кодов статусов в исходном порядке
+        """
+        routes = [self._route(patient_id) for patient_id in patient_ids]
+        return [self.shards[shard].change_statuses([local_id], delta)[0]
+                for shard, local_id in routes]
+
+    def discharge_many(self, patient_ids):
+        """
+        Пакетная выписка: ID относятся к состоянию до вызова, все проверяются заранее.
+        """
+        for shard, local_ids in self._group(patient_ids).items():
+            self.shards[shard].discharge_many(local_ids)
+            self._sizes.add(shard, -len(set(local_ids)))
+
+    def calculate_statistics(self):
+        """
+        Статистика сети: сумма счётчиков всех шардов (O(количество шардов)).
+        :return: словарь {код статуса: количество пациентов}
+        """
+        return _merge(shard.calculate_statistics() for shard in self.shards)
+
+    def recalculate_statistics(self, executor=None):
+        """
+        Полный пересчёт статистики по схеме map-reduce: каждый шард пересчитывается
+        в отдельном процессе, результаты складываются.
+        :param executor: пул процессов (по умолчанию создаётся на время вызова)
+        :return: словарь {код статуса: количество пациентов}
+        """
+        data = [shard.patients.tobytes() for shard in self.shards]
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=len(self.shards)) as pool:
+                return _merge(pool.map(count_statuses, data))
+        return _merge(executor.map(count_statuses, data))
+
+    def _route(self, patient_id):
+        """
+        Переводит глобальный ID в номер шарда и локальный ID в нём.
+        :raises ValueError: если пациента с таким ID нет
+        """
+        index = patient_id - 1
+        if self.stable_ids:
+            shard = bisect_right(self._starts, index) - 1
+            if index < 0 or not self.shards[shard].has_patient(index - self._starts[shard] + 1):
+                raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+            return shard, index - self._starts[shard] + 1
+        if index < 0 or index >= self._sizes.total:
+            raise ValueError("Ошибка. В больнице нет пациента с таким ID")
+        shard = self._sizes.find(index)
+        return shard, index - self._sizes.prefix(shard) + 1
+
+    def _group(self, patient_ids):
+        """
+        Раскладывает набор глобальных ID по шардам (все ID проверяются сразу).
+        :return: словарь {номер шарда: список локальных ID}
+        """
+        groups = {}
+        for shard, local_id in [self._route(patient_id) for patient_id in patient_ids]:
+            groups.setdefault(shard, []).append(local_id)
+        return groups
+
+
+def count_statuses(data):
+    """
+    Подсчёт статусов в байтовом массиве одного шарда (выполняется в дочернем процессе).
+    :param data: статусы шарда, один байт на пациента
+    :return: словарь {код статуса: количество пациентов}
+    """
+    stats = {}
+    for status in STATUS_TEXT:
+        count = data.count(status)
+        if count:
+            stats[status] = count
+    return stats
+
+
+def _merge(parts):
+    """
+    Складывает гистограммы шардов.
+    """
+    total = {}
+    for part in parts:
+        for status, count in part.items():
+            total[status] = total.get(status, 0) + count
+    return total
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Модуль снимков состояния больницы.
+Снимок - это двоичный файл: заголовок фиксированного размера и массив статусов
+(один байт на пациента). Загрузка отображает файл в память (mmap) и не разбирает
+статусы, поэтому открытие снимка любого размера занимает O(1). В режиме стабильных ID
+число пациентов берётся из заголовка, а ранговый индекс слотов строится (за O(n))
+только при первом обращении по порядковому индексу - доступ по ID, выписка
+и статистика без него обходятся.
+"""
+
+import mmap
+import os
+import struct
+
+from hospital.models import Hospital, STATUS_TEXT
+from hospital.storage import MmapStorage, TombstoneStorage
+
+# Заголовок: сигнатура, версия, флаги, поколение журнала, количество слотов,
+# количество пациентов в статусах 0..3.
+HEADER = struct.Struct("<4sBBxxQQ4Q")
+MAGIC = b"HSNP"
+VERSION = 1
+FLAG_STABLE_IDS = 1
+
+
+def save_snapshot(hospital, path, generation=0):
+    """
+    Сохраняет состояние больницы в файл снимка.
+    Файл записывается во временный и атомарно подменяет прежний.
+    :param hospital: объект Hospital
+    :param path: путь к файлу снимка
+    :param generation: поколение журнала операций, с которого продолжается запись
+        после этого снимка (см. hospital.journal)
+    """
+    if hospital.stable_ids:
+        # Слоты сохраняются вместе с пометками выписанных, чтобы не сдвигать ID
+        data = hospital.patients.slots.tobytes()
+    else:
+        data = hospital.patients.tobytes()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_header(hospital, len(data), generation))
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path, writable=False, check_statistics=False):
+    """
+    Открывает снимок без разбора статусов: база пациентов читается прямо из mmap.
+    По умолчанию отображение копируется при записи (изменения не попадают в файл);
+    при writable=True изменения пишутся в файл и фиксируются вызовом flush_snapshot.
+    :param path: путь к файлу снимка
+    :param writable: записывать ли изменения обратно в файл
+    :param check_statistics: режим проверки согласованности статистики
+    :return: объект Hospital
+    :raises ValueError: если файл не является снимком больницы
+    """
+    with open(path, "r+b" if writable else "rb") as file:
+        mm = mmap.mmap(file.fileno(), 0,
+                       access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY)
+    if len(mm) < HEADER.size:
+        mm.close()
+        raise ValueError("Ошибка. Файл не является снимком больницы")
+    magic, version, flags, _, count, *counts = HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION or len(mm) < HEADER.size + count:
+        mm.close()
+        raise ValueError("Ошибка. Файл не является снимком больницы")
+    patients = MmapStorage(mm, HEADER.size, count)
+    stable_ids = bool(flags & FLAG_STABLE_IDS)
+    stats = dict(zip(sorted(STATUS_TEXT), counts))
+    if stable_ids:
+        patients = TombstoneStorage(patients, alive=sum(counts))
+    return Hospital.from_storage(patients, stats, stable_ids=stable_ids,
+                                 check_statistics=check_statistics)
+
+
+def read_generation(path):
+    """
+    Читает из заголовка снимка поколение журнала операций.
+    :param path: путь к файлу снимка
+    :return: поколение журнала
+    :raises ValueError: если файл не является снимком больницы
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size or header[:4] != MAGIC:
+        raise ValueError("Ошибка. Файл не является снимком больницы")
+    return HEADER.unpack(header)[3]
+
+
+def flush_snapshot(hospital):
+    """
+    Фиксирует в файле изменения больницы, загруженной с writable=True:
+    обновляет заголовок и сбрасывает отображение на диск.
+    :param hospital: объект Hospital, полученный из load_snapshot
+    """
+    storage = hospital.patients.slots if hospital.stable_ids else hospital.patients
+    generation = HEADER.unpack_from(storage.mm)[3]
+    storage.mm[:HEADER.size] = _header(hospital, len(storage), generation)
+    storage.mm.flush()
+
+
+def _header(hospital, count, generation):
+    """
+    Формирует заголовок снимка.
+    :param hospital: объект Hospital
+    :param count: количество сохраняемых слотов
+    :param generation: поколение журнала операций
+    :return: байты заголовка
+    """
+    stats = hospital.calculate_statistics()
+    flags = FLAG_STABLE_IDS if hospital.stable_ids else 0
+    return HEADER.pack(MAGIC, VERSION, flags, generation, count,
+                       *(stats.get(status, 0) for status in sorted(STATUS_TEXT)))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Модуль индекса пациентов по статусам.
+Содержит класс StatusIndex - по одному RankIndex на каждый код статуса,
+с единицами в слотах пациентов, находящихся в этом статусе.
+"""
+
+from hospital.rank_index import RankIndex
+
+
+class StatusIndex:
+    """
+    Индекс принадлежности слотов к статусам.
+    Перенос слота между статусами и подсчёт в диапазоне - O(log n),
+    перечисление слотов статуса - O(log n) на каждый найденный слот.
+    Занимает 4 байта на слот для каждого статуса (счётчики дерева 32-битные:
+    в дереве не больше единиц, чем слотов).
+    """
+    def __init__(self, size, statuses, status=1):
+        """
+        :param size: количество слотов
+        :param statuses: все возможные коды статусов
+        :param status: начальный статус всех слотов
+        """
+        self._trees = {code: RankIndex(size, weight=1 if code == status else 0,
+                                          typecode='i')
+                       for code in statuses}
+
+    def move(self, slot, old_status, status):
+        """
+        Переносит слот из одного статуса в другой.
+        """
+        if old_status != status:
+            self._trees[old_status].add(slot, -1)
+            self._trees[status].add(slot, 1)
+
+    def remove(self, slot, status):
+        """
+        Убирает слот из индекса (выписка).
+        """
+        self._trees[status].add(slot, -1)
+
+    def count(self, status, start, stop):
+        """
+        Количество слотов статуса в диапазоне [start, stop).
+        """
+        tree = self._trees[status]
+        return tree.prefix(stop) - tree.prefix(start)
+
+    def slots(self, status, start=0):
+        """
+        Перечисляет по возрастанию слоты статуса, начиная со слота start.
+        Во время перечисления индекс не должен меняться.
+        :return: генератор номеров слотов
+        """
+        tree = self._trees[status]
+        for rank in range(tree.prefix(start), tree.total):
+            yield tree.find(rank)
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Модуль хранилищ статусов пациентов.
+Содержит взаимозаменяемые реализации базы пациентов для класса Hospital.
+Любое хранилище поддерживает len(), индексацию, присваивание, удаление по индексу,
+итерацию, подсчёт пациентов в заданном статусе (count), удаление набора индексов (delete_many)
+и выгрузку статусов в байты (tobytes).
+"""
+
+import copy
+import threading
+import weakref
+from itertools import repeat
+
+from hospital.rank_index import RankIndex
+
+# Служебный код, которым помечается слот выписанного пациента в TombstoneStorage.
+DISCHARGED = 255
+# Размер блока, которым MmapStorage.count читает отображение.
+COUNT_BLOCK = 1 << 20
+
+
+class ListStorage:
+    """
+    Эталонное хранилище: обычный список Python (один указатель, 8 байт, на пациента).
+    """
+    def __init__(self, count=0, status=1):
+        """
+        :param count: количество пациентов
+        :param status: начальный код статуса всех пациентов
+        """
+        self._data = self._allocate(count, status)
+
+    @staticmethod
+    def _allocate(count, status):
+        """
+        Создаёт внутренний контейнер из count одинаковых статусов.
+        """
+        return [status] * count
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __setitem__(self, index, status):
+        self._data[index] = status
+
+    def __delitem__(self, index):
+        del self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def count(self, status):
+        """
+        Подсчитывает пациентов в заданном статусе полным проходом.
+        :param status: код статуса
+        :return: количество пациентов
+        """
+        return self._data.count(status)
+
+    def delete_many(self, indices):
+        """
+        Удаляет несколько элементов за один проход с уплотнением данных.
+        :param indices: возрастающая последовательность различных индексов
+        """
+        data = self._data
+        kept = data[:0]
+        start = 0
+        for index in indices:
+            kept += data[start:index]
+            start = index + 1
+        kept += data[start:]
+        self._data = kept
+
+    def tobytes(self):
+        """
+        Возвращает статусы в виде байтов (один байт на пациента).
+        """
+        return bytes(self._data)
+
+
+class ByteArrayStorage(ListStorage):
+    """
+    Компактное хранилище: один байт на пациента (bytearray).
+    Занимает в 8 раз меньше памяти, чем ListStorage, при том же интерфейсе.
+    """
+    @staticmethod
+    def _allocate(count, status):
+        return bytearray([status]) * count
+
+
+class PagedStorage:
+    """
+    Хранилище из страниц по page_size байт (bytearray) с копированием при записи.
+    Метод snapshot() за O(1) возвращает замороженную копию, которая делит страницы
+    с исходным хранилищем; пока снимок жив, при первой записи в общую страницу
+    писатель копирует только её. Таблица страниц копируется один раз после каждого
+    снимка (O(n / page_size)).
+    Пока не было удалений, страница находится делением индекса; после первого
+    удаления строится RankIndex над размерами страниц, выписка сдвигает байты
+    только внутри одной страницы, а поиск страницы стоит O(log(n / page_size)).
+    """
+    def __init__(self, count=0, status=1, page_size=4096):
+        """
+        :param count: количество пациентов
+        :param status: начальный код статуса всех пациентов
+        :param page_size: размер страницы в байтах
+        """
+        self.page_size = page_size
+        pages = (count + page_size - 1) // page_size
+        self._pages = [bytearray([status]) * page_size for _ in range(pages)]
+        if pages and count % page_size:
+            del self._pages[-1][count % page_size:]
+        self._len = count
+        # Индекс размеров страниц (строится при первом удалении)
+        self._sizes = None
+        # Какие страницы принадлежат только этому хранилищу; таблица страниц общая со снимком?
+        self._owned = [True] * pages
+        self._shared_table = False
+        self.frozen = False
+        self._cow_lock = threading.Lock()
+        # Живые снимки; когда их не осталось, копировать страницы больше не нужно
+        self._views = weakref.WeakSet()
+
+    @classmethod
+    def from_bytes(cls, data, page_size=4096):
+        """
+        Создаёт хранилище с копией статусов из байтов (один байт на пациента).
+        """
+        storage = cls(0, page_size=page_size)
+        storage._pages = [bytearray(data[start:start + page_size])
+                          for start in range(0, len(data), page_size)]
+        storage._len = len(data)
+        storage._owned = [True] * len(storage._pages)
+        return storage
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        page, offset = self._locate(index)
+        return self._pages[page][offset]
+
+    def __setitem__(self, index, status):
+        page, offset = self._locate(index)
+        self._writable(page)[offset] = status
+
+    def __delitem__(self, index):
+        page, offset = self._locate(index)
+        del self._writable(page)[offset]
+        self._page_sizes().add(page, -1)
+        self._len -= 1
+
+    def __iter__(self):
+        for page in self._pages:
+            yield from page
+
+    def count(self, status):
+        return sum(page.count(status) for page in self._pages)
+
+    def delete_many(self, indices):
+        """
+        Удаляет несколько элементов: все индексы переводятся в (страница, смещение)
+        до первого удаления, затем каждая затронутая страница уплотняется один раз.
+        :param indices: возрастающая последовательность различных индексов
+        """
+        by_page = {}
+        for index in indices:
+            page, offset = self._locate(index)
+            by_page.setdefault(page, []).append(offset)
+        for page, offsets in by_page.items():
+            data = self._writable(page)
+            for offset in reversed(offsets):
+                del data[offset]
+            self._page_sizes().add(page, -len(offsets))
+            self._len -= len(offsets)
+
+    def tobytes(self):
+        return b"".join(self._pages)
+
+    def snapshot(self):
+        """
+        Замороженная копия за O(1): страницы и таблица страниц становятся общими,
+        запись в копию запрещена.
+        :return: объект того же класса только для чтения
+        """
+        view = copy.copy(self)
+        view._owned = None
+        view._shared_table = True
+        view.frozen = True
+        view._views = weakref.WeakSet()
+        self._shared_table = True
+        self._views.add(view)
+        return view
+
+    def _locate(self, index):
+        """
+        Переводит индекс в номер страницы и смещение в ней.
+        :raises IndexError: если индекс вне диапазона
+        """
+        if index < 0 or index >= self._len:
+            raise IndexError("storage index out of range")
+        if self._sizes is None:
+            return divmod(index, self.page_size)
+        page = self._sizes.find(index)
+        return page, index - self._sizes.prefix(page)
+
+    def _page_sizes(self):
+        """
+        Индекс размеров страниц; до первого удаления все страницы, кроме последней, полные.
+        """
+        if self._sizes is None:
+            pages = len(self._pages)
+            self._sizes = RankIndex(pages, weight=self.page_size)
+            if pages:
+                self._sizes.add(pages - 1, self._len - pages * self.page_size)
+        return self._sizes
+
+    def _writable(self, page):
+        """
+        Страница, принадлежащая только этому хранилищу (копируется при первой записи).
+        """
+        if not self._shared_table and self._owned[page]:
+            return self._pages[page]
+        if self.frozen:
+            raise TypeError("Ошибка. Снимок базы доступен только для чтения")
+        # Копирование - редкий путь; блокировка нужна писателям из разных потоков
+        with self._cow_lock:
+            if not self._views:
+                # Все снимки уже удалены - заполненные страницы снова принадлежат только нам
+                self._owned = [data is not None for data in self._pages]
+                self._shared_table = False
+            elif self._shared_table:
+                # Снимок держит прежние таблицу страниц и индекс размеров
+                self._pages = list(self._pages)
+                if self._sizes is not None:
+                    self._sizes = self._sizes.copy()
+                self._owned = [False] * len(self._pages)
+                self._shared_table = False
+            if not self._owned[page]:
+                self._pages[page] = self._copy_page(page)
+                self._owned[page] = True
+        return self._pages[page]
+
+    def _copy_page(self, page):
+        """
+        Собственная копия страницы для записи.
+        """
+        return bytearray(self._pages[page])
+
+
+class SparseStorage(PagedStorage):
+    """
+    Разреженное страничное хранилище: страница, в которую ещё не писали, не занимает
+    памяти (None) и целиком состоит из статуса по умолчанию. Создание - без выделения
+    страниц, подсчёт статусов просматривает только заполненные страницы.
+    Когда заполненных страниц становится больше доли densify_ratio, хранилище
+    заполняет остальные и дальше работает как обычное PagedStorage (dense = True).
+    """
+    def __init__(self, count=0, status=1, page_size=4096, densify_ratio=0.5):
+        """
+        :param count: количество пациентов
+        :param status: статус по умолчанию
+        :param page_size: размер страницы в байтах
+        :param densify_ratio: доля заполненных страниц, после которой заполняются все
+        """
+        super().__init__(0, status, page_size)
+        pages = (count + page_size - 1) // page_size
+        self._pages = [None] * pages
+        self._owned = [False] * pages
+        self._len = count
+        self.status = status
+        self.densify_ratio = densify_ratio
+        self.dense = not pages
+        # Исходная длина базы (задаёт длины незаполненных страниц) и их суммарная длина
+        self._initial = count
+        self._default_len = count
+
+    def __getitem__(self, index):
+        page, offset = self._locate(index)
+        data = self._pages[page]
+        return self.status if data is None else data[offset]
+
+    def __iter__(self):
+        for page, data in enumerate(self._pages):
+            if data is None:
+                yield from repeat(self.status, self._initial_length(page))
+            else:
+                yield from data
+
+    def count(self, status):
+        """
+        Подсчёт по заполненным страницам; незаполненные учитываются одним слагаемым.
+        """
+        total = sum(data.count(status) for data in self._pages if data is not None)
+        return total + self._default_len if status == self.status else total
+
+    def tobytes(self):
+        return b"".join(bytes([self.status]) * self._initial_length(page) if data is None else data
+                        for page, data in enumerate(self._pages))
+
+    def materialized(self):
+        """
+        :return: количество заполненных страниц
+        """
+        return len(self._pages) - self._pages.count(None)
+
+    def densify(self):
+        """
+        Заполняет все страницы (переход к плотному представлению).
+        """
+        self.dense = True
+        for page, data in enumerate(self._pages):
+            if data is None:
+                PagedStorage._writable(self, page)
+
+    def _writable(self, page):
+        data = super()._writable(page)
+        if not self.dense and self._default_len < (1 - self.densify_ratio) * self._initial:
+            self.densify()
+        return data
+
+    def _copy_page(self, page):
+        data = self._pages[page]
+        if data is not None:
+            return bytearray(data)
+        length = self._initial_length(page)
+        self._default_len -= length
+        return bytearray([self.status]) * length
+
+    def _initial_length(self, page):
+        """
+        Длина незаполненной страницы (удаление всегда сначала заполняет страницу).
+        """
+        return min(self.page_size, self._initial - page * self.page_size)
+
+
+class MmapStorage:
+    """
+    Хранилище поверх отображённого в память файла (mmap): один байт на пациента.
+    Чтение не копирует данные, выписка сдвигает байты внутри отображения (mmap.move),
+    а длина базы хранится отдельно от размера файла.
+    """
+    def __init__(self, mm, offset, count):
+        """
+        :param mm: объект mmap
+        :param offset: смещение первого статуса от начала отображения
+        :param count: количество пациентов
+        """
+        self.mm = mm
+        self._offset = offset
+        self._len = count
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        return self.mm[self._offset + self._check(index)]
+
+    def __setitem__(self, index, status):
+        self.mm[self._offset + self._check(index)] = status
+
+    def __delitem__(self, index):
+        position = self._offset + self._check(index)
+        self.mm.move(position, position + 1, self._len - index - 1)
+        self._len -= 1
+
+    def __iter__(self):
+        return iter(memoryview(self.mm)[self._offset:self._offset + self._len])
+
+    def count(self, status):
+        # По блокам: в памяти не бывает копии больше COUNT_BLOCK байт
+        view = memoryview(self.mm)
+        end = self._offset + self._len
+        total = 0
+        for start in range(self._offset, end, COUNT_BLOCK):
+            total += bytes(view[start:min(start + COUNT_BLOCK, end)]).count(status)
+        view.release()
+        return total
+
+    def delete_many(self, indices):
+        """
+        Удаляет несколько элементов, уплотняя данные на месте за один проход.
+        :param indices: возрастающая последовательность различных индексов
+        """
+        indices = list(indices)
+        target = self._offset
+        start = 0
+        for index in indices + [self._len]:
+            length = index - start
+            if length and target != self._offset + start:
+                self.mm.move(target, self._offset + start, length)
+            target += length
+            start = index + 1
+        self._len -= len(indices)
+
+    def tobytes(self):
+        return self.mm[self._offset:self._offset + self._len]
+
+    def _check(self, index):
+        """
+        Проверяет индекс: отображение длиннее базы, поэтому границы проверяются явно.
+        """
+        if index < 0 or index >= self._len:
+            raise IndexError("storage index out of range")
+        return index
+
+
+class TombstoneStorage:
+    """
+    Обёртка над хранилищем, в которой удаление не сдвигает данные:
+    слот выписанного пациента помечается кодом DISCHARGED, а соответствие
+    порядкового индекса и физического слота поддерживает RankIndex.
+    Удаление и доступ по индексу выполняются за O(log n), слоты никогда не сдвигаются.
+    Если число занятых слотов известно заранее (alive), ранговый индекс строится
+    только при первом обращении по порядковому индексу: доступ по слотам, выписка
+    и len() работают без него.
+    """
+    def __init__(self, slots, alive=None):
+        """
+        :param slots: исходное хранилище (ListStorage, ByteArrayStorage, ...)
+        :param alive: число занятых слотов, если известно (например, из заголовка снимка);
+            иначе индекс строится сразу проходом по слотам
+        """
+        self.slots = slots
+        self._alive = None
+        self._count = alive
+        if alive is None:
+            self._index()
+
+    def __len__(self):
+        return self._count if self._alive is None else self._alive.total
+
+    def __getitem__(self, index):
+        return self.slots[self.slot_of(index)]
+
+    def __setitem__(self, index, status):
+        self.slots[self.slot_of(index)] = status
+
+    def __delitem__(self, index):
+        self.discard(self.slot_of(index))
+
+    def __iter__(self):
+        return (status for status in self.slots if status != DISCHARGED)
+
+    def count(self, status):
+        return self.slots.count(status)
+
+    def delete_many(self, indices):
+        """
+        Удаляет несколько элементов: все индексы переводятся в слоты до первой пометки.
+        :param indices: возрастающая последовательность различных индексов
+        """
+        for slot in [self.slot_of(index) for index in indices]:
+            self.discard(slot)
+
+    def tobytes(self):
+        """
+        Возвращает статусы оставшихся пациентов (без выписанных слотов).
+        """
+        return self.slots.tobytes().replace(bytes([DISCHARGED]), b"")
+
+    def snapshot(self):
+        """
+        Замороженная копия: слоты - через snapshot() исходного хранилища (O(1) для
+        PagedStorage, иначе копия), ранговый индекс копируется (4 байта на слот).
+        :return: объект TombstoneStorage только для чтения
+        """
+        view = TombstoneStorage.__new__(TombstoneStorage)
+        if hasattr(self.slots, "snapshot"):
+            view.slots = self.slots.snapshot()
+        else:
+            view.slots = PagedStorage.from_bytes(self.slots.tobytes()).snapshot()
+        view._alive = None if self._alive is None else self._alive.copy()
+        view._count = self._count
+        return view
+
+    def slot_of(self, index):
+        """
+        Переводит порядковый индекс пациента в номер физического слота.
+        :param index: индекс среди оставшихся пациентов (с нуля)
+        :return: номер слота
+        :raises IndexError: если индекс вне диапазона
+        """
+        alive = self._index()
+        if index < 0 or index >= alive.total:
+            raise IndexError("storage index out of range")
+        return alive.find(index)
+
+    def index_of(self, slot):
+        """
+        Переводит номер занятого слота в порядковый индекс пациента.
+        :param slot: номер слота
+        :return: индекс среди оставшихся пациентов (с нуля)
+        """
+        return self._index().prefix(slot)
+
+    def is_alive(self, slot):
+        """
+        Проверяет, что слот существует и занят пациентом.
+        :param slot: номер слота
+        """
+        return 0 <= slot < len(self.slots) and self.slots[slot] != DISCHARGED
+
+    def discard(self, slot):
+        """
+        Помечает занятый слот как освобождённый (выписка пациента).
+        :param slot: номер слота
+        """
+        self.slots[slot] = DISCHARGED
+        if self._alive is None:
+            self._count -= 1
+        else:
+            self._alive.add(slot, -1)
+
+    def _index(self):
+        """
+        Ранговый индекс занятых слотов; при первом вызове строится проходом по слотам.
+        :return: объект RankIndex
+        """
+        if self._alive is None:
+            alive = RankIndex(len(self.slots), typecode='i')
+            # Хранилище может прийти уже с выписанными слотами (например, из снимка)
+            if self.slots.count(DISCHARGED):
+                data = self.slots.tobytes()
+                slot = data.find(DISCHARGED)
+                while slot != -1:
+                    alive.add(slot, -1)
+                    slot = data.find(DISCHARGED, slot + 1)
+            self._alive = alive
+        return self._alive
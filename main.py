@@ -1,13 +1,133 @@
 #!/usr/bin/env python3
 """
 Точка входа в приложение.
+Без аргументов запускает интерактивный консольный режим,
+с флагом --script выполняет сценарий команд в пакетном режиме,
+с флагом --serve обслуживает клиентов по сети (см. hospital.server),
+с флагом --daemon держит больницу в памяти и принимает команды через Unix-сокет,
+а с флагом --client передаёт команды такому демону и печатает ответ.
+Флаг --metrics включает сбор метрик (см. hospital.metrics) и сохраняет их в файл
+по завершении работы.
+Модули пакета hospital импортируются только в тех режимах, где они нужны,
+поэтому клиент не загружает пакет и запускается заметно быстрее холодного запуска.
 """
 
-from hospital.app import HospitalApp
+import sys
 
-def main():
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Автоматизация работы больницы")
+    parser.add_argument("--script", metavar="FILE",
+                        help="пакетный режим: выполнить команды из файла ('-' - из stdin)")
+    parser.add_argument("--serve", metavar="PORT", type=int,
+                        help="сетевой режим: принимать команды по TCP на этом порту")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="адрес для сетевого режима (по умолчанию 127.0.0.1)")
+    parser.add_argument("--daemon", metavar="SOCKET",
+                        help="режим демона: принимать команды через Unix-сокет по этому пути")
+    parser.add_argument("--client", metavar="SOCKET",
+                        help="передать команды демону через Unix-сокет и напечатать ответ")
+    parser.add_argument("commands", nargs="*",
+                        help="для --client: строки команд (без них строки читаются из stdin)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="собирать метрики и сохранить их в файл при завершении "
+                             "(*.json - JSON, иначе текстовый формат Prometheus)")
+    args = parser.parse_args(argv)
+    if args.commands and args.client is None:
+        parser.error("строки команд в аргументах принимаются только вместе с --client")
+    if args.client is not None and args.metrics:
+        parser.error("--metrics не используется вместе с --client: метрики собирает демон")
+    return args
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Клиент разбирает простую форму аргументов сам: импорт argparse занимает
+    # больше времени, чем всё остальное, что клиент делает после запуска интерпретатора
+    if len(argv) >= 2 and argv[0] == "--client" and not any(arg.startswith("-") for arg in argv[2:]):
+        return run_client(argv[1], argv[2:])
+    args = parse_args(argv)
+    if args.client is not None:
+        return run_client(args.client, args.commands)
+    metrics = None
+    if args.metrics:
+        from hospital.metrics import Metrics
+        metrics = Metrics()
+    try:
+        run(args, metrics)
+    finally:
+        if metrics is not None:
+            metrics.export(args.metrics, "json" if args.metrics.endswith(".json") else "prometheus")
+    return 0
+
+def run(args, metrics=None):
+    if args.serve is not None or args.daemon is not None:
+        from hospital.models import Hospital
+        from hospital.server import serve_forever
+        hospital = Hospital(200)
+        if metrics is not None:
+            from hospital.metrics import instrument
+            instrument(hospital, metrics)
+        if args.daemon is not None:
+            serve_forever(hospital, path=args.daemon)
+        else:
+            serve_forever(hospital, args.host, args.serve)
+        return
+    from hospital.app import HospitalApp
     app = HospitalApp()
-    app.run()
+    if metrics is not None:
+        from hospital.metrics import instrument
+        instrument(app, metrics)
+    if args.script is None:
+        app.run()
+    elif args.script == "-":
+        app.run_script(sys.stdin)
+    else:
+        with open(args.script, encoding="utf-8") as script:
+            app.run_script(script)
+
+def run_client(path, commands):
+    """
+    Клиент демона: передаёт строки команд и печатает ответ.
+    :param path: путь к Unix-сокету демона
+    :param commands: строки команд (пустой список - читать строки из stdin)
+    :return: код возврата (1, если демон недоступен)
+    """
+    lines = commands or [line.rstrip("\r\n") for line in sys.stdin]
+    try:
+        response = send_commands(path, lines)
+    except OSError as e:
+        print(f"Ошибка. Демон больницы недоступен ({path}): {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response)
+    return 0
+
+def send_commands(path, lines):
+    """
+    Отправляет строки демону и читает ответ до закрытия соединения.
+    После отправки соединение закрывается на запись, чтобы демон знал,
+    что ввод закончился, ответил на всё и закрыл соединение.
+    :param path: путь к Unix-сокету демона
+    :param lines: строки команд без символа перевода строки
+    :return: текст ответа
+    :raises OSError: если подключиться не удалось
+    """
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        sock.sendall("".join(line + "\n" for line in lines).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+    return b"".join(chunks).decode("utf-8", "replace")
 
 if __name__ == '__main__':
-    main()
+    code = main()
+    if code:
+        sys.exit(code)
@@ -8,6 +8,8 @@ import unittest
 from io import StringIO
 from unittest.mock import patch
 from hospital.app import HospitalApp
+from hospital.models import Hospital
+from hospital.output import BufferedSink
 
 class TestHospitalApp(unittest.TestCase):
     def setUp(self):
@@ -202,5 +204,140 @@ class TestHospitalApp(unittest.TestCase):
                 output = fake_out.getvalue()
                 self.assertIn("Ошибка. ID пациента должно быть числом (целым, положительным)", output)
 
+    def test_stable_ids_mode(self):
+        # В режиме стабильных ID выписанный ID недоступен, а последний ID сохраняется
+        self.app.hospital = Hospital(200, stable_ids=True)
+        inputs = [
+            "discharge", "4",
+            "get status", "4",
+            "get status", "200",
+            "рассчитать статистику",
+            "стоп"
+        ]
+        output = self.run_app_with_inputs(inputs)
+        self.assertIn("Ошибка. В больнице нет пациента с таким ID", output)
+        self.assertIn('Статус пациента: "Болен"', output)
+        self.assertIn('В больнице на данный момент находится 199 чел., из них:', output)
+
+    def test_run_script_matches_interactive(self):
+        # Пакетный режим выдаёт те же ответы, что и интерактивный
+        inputs = [
+            "узнать статус пациента", "200",
+            "status up", "2",
+            "status down", "3",
+            "discharge", "4",
+            "повысить статус пациента", "1", "повысить статус пациента", "1",
+            "повысить статус пациента", "1", "да",
+            "выписать всех пациентов",
+            "get status", "два",
+            "рассчитать статистику",
+            "стоп",
+        ]
+        expected = self.run_app_with_inputs(inputs)
+        out = StringIO()
+        HospitalApp().run_script([line + "\n" for line in inputs], out=out, flush_every=3)
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_run_script_stops_at_end_of_input(self):
+        # Сценарий без команды стоп, обрывающийся посреди команды
+        out = StringIO()
+        self.app.run_script(["status up\n", "2\n", "status up\n"], out=out)
+        self.assertEqual(out.getvalue(), 'Новый статус пациента: "Слегка болен"\n')
+        self.assertEqual(self.app.hospital.get_patient_status(2), 2)
+
+    def test_one_line_commands(self):
+        # Команда и ID в одной строке дают те же ответы, что и ввод в две строки
+        inputs = [
+            "status up 2",
+            "понизить статус пациента 3",
+            "get status 2",
+            "повысить статус пациента 1", "повысить статус пациента 1",
+            "повысить статус пациента 1 да",
+            "status up 1",  # бывший пациент 2: "Слегка болен" -> "Готов к выписке"
+            "status up 1",
+            "нет",
+            "стоп",
+        ]
+        output = self.run_app_with_inputs(inputs)
+        self.assertIn('Новый статус пациента: "Слегка болен"', output)
+        self.assertIn('Новый статус пациента: "Тяжело болен"', output)
+        self.assertIn("Пациент выписан из больницы", output)
+        self.assertIn('Пациент остался в статусе "Готов к выписке"', output)
+        self.assertEqual(len(self.app.hospital), 199)
+
+    def test_one_line_batches(self):
+        # Несколько ID: статусы и выписка - одной пакетной операцией
+        inputs = [
+            "status down 1-3",
+            "get status 2,3 4",
+            "выписать пациента 1, 3, 5-6",
+            "get status 1 2",
+            "discharge 1 500",
+            "get status abc",
+            "discharge 9-3",
+            "стоп",
+        ]
+        output = self.run_app_with_inputs(inputs)
+        self.assertIn('Статус пациента 2: "Тяжело болен"\n'
+                      'Статус пациента 3: "Тяжело болен"\n'
+                      'Статус пациента 4: "Болен"\n', output)
+        self.assertIn("Пациенты выписаны из больницы: 4 чел.", output)
+        # После выписки 1, 3, 5, 6 бывшие пациенты 2 и 4 получили ID 1 и 2
+        self.assertIn('Статус пациента 1: "Тяжело болен"\nСтатус пациента 2: "Болен"', output)
+        self.assertIn("Ошибка. В больнице нет пациента с таким ID", output)
+        self.assertIn("Ошибка. ID пациента должно быть числом (целым, положительным)", output)
+        self.assertIn("Ошибка. Некорректный диапазон ID: 9-3", output)
+        self.assertEqual(len(self.app.hospital), 196)
+
+    def test_one_line_status_up_many_defaults_to_no(self):
+        # При нескольких ID подтверждение выписки без ответа в строке - «нет»
+        self.app.hospital.set_statuses([1, 2], 3)
+        output = self.run_app_with_inputs(["status up 1,2", "стоп"])
+        self.assertEqual(output.count('Пациент остался в статусе "Готов к выписке"'), 2)
+        self.assertEqual(len(self.app.hospital), 200)
+
+    def test_one_line_huge_range(self):
+        # Огромный диапазон - сообщение об ошибке, база не меняется
+        output = self.run_app_with_inputs(["get status 1-99999999999", "status up 1-3000000", "стоп"])
+        self.assertEqual(output.count("Ошибка. Слишком много ID в одной команде"), 2)
+        self.assertEqual(self.app.hospital.calculate_statistics(), {1: 200})
+
+    def test_statistics_report_cached(self):
+        # Отчёт строится заново только после изменения гистограммы
+        self.app.hospital = Hospital(5)
+        with patch.object(self.app.hospital, 'calculate_statistics',
+                          wraps=self.app.hospital.calculate_statistics) as calculate:
+            output = self.run_app_with_inputs([
+                "рассчитать статистику", "рассчитать статистику",
+                "get status 1", "status up 1", "рассчитать статистику",
+                "discharge 2", "рассчитать статистику", "стоп"])
+        self.assertEqual(calculate.call_count, 3)
+        self.assertEqual(output.count('\t- в статусе "Болен": 5 чел.'), 2)
+        self.assertIn('\t- в статусе "Болен": 4 чел.', output)
+        self.assertIn('\t- в статусе "Слегка болен": 1 чел.', output)
+        self.assertIn('В больнице на данный момент находится 4 чел., из них:', output)
+        self.assertIn('\t- в статусе "Болен": 3 чел.', output)
+
+    def test_statistics_report_follows_hospital(self):
+        # Замена больницы или таблицы статусов сбрасывает кэш отчёта
+        self.app.hospital = Hospital(2)
+        self.assertIn("находится 2 чел.", self.run_app_with_inputs(["calculate statistics", "stop"]))
+        self.app.running = True
+        self.app.hospital = Hospital(3)
+        self.app.status_text = {**self.app.status_text, 1: "Болеет"}
+        output = self.run_app_with_inputs(["calculate statistics", "get status 1", "stop"])
+        self.assertIn('\t- в статусе "Болеет": 3 чел.', output)
+        self.assertIn('Статус пациента: "Болеет"', output)
+
+    def test_custom_output_sink(self):
+        # Ответы идут в переданный приёмник, а не на консоль
+        sink = BufferedSink(flush_every=None)
+        app = HospitalApp(Hospital(3), output=sink)
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            app.execute("get status 1")
+            app.execute("status down 2")
+        self.assertEqual(fake_out.getvalue(), "")
+        self.assertEqual(sink.take(), ['Статус пациента: "Болен"', 'Новый статус пациента: "Тяжело болен"'])
+
 if __name__ == '__main__':
     unittest.main()  # pragma: no cover
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для бенчмарка горячих путей (модуль benchmarks.bench_hospital).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from io import StringIO
+from benchmarks import bench_hospital, bench_parser, bench_startup, loadgen
+from hospital.models import Hospital
+
+
+class TestBenchHospital(unittest.TestCase):
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(bench_hospital.percentile(samples, 0.5), 50)
+        self.assertEqual(bench_hospital.percentile(samples, 0.99), 99)
+        self.assertEqual(bench_hospital.percentile([7], 0.99), 7)
+
+    def test_run_covers_all_operations(self):
+        report = bench_hospital.run([100], ops=20, repeat=1)
+        names = {item["name"] for item in report["results"]}
+        self.assertEqual(names, {
+            "get_patient_status", "set_patient_status", "calculate_statistics",
+            "discharge_head", "discharge_middle", "discharge_tail", "app_replay",
+        })
+        for item in report["results"]:
+            self.assertGreater(item["ops"], 0)
+            self.assertLessEqual(item["p50_ns"], item["p99_ns"])
+            self.assertLessEqual(item["p99_ns"], item["max_ns"])
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [
+            {"name": "get_patient_status", "size": 10, "ops_per_sec": 1000, "p99_ns": 100},
+            {"name": "discharge_head", "size": 10, "ops_per_sec": 1000, "p99_ns": 100},
+        ]}
+        current = {"results": [
+            {"name": "get_patient_status", "size": 10, "ops_per_sec": 950, "p99_ns": 110},
+            {"name": "discharge_head", "size": 10, "ops_per_sec": 500, "p99_ns": 300},
+            {"name": "app_replay", "size": 10, "ops_per_sec": 1, "p99_ns": 1},
+        ]}
+        regressions = bench_hospital.compare(current, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(item.startswith("discharge_head[10]") for item in regressions))
+
+    def test_main_writes_json_and_compares(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            args = ["--sizes", "50", "--ops", "10", "--repeat", "1"]
+            self.assertEqual(bench_hospital.main(args + ["--output", path]), 0)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(json.load(file)["meta"]["seed"], 0)
+            with patch('benchmarks.bench_hospital.compare', return_value=["x"]), \
+                 patch('sys.stderr', new=StringIO()) as fake_err:
+                code = bench_hospital.main(args + ["--output", path, "--compare", path])
+            self.assertEqual(code, 1)
+            self.assertIn("РЕГРЕССИЯ: x", fake_err.getvalue())
+
+
+class TestBenchParser(unittest.TestCase):
+    def test_run_reports_overhead(self):
+        report = bench_parser.run(size=100, ops=20, batch=5)
+        items = {item["name"]: item for item in report["results"]}
+        self.assertEqual(set(items), {
+            "parse_command", "two_line_command", "one_line_command",
+            "one_line_batch", "one_line_batch_discharge",
+        })
+        # Обе формы выполняют одни и те же команды
+        self.assertEqual(items["two_line_command"]["ops"], items["one_line_command"]["ops"])
+        self.assertIsInstance(report["overhead_ns"], float)
+
+    def test_main_prints_json(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            code = bench_parser.main(["--size", "50", "--ops", "10"])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(fake_out.getvalue())["meta"]["ops"], 10)
+
+
+class TestLoadgen(unittest.TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(loadgen.parse_mix("get=3, stats=1.5"), {"get": 3.0, "stats": 1.5})
+        for text in ("fly=1", "get=x", "get=-1", "get=0,stats=0"):
+            with self.assertRaises(ValueError):
+                loadgen.parse_mix(text)
+
+    def test_run_reports_and_keeps_invariants(self):
+        reports = []
+        report = loadgen.run(size=200, duration=None, ops=2000, check_every=100,
+                             report_every=0, on_report=reports.append)
+        self.assertEqual(report["ops"], 2000)
+        self.assertEqual(sum(report["commands"].values()), 2000)
+        self.assertEqual(set(report["commands"]), set(loadgen.DEFAULT_MIX))
+        self.assertEqual(report["violations"], 0)
+        # Выписки прекращаются на min_size (по умолчанию половина больницы)
+        self.assertGreaterEqual(report["ward_size"], 100)
+        self.assertGreater(report["output_chars"], 0)
+        self.assertIsNotNone(report["memory"]["growth_bytes"])
+        self.assertGreater(report["latency"]["max_ns"], 0)
+        self.assertEqual(reports, report["intervals"])
+        self.assertEqual(reports[-1]["ops"], 2000)
+
+    def test_rate_limits_throughput(self):
+        # При заданной частоте генератор ждёт запланированного момента каждой команды
+        now = [0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += int(seconds * 1e9)
+
+        report = loadgen.run(size=50, duration=None, ops=100, rate=1000, trace_memory=False,
+                             clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(len(slept), 100)
+        self.assertAlmostEqual(report["elapsed_s"], 0.1, places=3)
+        self.assertEqual(report["memory"]["growth_bytes"], None)
+
+    def test_check_invariants(self):
+        hospital = Hospital(5)
+        self.assertEqual(loadgen.check_invariants(hospital, full=True), [])
+        hospital._stats[1] = 4  # рассогласование в обход Hospital
+        self.assertEqual(len(loadgen.check_invariants(hospital)), 1)
+        self.assertEqual(len(loadgen.check_invariants(hospital, full=True)), 2)
+
+    def test_exceptions_are_violations(self):
+        with patch.object(Hospital, 'get_patient_status', side_effect=RuntimeError("сбой")):
+            report = loadgen.run(size=20, duration=None, ops=50, mix={"get": 1},
+                                 trace_memory=False)
+        self.assertEqual(report["violations"], 50)
+        self.assertEqual(len(report["violation_samples"]), loadgen.MAX_VIOLATION_SAMPLES)
+
+    def test_main_exit_code(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out, patch('sys.stderr', new=StringIO()):
+            code = loadgen.main(["--size", "50", "--duration", "0", "--ops", "200",
+                                 "--no-trace-memory"])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(fake_out.getvalue())["ops"], 200)
+
+
+class TestBenchStartup(unittest.TestCase):
+    def test_run_compares_cold_and_warm(self):
+        report = bench_startup.run(runs=2)
+        self.assertEqual([item["name"] for item in report["results"]],
+                         ["interpreter", "cold", "warm_client", "send_commands"])
+        # Клиент демона отвечает так же, как холодный запуск
+        self.assertTrue(report["same_output"])
+        self.assertGreater(report["speedup"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
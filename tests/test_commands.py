@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для однострочных команд (модуль commands).
+"""
+
+import time
+import unittest
+from hospital.commands import MAX_IDS, Command, parse_command
+
+
+class TestParseCommand(unittest.TestCase):
+    def test_single_id(self):
+        self.assertEqual(parse_command("status up 42"), Command("status up", "up", [42]))
+        self.assertEqual(parse_command("узнать статус пациента 7"),
+                         Command("узнать статус пациента", "get", [7]))
+
+    def test_id_lists_and_ranges(self):
+        # ID через запятую или пробел, диапазоны раскрываются по порядку
+        self.assertEqual(parse_command("выписать пациента 7,8,9").ids, [7, 8, 9])
+        self.assertEqual(parse_command("get status 3, 10-12 1").ids, [3, 10, 11, 12, 1])
+        self.assertEqual(parse_command("discharge 5 - 6").ids, [5, 6])
+
+    def test_answer(self):
+        command = parse_command("повысить статус пациента 1 да")
+        self.assertEqual((command.ids, command.answer), ([1], "да"))
+        self.assertEqual(parse_command("status up 1,2 нет").answer, "нет")
+
+    def test_not_a_patient_command(self):
+        # Строки без ID и прочие команды не разбираются
+        for line in ("get status", "стоп", "рассчитать статистику 5", "get statuses 5", ""):
+            self.assertIsNone(parse_command(line))
+
+    def test_invalid_ids(self):
+        for line in ("get status abc", "status down 1,", "discharge 4-", "status up -2"):
+            with self.assertRaises(ValueError):
+                parse_command(line)
+        with self.assertRaisesRegex(ValueError, "диапазон"):
+            parse_command("discharge 9-3")
+
+    def test_huge_range_rejected(self):
+        # Огромный диапазон отклоняется до раскрытия - без MemoryError и долгого цикла
+        for line in ("get status 1-99999999999", "status up 1-3000000",
+                     f"discharge 1-{MAX_IDS},{MAX_IDS + 1}",
+                     ",".join([f"get status 1-{MAX_IDS // 2}"] + [f"1-{MAX_IDS // 2}"] * 100)):
+            with self.assertRaisesRegex(ValueError, "Слишком много ID"):
+                parse_command(line)
+        self.assertEqual(len(parse_command(f"get status 1-{MAX_IDS}").ids), MAX_IDS)
+
+    def test_junk_after_many_ids_fails_fast(self):
+        # Разделители однозначны: неподходящая строка не разбирается перебором вариантов
+        # (раньше каждые лишние «1   » утраивали время, 16 групп - около 15 с)
+        for line in ("get status " + "1   " * 40 + "x", "status up " + "1 , " * 2000 + "x",
+                     "discharge " + "2-3  " * 2000 + "-"):
+            started = time.perf_counter()
+            with self.assertRaisesRegex(ValueError, "ID пациента должно быть числом"):
+                parse_command(line)
+            self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(parse_command("get status 1 , 2\t3-5 , 7 - 8 да"),
+                         Command("get status", "get", [1, 2, 3, 4, 5, 7, 8], "да"))
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
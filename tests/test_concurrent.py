@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для потокобезопасной больницы (модуль concurrent).
+"""
+
+import threading
+import unittest
+from hospital.concurrent import ConcurrentHospital, ReadWriteLock
+from hospital.storage import PagedStorage
+from tests import test_models
+from benchmarks.stress_concurrent import stress
+
+
+class TestReadWriteLock(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def test_readers_share(self):
+        # Второй читатель входит, пока первый держит блокировку
+        entered = threading.Event()
+
+        def reader():
+            with self.lock.reading():
+                entered.set()
+
+        with self.lock.reading():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertTrue(entered.wait(1))
+        thread.join()
+
+    def test_writer_excludes_readers(self):
+        entered = threading.Event()
+
+        def reader():
+            with self.lock.reading():
+                entered.set()
+
+        with self.lock.writing():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertFalse(entered.wait(0.05))
+        thread.join()
+        self.assertTrue(entered.is_set())
+
+
+class TestConcurrentHospitalContract(test_models.TestHospital):
+    # Тот же контракт Hospital для потокобезопасной версии
+    def setUp(self):
+        self.hospital = ConcurrentHospital(5)
+
+
+class TestConcurrentHospital(unittest.TestCase):
+    def test_parallel_status_changes(self):
+        # Параллельные смены статуса разных пациентов не теряют обновлений гистограммы
+        hospital = ConcurrentHospital(4000, stripes=4)
+
+        def desk(first):
+            for patient_id in range(first, 4001, 4):
+                hospital.set_patient_status(patient_id, 3)
+                hospital.set_patient_status(patient_id, first % 4)
+
+        threads = [threading.Thread(target=desk, args=(first,)) for first in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(hospital.calculate_statistics(), {0: 1000, 1: 1000, 2: 1000, 3: 1000})
+        self.assertEqual(hospital.recalculate_statistics(), hospital.calculate_statistics())
+
+    def test_snapshots_during_writes(self):
+        # Снимки, снятые во время работы писателей, всегда согласованы
+        hospital = ConcurrentHospital(4000, stripes=4, storage=PagedStorage, stable_ids=True)
+        finished = []
+
+        def desk(first):
+            # Каждая стойка работает со своими ID, стабильные ID не сдвигаются
+            for patient_id in range(first, 4001, 4):
+                hospital.set_patient_status(patient_id, 3)
+            hospital.discharge_many(range(first, 400, 4))
+            finished.append(first)
+
+        threads = [threading.Thread(target=desk, args=(first,)) for first in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        views = []
+        while any(thread.is_alive() for thread in threads):
+            views.append(hospital.snapshot())
+        for thread in threads:
+            thread.join()
+        views.append(hospital.snapshot())
+        self.assertEqual(sorted(finished), [1, 2, 3, 4])
+        self.assertEqual(len(views[-1]), 4000 - 399)
+        for view in views:
+            self.assertEqual(view.recalculate_statistics(), view.calculate_statistics())
+            self.assertEqual(sum(view.calculate_statistics().values()), len(view))
+
+    def test_statistics_without_stats_lock(self):
+        # Читатель получает опубликованную копию, пока писатель держит блокировку гистограммы
+        hospital = ConcurrentHospital(4)
+        hospital.set_patient_status(1, 2)
+        hospital.discharge(4)
+        hospital.set_statuses([2, 3], 3)
+        result = []
+        with hospital._stats_lock:
+            thread = threading.Thread(target=lambda: result.append(hospital.calculate_statistics()))
+            thread.start()
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [{2: 1, 3: 2}])
+        # Копия у вызывающего своя: её изменение не портит гистограмму
+        result[0][2] = 100
+        self.assertEqual(hospital.calculate_statistics(), {2: 1, 3: 2})
+
+    def test_stress_without_violations(self):
+        _, errors = stress(patients=2000, ops=500, threads=4)
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для истории переходов (модуль history).
+"""
+
+import os
+import tempfile
+import unittest
+from hospital.history import TransitionHistory
+from hospital.models import Hospital
+from tests import test_models
+
+
+class FakeClock:
+    # Время в секундах, которое тест двигает вручную
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestTransitionHistory(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = TransitionHistory(self.tmp.name, chunk_size=2, max_chunks=1,
+                                         clock=self.clock)
+        self.hospital = Hospital(3, history=self.history)
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def test_records_transitions(self):
+        self.clock.now = 1010.0
+        self.hospital.set_patient_status(1, 0)
+        self.hospital.set_patient_status(1, 0)  # без изменения - не записывается
+        self.clock.now = 1020.5
+        self.hospital.change_statuses([2, 3], 1)
+        self.clock.now = 1030.0
+        self.hospital.discharge(1)
+        self.assertEqual(len(self.history), 4)
+        self.assertEqual(list(self.history.transitions()), [
+            (1010.0, 0, 1, 0),
+            (1020.5, 1, 1, 2),
+            (1020.5, 2, 1, 2),
+            (1030.0, 0, 0, None),
+        ])
+        # Заполненные блоки выгружены на диск, в памяти - не больше max_chunks
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+    def test_time_range(self):
+        for moment, patient_id in ((1010.0, 1), (1020.0, 2), (1030.0, 3)):
+            self.clock.now = moment
+            self.hospital.set_patient_status(patient_id, 3)
+        self.assertEqual([event[0] for event in self.history.transitions(1015, 1030)], [1020.0])
+        self.assertEqual([event[1] for event in self.history.transitions(start=1020)], [1, 2])
+        self.assertEqual(list(self.history.transitions(stop=1000)), [])
+
+    def test_dwell_times(self):
+        # Пациент 1: "Болен" 10 c, "Тяжело болен" 20 c, затем выписан
+        self.clock.now = 1010.0
+        self.hospital.set_patient_status(1, 0)
+        self.clock.now = 1030.0
+        self.hospital.discharge_many([1])
+        self.clock.now = 1040.0
+        self.hospital.set_statuses([1, 2], 3)  # бывшие пациенты 2 и 3
+        self.clock.now = 1050.0
+        self.assertEqual(self.history.dwell_times(), {0: 20.0, 1: 90.0, 3: 20.0})
+        # Только интервал [1020, 1045)
+        self.assertEqual(self.history.dwell_times(1020, 1045), {0: 10.0, 1: 40.0, 3: 10.0})
+        self.assertEqual(self.history.dwell_times(1045, 1045), {})
+
+    def test_clock_going_back(self):
+        self.clock.now = 1010.0
+        self.hospital.set_patient_status(1, 2)
+        self.clock.now = 1005.0
+        self.hospital.set_patient_status(2, 2)
+        self.assertEqual([event[0] for event in self.history.transitions()], [1010.0, 1010.0])
+
+    def test_temporary_directory(self):
+        history = TransitionHistory(chunk_size=1)
+        Hospital(2, history=history).discharge(1)
+        directory = history.directory
+        self.assertTrue(os.path.isdir(directory))
+        history.close()
+        self.assertFalse(os.path.exists(directory))
+
+
+class TestHospitalWithHistory(test_models.TestHospital):
+    # Тот же контракт Hospital с записью истории переходов
+    def setUp(self):
+        history = TransitionHistory(chunk_size=2)
+        self.addCleanup(history.close)
+        self.hospital = Hospital(5, history=history)
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для журнала операций (модуль journal).
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from hospital.journal import HEADER, Journal, recover
+from hospital.models import Hospital
+from hospital.snapshot import save_snapshot
+
+
+class FakeClock:
+    # Управляемые часы для проверки фиксации по времени
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.journal_path = os.path.join(tmp.name, "ward.wal")
+        self.snapshot_path = os.path.join(tmp.name, "ward.snap")
+
+    def make_changes(self, hospital):
+        hospital.set_patient_status(1, 0)
+        hospital.discharge(2)
+        hospital.set_statuses([2, 3], 3)
+        hospital.change_statuses([3, 4], -1)
+        hospital.discharge_many([1, 5])
+
+    def test_replay_after_restart(self):
+        # После «сбоя» состояние восстанавливается из журнала
+        hospital = recover(self.snapshot_path, self.journal_path, count=6)
+        self.make_changes(hospital)
+        hospital.journal.close()
+        restored = recover(self.snapshot_path, self.journal_path, count=6)
+        self.assertEqual(list(restored.patients), list(hospital.patients))
+        self.assertEqual(restored.calculate_statistics(), hospital.calculate_statistics())
+        restored.journal.close()
+
+    def test_invalid_operations_not_logged(self):
+        hospital = recover(self.snapshot_path, self.journal_path, count=3)
+        with self.assertRaises(ValueError):
+            hospital.discharge(4)
+        with self.assertRaises(ValueError):
+            hospital.set_patient_status(1, 9)
+        hospital.journal.close()
+        journal = Journal(self.journal_path)
+        self.assertEqual(journal.replay(Hospital(3)), 0)
+        journal.close()
+
+    def test_group_commit_by_count_and_time(self):
+        clock = FakeClock()
+        journal = Journal(self.journal_path, group_size=3, group_interval=10, clock=clock)
+        with patch('os.fsync') as fsync:
+            journal.log_set([1], 2)
+            journal.log_set([2], 2)
+            self.assertEqual(fsync.call_count, 0)
+            journal.log_discharge([1])
+            self.assertEqual(fsync.call_count, 1)
+            journal.log_set([1], 0)
+            clock.now = 11
+            journal.log_set([1], 1)
+            self.assertEqual(fsync.call_count, 2)
+        journal.close()
+
+    def test_records_reach_disk_while_idle(self):
+        # Записи видны в файле сразу, а fsync выполняется таймером без новых операций
+        journal = Journal(self.journal_path, group_size=100, group_interval=0.05)
+        with patch('os.fsync', wraps=os.fsync) as fsync:
+            journal.log_set([1], 2)
+            journal.log_set([2], 3)
+            journal.log_discharge([1])
+            self.assertGreater(os.path.getsize(self.journal_path), 12)
+            for _ in range(200):
+                if fsync.call_count:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(fsync.call_count, 1)
+        hospital = Hospital(3)
+        reader = Journal(self.journal_path)
+        self.assertEqual(reader.replay(hospital), 3)
+        self.assertEqual(list(hospital.patients), [3, 1])
+        reader.close()
+        journal.close()
+
+    def test_close_stops_timer(self):
+        journal = Journal(self.journal_path, group_size=100, group_interval=60)
+        journal.log_set([1], 2)
+        timer = journal._timer
+        journal.close()
+        self.assertTrue(timer.finished.is_set())
+        self.assertIsNone(journal._timer)
+
+    def test_torn_tail_is_dropped(self):
+        # Недописанная при сбое запись отбрасывается, последующие пишутся корректно
+        hospital = recover(self.snapshot_path, self.journal_path, count=3)
+        hospital.set_patient_status(1, 3)
+        hospital.journal.close()
+        with open(self.journal_path, "ab") as file:
+            file.write(b"\x01\x02")
+        hospital = recover(self.snapshot_path, self.journal_path, count=3)
+        self.assertEqual(hospital.get_patient_status(1), 3)
+        hospital.set_patient_status(2, 0)
+        hospital.journal.close()
+        restored = recover(self.snapshot_path, self.journal_path, count=3)
+        self.assertEqual(list(restored.patients), [3, 0, 1])
+        restored.journal.close()
+
+    def test_checkpoint_compacts_journal(self):
+        hospital = recover(self.snapshot_path, self.journal_path, count=6)
+        self.make_changes(hospital)
+        hospital.journal.checkpoint(hospital, self.snapshot_path)
+        self.assertEqual(hospital.journal.generation, 1)
+        self.assertEqual(os.path.getsize(self.journal_path), HEADER.size)
+        hospital.set_patient_status(1, 2)
+        hospital.journal.close()
+        restored = recover(self.snapshot_path, self.journal_path, count=6)
+        self.assertEqual(list(restored.patients), list(hospital.patients))
+        self.assertEqual(restored.calculate_statistics(), hospital.calculate_statistics())
+        restored.journal.close()
+
+    def test_stale_journal_after_checkpoint_crash(self):
+        # Сбой между записью снимка и очисткой журнала: журнал не применяется повторно
+        hospital = recover(self.snapshot_path, self.journal_path, count=4)
+        hospital.discharge(1)
+        hospital.journal.commit()
+        save_snapshot(hospital, self.snapshot_path, generation=1)
+        hospital.journal.close()
+        restored = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(len(restored.patients), 3)
+        self.assertEqual(restored.journal.generation, 1)
+        restored.journal.close()
+
+    def test_journal_newer_than_snapshot(self):
+        journal = Journal(self.journal_path)
+        journal.reset(2)
+        journal.close()
+        with self.assertRaises(ValueError):
+            recover(self.snapshot_path, self.journal_path)
+
+    def test_stable_ids_recovery(self):
+        # ID стабильного режима не сдвигаются и при восстановлении из журнала
+        hospital = recover(self.snapshot_path, self.journal_path, count=10, stable_ids=True)
+        hospital.discharge(5)
+        hospital.discharge(6)
+        hospital.set_patient_status(7, 3)
+        hospital.journal.close()
+        restored = recover(self.snapshot_path, self.journal_path, count=10, stable_ids=True)
+        self.assertTrue(restored.stable_ids)
+        self.assertFalse(restored.has_patient(5) or restored.has_patient(6))
+        self.assertTrue(restored.has_patient(10))
+        self.assertEqual(restored.get_patient_status(7), 3)
+        self.assertEqual(restored.calculate_statistics(), {1: 7, 3: 1})
+        # После контрольной точки режим берётся из снимка и тоже сверяется
+        restored.journal.checkpoint(restored, self.snapshot_path)
+        restored.journal.close()
+        with self.assertRaisesRegex(ValueError, "Снимок записан в другом режиме"):
+            recover(self.snapshot_path, self.journal_path)
+        restored = recover(self.snapshot_path, self.journal_path, stable_ids=True)
+        self.assertEqual(restored.get_patient_status(7), 3)
+        restored.journal.close()
+
+    def test_id_mode_mismatch(self):
+        # Журнал сдвигаемых ID нельзя применить к больнице со стабильными ID и наоборот
+        recover(self.snapshot_path, self.journal_path, count=4).journal.close()
+        with self.assertRaisesRegex(ValueError, "другом режиме ID"):
+            recover(self.snapshot_path, self.journal_path, count=4, stable_ids=True)
+        journal = Journal(self.journal_path)
+        self.assertFalse(journal.stable_ids)
+        with self.assertRaisesRegex(ValueError, "другом режиме ID"):
+            journal.replay(Hospital(4, stable_ids=True))
+        journal.close()
+
+    def test_not_a_journal(self):
+        with open(self.journal_path, "wb") as file:
+            file.write(b"something else entirely")
+        with self.assertRaises(ValueError):
+            Journal(self.journal_path)
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
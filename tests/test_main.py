@@ -3,16 +3,43 @@
 Unit‑тест для точки входа (main.py).
 """
 
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 from unittest.mock import patch
 from io import StringIO
 import runpy
 import main
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_daemon(path, timeout=10.0):
+    # Запускает демон в отдельном процессе и ждёт, пока сокет начнёт принимать подключения
+    daemon = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), "--daemon", path],
+                              cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and daemon.poll() is None:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(path)
+            return daemon
+        except OSError:
+            time.sleep(0.01)
+    daemon.kill()
+    daemon.wait()
+    raise RuntimeError(f"Демон не запустился на сокете {path}")
+
+
 class TestMain(unittest.TestCase):
     def test_main_entry_runpy(self):
         # Запускаем main.py как модуль __main__ через runpy
         with patch('builtins.input', side_effect=["стоп"]), \
+             patch('sys.argv', ["main.py"]), \
              patch('sys.stdout', new=StringIO()) as fake_out:
             runpy.run_module("main", run_name="__main__")
             output = fake_out.getvalue()
@@ -21,8 +48,95 @@ class TestMain(unittest.TestCase):
     def test_main_direct(self):
         # Вызываем main.main() напрямую и проверяем, что вызывается метод run
         with patch('hospital.app.HospitalApp.run', return_value=None) as fake_run:
-            main.main()
+            main.main([])
             fake_run.assert_called_once()
 
+    def test_main_script_file(self):
+        # Пакетный режим: команды читаются из файла без приглашений ввода
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "shift.txt")
+            with open(path, "w", encoding="utf-8") as script:
+                script.write("status up\n2\nрассчитать статистику\nстоп\n")
+            with patch('sys.stdout', new=StringIO()) as fake_out:
+                main.main(["--script", path])
+        output = fake_out.getvalue()
+        self.assertNotIn("Введите", output)
+        self.assertIn('Новый статус пациента: "Слегка болен"', output)
+        self.assertIn("Сеанс завершён.", output)
+
+    def test_main_serve(self):
+        # Сетевой режим запускает сервер с новой больницей на заданном порту
+        with patch('hospital.server.serve_forever') as fake_serve:
+            main.main(["--serve", "9000"])
+        hospital, host, port = fake_serve.call_args.args
+        self.assertEqual(len(hospital.patients), 200)
+        self.assertEqual((host, port), ("127.0.0.1", 9000))
+
+    def test_main_metrics(self):
+        # С флагом --metrics по завершении сохраняется снимок метрик
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.prom")
+            with patch('sys.stdin', new=StringIO("get status\n1\nстоп\n")), \
+                 patch('sys.stdout', new=StringIO()):
+                main.main(["--script", "-", "--metrics", path])
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+        self.assertIn('hospital_operation_seconds_count{operation="cmd_get_status"} 1', text)
+
+    def test_main_script_stdin(self):
+        with patch('sys.stdin', new=StringIO("get status\n1\n")), \
+             patch('sys.stdout', new=StringIO()) as fake_out:
+            main.main(["--script", "-"])
+        self.assertEqual(fake_out.getvalue(), 'Статус пациента: "Болен"\n')
+
+    def test_main_daemon(self):
+        # Режим демона запускает сервер на Unix-сокете с новой больницей
+        with patch('hospital.server.serve_forever') as fake_serve:
+            main.main(["--daemon", "/tmp/hospital.sock"])
+        self.assertEqual(len(fake_serve.call_args.args[0].patients), 200)
+        self.assertEqual(fake_serve.call_args.kwargs, {"path": "/tmp/hospital.sock"})
+
+    def test_main_commands_require_client(self):
+        with patch('sys.stderr', new=StringIO()), self.assertRaises(SystemExit):
+            main.main(["get status 1"])
+
+    def test_main_client_rejects_metrics(self):
+        # Метрики собирает демон; у клиента флаг --metrics - ошибка, а не молчаливый пропуск
+        with patch('sys.stderr', new=StringIO()) as fake_err, self.assertRaises(SystemExit):
+            main.main(["--client", "/tmp/hospital.sock", "--metrics", "client.prom"])
+        self.assertIn("--metrics", fake_err.getvalue())
+
+    def test_main_client_without_daemon(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch('sys.stderr', new=StringIO()) as fake_err:
+            code = main.main(["--client", os.path.join(tmp, "missing.sock"), "get status 1"])
+        self.assertEqual(code, 1)
+        self.assertIn("Ошибка. Демон больницы недоступен", fake_err.getvalue())
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "нужны Unix-сокеты")
+    def test_main_client_and_daemon(self):
+        # Демон в отдельном процессе хранит состояние между вызовами клиента
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hospital.sock")
+            daemon = start_daemon(path)
+            try:
+                with patch('sys.stdout', new=StringIO()) as fake_out:
+                    self.assertEqual(main.main(["--client", path, "status up 5"]), 0)
+                    self.assertEqual(main.main(["--client", path, "get status 5", "get status 6"]), 0)
+                with patch('sys.stdin', new=StringIO("get status\n5\n")), \
+                     patch('sys.stdout', new=StringIO()) as stdin_out:
+                    # Строки из stdin; форма --client=SOCKET разбирается через argparse
+                    self.assertEqual(main.main([f"--client={path}"]), 0)
+            finally:
+                daemon.terminate()
+                daemon.wait()
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual(fake_out.getvalue().splitlines(), [
+            'Новый статус пациента: "Слегка болен"',
+            'Статус пациента: "Слегка болен"',
+            'Статус пациента: "Болен"',
+        ])
+        self.assertEqual(stdin_out.getvalue(), 'Статус пациента: "Слегка болен"\n')
+
 if __name__ == '__main__':
     unittest.main()  # pragma: no cover
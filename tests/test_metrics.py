@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для метрик (модуль metrics).
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from io import StringIO
+
+from hospital.app import HospitalApp
+from hospital.metrics import (MAX_ERROR_KINDS, OTHER_ERROR, LatencyHistogram, Metrics,
+                              bucket_index, bucket_upper, instrument)
+from hospital.models import Hospital
+
+
+class FakeClock:
+    # Каждый вызов продвигает время на step
+    def __init__(self, step):
+        self.now = 0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_are_contiguous(self):
+        # Каждое значение попадает в корзину, верхняя граница которой не меньше значения,
+        # а погрешность не превышает 1/8
+        previous = -1
+        for value in range(5000):
+            index = bucket_index(value)
+            self.assertIn(index, (previous, previous + 1))
+            previous = index
+            self.assertGreaterEqual(bucket_upper(index), value)
+            self.assertLessEqual(bucket_upper(index) - value, value / 8)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value * 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.max, 100000)
+        self.assertAlmostEqual(histogram.percentile(0.5), 50000, delta=50000 / 8)
+        self.assertAlmostEqual(histogram.percentile(0.99), 99000, delta=99000 / 8)
+        self.assertEqual(histogram.percentile(1.0), 100000)
+        self.assertEqual(histogram.cumulative()[-1][1], 100)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0)
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(sample_interval=0, clock=FakeClock(100),
+                               wall_clock=FakeClock(1))
+
+    def test_hospital_operations(self):
+        hospital = instrument(Hospital(5), self.metrics)
+        hospital.get_patient_status(1)
+        hospital.set_patient_status(2, 3)
+        hospital.discharge(2)
+        with self.assertRaises(ValueError):
+            hospital.get_patient_status(10)
+        report = self.metrics.to_dict()
+        self.assertEqual(report["operations"]["get_patient_status"]["count"], 2)
+        self.assertEqual(report["operations"]["discharge"]["sum_ns"], 100)
+        self.assertEqual(report["errors"], [{
+            "operation": "get_patient_status",
+            "message": "Ошибка. В больнице нет пациента с таким ID",
+            "count": 1,
+        }])
+        # Размер снят при подключении и после выписки
+        self.assertEqual([size for _, size in report["ward_size"]], [5, 4])
+        # Остальные объекты Hospital не затронуты
+        self.assertNotIn("get_patient_status", vars(Hospital(5)))
+
+    def test_app_commands(self):
+        app = instrument(HospitalApp(Hospital(5)), self.metrics)
+        app.run_script(["get status", "1", "узнать статус пациента", "7", "abc", "стоп"],
+                       out=StringIO())
+        report = self.metrics.to_dict()
+        self.assertEqual(report["operations"]["cmd_get_status"]["count"], 2)
+        self.assertEqual(report["operations"]["cmd_stop"]["count"], 1)
+        self.assertIn("get_patient_status", report["operations"])
+        errors = {(e["operation"], e["message"]): e["count"] for e in report["errors"]}
+        self.assertEqual(errors, {
+            ("cmd_get_status", "Ошибка. В больнице нет пациента с таким ID"): 1,
+            ("execute", "Неизвестная команда! Попробуйте ещё раз"): 1,
+        })
+
+    def test_error_kinds_are_bounded(self):
+        # Числа из ввода не порождают новых видов ошибок, а число видов ограничено
+        app = instrument(HospitalApp(Hospital(5)), self.metrics)
+        app.run_script([f"discharge {n}-3" for n in range(4, 1004)], out=StringIO())
+        self.assertEqual(self.metrics.errors, {
+            ("execute", "Ошибка. Некорректный диапазон ID: N-N"): 1000,
+        })
+        for index in range(MAX_ERROR_KINDS + 50):
+            self.metrics.error("execute", f"Ошибка {'x' * index}")
+        # MAX_ERROR_KINDS видов плюс общий вид для остальных
+        self.assertEqual(len(self.metrics.errors), MAX_ERROR_KINDS + 1)
+        self.assertEqual(self.metrics.errors[("execute", OTHER_ERROR)], 51)
+
+    def test_sample_interval(self):
+        metrics = Metrics(sample_interval=10, wall_clock=FakeClock(1))
+        for size in range(5):
+            metrics.sample_ward(size)
+        self.assertEqual(list(metrics.ward_size), [(1, 0)])
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(clock=FakeClock(1500), wall_clock=FakeClock(1))
+        hospital = instrument(Hospital(3), self.metrics)
+        hospital.calculate_statistics()
+        with self.assertRaises(ValueError):
+            hospital.discharge(9)
+
+    def test_prometheus(self):
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE hospital_operation_seconds histogram", text)
+        self.assertIn('hospital_operation_seconds_count{operation="calculate_statistics"} 1', text)
+        self.assertIn('hospital_operation_seconds_bucket{operation="discharge",le="+Inf"} 1', text)
+        self.assertIn('hospital_errors_total{operation="discharge",'
+                      'message="Ошибка. В больнице нет пациента с таким ID"} 1', text)
+        self.assertIn("hospital_ward_size 3", text)
+
+    def test_export_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            self.metrics.export(path, "json")
+            with open(path, encoding="utf-8") as file:
+                report = json.load(file)
+            self.assertEqual(os.listdir(tmp), ["metrics.json"])
+        self.assertEqual(report["operations"]["calculate_statistics"]["count"], 1)
+
+    def test_export_socket(self):
+        received = []
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            def accept():
+                connection, _ = server.accept()
+                with connection:
+                    received.append(connection.makefile("rb").read())
+            thread = threading.Thread(target=accept)
+            thread.start()
+            self.metrics.export(server.getsockname())
+            thread.join(5)
+        self.assertEqual(received[0].decode("utf-8"), self.metrics.to_prometheus())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.metrics.export("metrics.txt", "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -3,8 +3,10 @@
 Unit‑тесты для бизнес‑логики (модуль Hospital).
 """
 
+import random
 import unittest
-from hospital.models import Hospital
+from hospital.models import Hospital, HospitalSnapshot, STATUS_TEXT
+from hospital.storage import ByteArrayStorage, PagedStorage, SparseStorage
 
 class TestHospital(unittest.TestCase):
     def setUp(self):
@@ -26,6 +28,12 @@ class TestHospital(unittest.TestCase):
         self.hospital.set_patient_status(2, 2)
         self.assertEqual(self.hospital.get_patient_status(2), 2)
 
+    def test_set_patient_status_invalid_status(self):
+        # Попытка установить несуществующий код статуса
+        with self.assertRaises(ValueError):
+            self.hospital.set_patient_status(1, 4)
+        self.assertEqual(self.hospital.get_patient_status(1), 1)
+
     def test_set_patient_status_invalid(self):
         # Попытка установить статус для несуществующего пациента
         with self.assertRaises(ValueError):
@@ -65,5 +73,273 @@ class TestHospital(unittest.TestCase):
         stats = empty_hospital.calculate_statistics()
         self.assertEqual(stats, {})
 
+    def test_get_statuses(self):
+        self.hospital.set_patient_status(2, 3)
+        self.assertEqual(self.hospital.get_statuses([2, 1, 2]), [3, 1, 3])
+        self.assertEqual(self.hospital.get_statuses([]), [])
+        with self.assertRaises(ValueError):
+            self.hospital.get_statuses([1, 6])
+
+    def test_set_statuses(self):
+        self.hospital.set_statuses([1, 3, 5], 0)
+        self.assertEqual(self.hospital.get_statuses([1, 2, 3, 4, 5]), [0, 1, 0, 1, 0])
+        self.assertEqual(self.hospital.calculate_statistics(), {0: 3, 1: 2})
+        self.assertEqual(self.hospital.recalculate_statistics(), {0: 3, 1: 2})
+
+    def test_set_statuses_invalid_is_atomic(self):
+        # При ошибке ни один статус не меняется
+        with self.assertRaises(ValueError):
+            self.hospital.set_statuses([1, 0], 2)
+        with self.assertRaises(ValueError):
+            self.hospital.set_statuses([1, 2], 7)
+        self.assertEqual(self.hospital.calculate_statistics(), {1: 5})
+
+    def test_change_statuses_clamps(self):
+        self.hospital.set_patient_status(1, 3)
+        self.assertEqual(self.hospital.change_statuses([1, 2, 2], 1), [3, 2, 3])
+        self.assertEqual(self.hospital.change_statuses([3, 4], -5), [0, 0])
+        self.assertEqual(self.hospital.calculate_statistics(), {0: 2, 1: 1, 3: 2})
+        self.assertEqual(self.hospital.recalculate_statistics(), {0: 2, 1: 1, 3: 2})
+
+    def test_discharge_many(self):
+        # ID относятся к базе до выписки, повторы не учитываются
+        self.hospital.set_patient_status(2, 0)
+        self.hospital.set_patient_status(4, 3)
+        self.hospital.set_patient_status(5, 2)
+        self.hospital.discharge_many([4, 1, 4, 2])
+        self.assertEqual(len(self.hospital.patients), 2)
+        self.assertEqual(self.hospital.get_statuses([1, 2]), [1, 2])
+        self.assertEqual(self.hospital.calculate_statistics(), {1: 1, 2: 1})
+        self.assertEqual(self.hospital.recalculate_statistics(), {1: 1, 2: 1})
+
+    def test_discharge_many_invalid(self):
+        with self.assertRaises(ValueError):
+            self.hospital.discharge_many([1, 6])
+        self.assertEqual(len(self.hospital.patients), 5)
+
+    def test_statistics_follow_changes(self):
+        # Счётчики обновляются при смене статуса и выписке
+        self.hospital.set_patient_status(1, 3)
+        self.hospital.set_patient_status(1, 3)
+        self.hospital.set_patient_status(2, 0)
+        self.hospital.discharge(1)
+        self.assertEqual(self.hospital.calculate_statistics(), {0: 1, 1: 3})
+        self.assertEqual(self.hospital.calculate_statistics(),
+                         self.hospital.recalculate_statistics())
+
+    def test_stats_version(self):
+        # Версия гистограммы меняется только вместе с ней
+        version = self.hospital.stats_version
+        self.hospital.get_patient_status(1)
+        self.hospital.calculate_statistics()
+        self.hospital.set_patient_status(1, 1)
+        self.assertEqual(self.hospital.stats_version, version)
+        self.hospital.set_patient_status(1, 2)
+        self.assertNotEqual(self.hospital.stats_version, version)
+        version = self.hospital.stats_version
+        self.hospital.set_statuses([2, 3], 0)
+        self.assertNotEqual(self.hospital.stats_version, version)
+        version = self.hospital.stats_version
+        self.hospital.discharge(1)
+        self.assertNotEqual(self.hospital.stats_version, version)
+
+    def test_calculate_statistics_returns_copy(self):
+        # Изменение результата не портит внутренние счётчики
+        stats = self.hospital.calculate_statistics()
+        stats[1] = 100
+        self.assertEqual(self.hospital.calculate_statistics(), {1: 5})
+
+    def test_check_statistics_mode(self):
+        # В режиме проверки рассогласование счётчиков обнаруживается
+        hospital = Hospital(3, check_statistics=True)
+        hospital.set_patient_status(1, 2)
+        self.assertEqual(hospital.calculate_statistics(), {1: 2, 2: 1})
+        hospital.patients[0] = 0  # изменение в обход Hospital
+        with self.assertRaises(RuntimeError):
+            hospital.calculate_statistics()
+
+class TestHospitalByteArrayStorage(TestHospital):
+    # Тот же контракт Hospital, но на компактном хранилище
+    def setUp(self):
+        self.hospital = Hospital(5, storage=ByteArrayStorage)
+
+    def test_uses_storage(self):
+        self.assertIsInstance(self.hospital.patients, ByteArrayStorage)
+
+
+class TestHospitalTombstones(TestHospital):
+    # Тот же контракт Hospital при выписке через пометку слотов
+    def setUp(self):
+        self.hospital = Hospital(5, tombstones=True)
+
+
+class TestHospitalPagedStorage(TestHospital):
+    # Тот же контракт Hospital со страничным хранилищем
+    def setUp(self):
+        self.hospital = Hospital(5, storage=PagedStorage)
+
+
+class TestHospitalSparseStorage(TestHospital):
+    # Тот же контракт Hospital с разреженным хранилищем
+    def setUp(self):
+        self.hospital = Hospital(5, storage=SparseStorage)
+
+    def test_huge_ward(self):
+        # Больница на миллиард пациентов создаётся без выделения памяти под статусы
+        hospital = Hospital(10 ** 9, storage=SparseStorage)
+        hospital.set_patient_status(10 ** 9, 3)
+        hospital.discharge(1)
+        self.assertEqual(hospital.calculate_statistics(), {1: 10 ** 9 - 2, 3: 1})
+        self.assertEqual(hospital.recalculate_statistics(), hospital.calculate_statistics())
+        self.assertEqual(hospital.patients.materialized(), 2)
+
+
+class TestHospitalSnapshot(unittest.TestCase):
+    def check_snapshot(self, hospital):
+        # Снимок не видит изменений, сделанных после его создания
+        hospital.set_patient_status(2, 3)
+        view = hospital.snapshot()
+        self.assertIsInstance(view, HospitalSnapshot)
+        hospital.set_patient_status(4, 0)
+        hospital.discharge(1)
+        hospital.discharge_many([1, 2])
+        self.assertEqual(len(view), 5)
+        self.assertEqual(view.get_statuses([1, 2, 3, 4, 5]), [1, 3, 1, 1, 1])
+        self.assertEqual(view.calculate_statistics(), {1: 4, 3: 1})
+        self.assertEqual(view.recalculate_statistics(), {1: 4, 3: 1})
+        self.assertEqual(len(hospital), 2)
+        with self.assertRaises(TypeError):
+            view.set_patient_status(1, 0)
+        with self.assertRaises(TypeError):
+            view.discharge(1)
+        self.assertEqual(view.calculate_statistics(), {1: 4, 3: 1})
+
+    def test_paged_storage(self):
+        hospital = Hospital(5, storage=PagedStorage)
+        self.check_snapshot(hospital)
+
+    def test_copy_fallback(self):
+        # Другие хранилища копируются
+        self.check_snapshot(Hospital(5))
+        self.check_snapshot(Hospital(5, storage=ByteArrayStorage, tombstones=True))
+
+    def test_stable_ids(self):
+        hospital = Hospital(5, storage=PagedStorage, stable_ids=True)
+        hospital.discharge(2)
+        view = hospital.snapshot()
+        hospital.discharge(4)
+        self.assertTrue(view.has_patient(4))
+        self.assertFalse(view.has_patient(2))
+        self.assertFalse(hospital.has_patient(4))
+        self.assertEqual(view.calculate_statistics(), {1: 4})
+
+
+class TestHospitalStableIds(unittest.TestCase):
+    def setUp(self):
+        self.hospital = Hospital(5, storage=ByteArrayStorage, stable_ids=True)
+
+    def test_discharge_keeps_ids(self):
+        # После выписки ID остальных пациентов не меняются
+        self.hospital.set_patient_status(4, 3)
+        self.hospital.discharge(2)
+        self.assertEqual(len(self.hospital.patients), 4)
+        self.assertEqual(self.hospital.get_patient_status(4), 3)
+        self.assertEqual(self.hospital.get_patient_status(5), 1)
+        self.assertEqual(self.hospital.calculate_statistics(), {1: 3, 3: 1})
+        self.assertEqual(self.hospital.recalculate_statistics(), {1: 3, 3: 1})
+
+    def test_discharged_id_is_gone(self):
+        # К выписанному ID больше нельзя обратиться
+        self.hospital.discharge(2)
+        self.assertFalse(self.hospital.has_patient(2))
+        self.assertTrue(self.hospital.has_patient(5))
+        with self.assertRaises(ValueError):
+            self.hospital.get_patient_status(2)
+        with self.assertRaises(ValueError):
+            self.hospital.set_patient_status(2, 0)
+        with self.assertRaises(ValueError):
+            self.hospital.discharge(2)
+
+    def test_discharge_many_keeps_ids(self):
+        self.hospital.discharge_many([1, 3])
+        self.assertEqual(len(self.hospital.patients), 3)
+        self.assertEqual(self.hospital.get_statuses([2, 4, 5]), [1, 1, 1])
+        with self.assertRaises(ValueError):
+            self.hospital.get_statuses([2, 3])
+        with self.assertRaises(ValueError):
+            self.hospital.discharge_many([1])
+
+    def test_invalid_ids(self):
+        for patient_id in (0, -1, 6):
+            self.assertFalse(self.hospital.has_patient(patient_id))
+            with self.assertRaises(ValueError):
+                self.hospital.get_patient_status(patient_id)
+
+
+class TestHospitalStatusIndex(TestHospital):
+    # Тот же контракт Hospital с индексом статусов
+    def setUp(self):
+        self.hospital = Hospital(5, status_index=True)
+
+    def brute_force(self, status):
+        # Эталон - полный проход по базе
+        return [patient_id for patient_id in range(1, len(self.hospital) + 1)
+                if self.hospital.get_patient_status(patient_id) == status]
+
+    def test_patients_in_status(self):
+        self.hospital.set_patient_status(2, 3)
+        self.hospital.set_statuses([4, 5], 3)
+        self.hospital.discharge(1)
+        # После выписки ID сдвинулись: бывшие 2, 4, 5 стали 1, 3, 4
+        self.assertEqual(list(self.hospital.patients_in_status(3)), [1, 3, 4])
+        self.assertEqual(list(self.hospital.patients_in_status(1)), [2])
+        self.assertEqual(list(self.hospital.patients_in_status(3, first_id=2)), [3, 4])
+        self.assertEqual(list(self.hospital.patients_in_status(0)), [])
+
+    def test_first_and_count_in_status(self):
+        self.hospital.change_statuses([1, 3, 5], 2)
+        self.assertEqual(self.hospital.first_patients_in_status(3, 2), [1, 3])
+        self.assertEqual(self.hospital.count_in_status(3, 2, 5), 2)
+        self.assertEqual(self.hospital.count_in_status(1, 1, 5), 2)
+        self.assertEqual(self.hospital.count_in_status(1, 0, 100), 2)
+        self.assertEqual(self.hospital.count_in_status(1, 4, 3), 0)
+
+    def test_index_matches_brute_force(self):
+        # Случайная смена смешанных операций сверяется с полным проходом
+        rng = random.Random(0)
+        hospital = self.hospital = Hospital(300, status_index=True)
+        for _ in range(400):
+            roll = rng.random()
+            patient_id = rng.randint(1, len(hospital))
+            if roll < 0.5:
+                hospital.set_patient_status(patient_id, rng.randrange(4))
+            elif roll < 0.85:
+                hospital.change_statuses([patient_id, rng.randint(1, len(hospital))],
+                                         rng.choice((-1, 1)))
+            elif roll < 0.95:
+                hospital.discharge(patient_id)
+            else:
+                hospital.discharge_many(rng.sample(range(1, len(hospital) + 1), 3))
+        for status in STATUS_TEXT:
+            expected = self.brute_force(status)
+            self.assertEqual(list(hospital.patients_in_status(status)), expected)
+            self.assertEqual(hospital.count_in_status(status, 50, 150),
+                             len([i for i in expected if 50 <= i <= 150]))
+
+    def test_stable_ids(self):
+        hospital = Hospital(6, stable_ids=True, status_index=True)
+        hospital.set_statuses([2, 4, 6], 0)
+        hospital.discharge(4)
+        self.assertEqual(list(hospital.patients_in_status(0)), [2, 6])
+        self.assertEqual(hospital.count_in_status(0, 3, 6), 1)
+        self.assertEqual(hospital.first_patients_in_status(1, 10), [1, 3, 5])
+
+    def test_without_index(self):
+        with self.assertRaises(RuntimeError):
+            list(Hospital(5).patients_in_status(1))
+        with self.assertRaises(RuntimeError):
+            Hospital(5).count_in_status(1, 1, 5)
+
+
 if __name__ == '__main__':
     unittest.main()  # pragma: no cover
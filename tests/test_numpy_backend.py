@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для векторизованной больницы (модуль numpy_backend).
+Тесты NumpyHospital пропускаются, если NumPy не установлен.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+from hospital import numpy_backend
+from hospital.models import Hospital
+from hospital.numpy_backend import HAS_NUMPY, create_hospital
+from tests import test_models
+
+if HAS_NUMPY:
+    from hospital.numpy_backend import NumpyHospital, NumpyStorage
+
+
+@unittest.skipUnless(HAS_NUMPY, "нужен NumPy")
+class TestNumpyHospitalContract(test_models.TestHospital):
+    # Тот же контракт Hospital, что и для эталонной реализации
+    def setUp(self):
+        self.hospital = NumpyHospital(5)
+
+
+@unittest.skipUnless(HAS_NUMPY, "нужен NumPy")
+class TestNumpyHospital(unittest.TestCase):
+    def setUp(self):
+        self.hospital = NumpyHospital(10)
+
+    def test_storage(self):
+        storage = NumpyStorage(4, 2)
+        storage[1] = 0
+        del storage[2]
+        storage.delete_many([0])
+        self.assertEqual(list(storage), [0, 2])
+        self.assertIsInstance(storage[0], int)
+        self.assertEqual(storage.count(2), 1)
+        self.assertEqual(storage.tobytes(), b"\x00\x02")
+
+    def test_matches_reference(self):
+        # Случайная последовательность пакетных операций даёт то же, что и Hospital
+        rng = random.Random(1)
+        reference = Hospital(500)
+        hospital = NumpyHospital(500)
+        for _ in range(200):
+            ids = [rng.randint(1, len(reference)) for _ in range(rng.randint(0, 5))]
+            roll = rng.random()
+            if roll < 0.4:
+                status = rng.randrange(4)
+                reference.set_statuses(ids, status)
+                hospital.set_statuses(ids, status)
+            elif roll < 0.8:
+                delta = rng.choice((-2, -1, 1, 2))
+                self.assertEqual(hospital.change_statuses(ids, delta),
+                                 reference.change_statuses(ids, delta))
+            else:
+                reference.discharge_many(ids)
+                hospital.discharge_many(ids)
+            self.assertEqual(list(hospital.patients), list(reference.patients))
+        self.assertEqual(hospital.calculate_statistics(), reference.calculate_statistics())
+        self.assertEqual(hospital.recalculate_statistics(), reference.recalculate_statistics())
+
+    def test_range_histograms(self):
+        self.hospital.set_statuses([1, 2, 9], 3)
+        self.hospital.set_patient_status(5, 0)
+        self.assertEqual(self.hospital.range_histogram(1, 5), {0: 1, 1: 2, 3: 2})
+        self.assertEqual(self.hospital.range_histogram(8, 100), {1: 2, 3: 1})
+        self.assertEqual(self.hospital.range_histograms(4), [
+            (1, 4, {1: 2, 3: 2}),
+            (5, 8, {0: 1, 1: 3}),
+            (9, 10, {1: 1, 3: 1}),
+        ])
+
+    def test_transition_matrix(self):
+        before = self.hospital.status_array()
+        self.hospital.change_statuses([1, 2, 3], 1)
+        self.hospital.set_patient_status(4, 0)
+        matrix = self.hospital.transition_matrix(before)
+        self.assertEqual(matrix[1], [1, 6, 3, 0])
+        self.assertEqual(sum(map(sum, matrix)), 10)
+        self.hospital.discharge(1)
+        with self.assertRaises(ValueError):
+            self.hospital.transition_matrix(before)
+
+
+class TestCreateHospital(unittest.TestCase):
+    def test_fallback_without_numpy(self):
+        # Без NumPy фабрика возвращает обычный Hospital
+        with patch.object(numpy_backend, "HAS_NUMPY", False):
+            hospital = create_hospital(7)
+        self.assertIs(type(hospital), Hospital)
+        self.assertEqual(hospital.calculate_statistics(), {1: 7})
+
+    def test_default_backend(self):
+        hospital = create_hospital(3)
+        self.assertEqual(type(hospital).__name__, "NumpyHospital" if HAS_NUMPY else "Hospital")
+        self.assertEqual(hospital.get_statuses([1, 2, 3]), [1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
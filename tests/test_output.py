@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для приёмников вывода и шаблонов ответов (hospital.output).
+"""
+
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from hospital.models import STATUS_TEXT
+from hospital.output import BufferedSink, ConsoleSink, Templates
+
+class TestConsoleSink(unittest.TestCase):
+    def test_write(self):
+        # Каждая строка печатается сразу, поток берётся в момент записи
+        sink = ConsoleSink()
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            sink.write("первая")
+            sink.write("вторая")
+            sink.flush()
+        self.assertEqual(fake_out.getvalue(), "первая\nвторая\n")
+
+class TestBufferedSink(unittest.TestCase):
+    def test_flush_on_threshold(self):
+        # Строки записываются одной пачкой, когда их набирается flush_every
+        stream = StringIO()
+        sink = BufferedSink(stream, flush_every=2)
+        sink.write("a")
+        self.assertEqual(stream.getvalue(), "")
+        sink.write("b")
+        self.assertEqual(stream.getvalue(), "a\nb\n")
+        sink.write("c")
+        sink.flush()
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "a\nb\nc\n")
+
+    def test_manual_flush_only(self):
+        # flush_every=None - только явный сброс; по умолчанию поток - sys.stdout
+        sink = BufferedSink(flush_every=None)
+        for index in range(5000):
+            sink.write(str(index))
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            sink.flush()
+        self.assertEqual(fake_out.getvalue().count("\n"), 5000)
+
+    def test_take(self):
+        # take забирает строки без записи в поток
+        stream = StringIO()
+        sink = BufferedSink(stream, flush_every=None)
+        sink.write("a")
+        self.assertEqual(sink.take(), ["a"])
+        self.assertEqual(sink.take(), [])
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "")
+
+class TestTemplates(unittest.TestCase):
+    def test_messages(self):
+        templates = Templates(STATUS_TEXT)
+        self.assertEqual(templates.status[0], 'Статус пациента: "Тяжело болен"')
+        self.assertEqual(templates.new_status[3], 'Новый статус пациента: "Готов к выписке"')
+        self.assertEqual(templates.stayed[3], 'Пациент остался в статусе "Готов к выписке"')
+        self.assertEqual(templates.quoted[2], '"Слегка болен"')
+
+    def test_report(self):
+        # Статусы в порядке кодов, нулевые не выводятся
+        self.assertEqual(Templates(STATUS_TEXT).report(5, {2: 1, 1: 4}), [
+            'В больнице на данный момент находится 5 чел., из них:',
+            '\t- в статусе "Болен": 4 чел.',
+            '\t- в статусе "Слегка болен": 1 чел.',
+        ])
+        self.assertEqual(Templates(STATUS_TEXT).report(0, {}),
+                         ['В больнице на данный момент находится 0 чел., из них:'])
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
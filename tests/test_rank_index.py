@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для рангового индекса (модуль rank_index).
+"""
+
+import unittest
+from hospital.rank_index import RankIndex
+
+
+class TestRankIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RankIndex(10)
+
+    def test_initial_prefix(self):
+        # Изначально каждая позиция имеет вес 1
+        self.assertEqual(self.index.total, 10)
+        self.assertEqual(self.index.prefix(0), 0)
+        self.assertEqual(self.index.prefix(7), 7)
+        self.assertEqual(self.index.prefix(10), 10)
+
+    def test_find_after_removals(self):
+        # Обнулённые позиции пропускаются при поиске по рангу
+        self.index.add(0, -1)
+        self.index.add(3, -1)
+        self.assertEqual(self.index.total, 8)
+        self.assertEqual([self.index.find(rank) for rank in range(8)],
+                         [1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(self.index.prefix(5), 3)
+
+    def test_weights(self):
+        # Произвольные веса (например, размеры блоков)
+        index = RankIndex(3, weight=0)
+        index.add(0, 4)
+        index.add(2, 2)
+        self.assertEqual(index.total, 6)
+        self.assertEqual(index.find(3), 0)
+        self.assertEqual(index.find(4), 2)
+        self.assertEqual(index.prefix(2), 4)
+
+    def test_typecode(self):
+        # 32-битные счётчики: вдвое меньше памяти, те же ответы, копия того же типа
+        index = RankIndex(10, typecode='i')
+        self.assertEqual(index._tree.itemsize, 4)
+        index.add(3, -1)
+        self.assertEqual(index.find(3), 4)
+        self.assertEqual(index.prefix(10), self.index.prefix(10) - 1)
+        self.assertEqual(index.copy()._tree.typecode, 'i')
+
+    def test_empty(self):
+        index = RankIndex(0)
+        self.assertEqual(index.total, 0)
+        self.assertEqual(index.prefix(0), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для сетевого доступа к больнице (модуль server).
+"""
+
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+from unittest.mock import patch
+from hospital.models import Hospital
+from hospital.server import MAX_COMMAND_LINE, HospitalSession, start_server, start_unix_server
+
+
+class TestHospitalSession(unittest.TestCase):
+    def setUp(self):
+        self.session = HospitalSession(Hospital(5))
+
+    def test_command_waits_for_id(self):
+        # Команде не хватает ID: клиент получает приглашение
+        self.assertEqual(self.session.feed("get status"), ["Введите ID пациента: "])
+        self.assertEqual(self.session.feed("3"), ['Статус пациента: "Болен"'])
+
+    def test_discharge_confirmation(self):
+        self.session.hospital.set_patient_status(1, 3)
+        self.assertEqual(self.session.feed("status up"), ["Введите ID пациента: "])
+        self.assertEqual(self.session.feed("1"), ["Желаете этого клиента выписать? (да/нет): "])
+        self.assertEqual(self.session.feed("да"), ["Пациент выписан из больницы"])
+        self.assertEqual(len(self.session.hospital.patients), 4)
+
+    def test_sessions_are_independent(self):
+        # Незавершённая команда одного сеанса не мешает другому
+        other = HospitalSession(self.session.hospital)
+        self.session.hospital.set_patient_status(1, 3)
+        self.session.feed("status up")
+        self.session.feed("1")
+        self.assertEqual(other.feed("status down"), ["Введите ID пациента: "])
+        self.assertEqual(other.feed("2"), ['Новый статус пациента: "Тяжело болен"'])
+        self.assertEqual(self.session.feed("нет"), ['Пациент остался в статусе "Готов к выписке"'])
+
+    def test_one_line_command(self):
+        # Однострочная команда ждёт только подтверждения выписки
+        self.session.hospital.set_patient_status(1, 3)
+        self.assertEqual(self.session.feed("status up 1"),
+                         ["Желаете этого клиента выписать? (да/нет): "])
+        self.assertEqual(self.session.feed("да", "get status 1-2"), [
+            "Пациент выписан из больницы",
+            'Статус пациента 1: "Болен"',
+            'Статус пациента 2: "Болен"',
+        ])
+
+    def test_stop(self):
+        self.assertEqual(self.session.feed("STOP"), ["Сеанс завершён."])
+        self.assertFalse(self.session.running)
+
+    def test_internal_error_keeps_session(self):
+        # Сбой команды - строка с ошибкой, сеанс продолжает работу со следующей строки
+        with patch.object(self.session.hospital, 'get_patient_status', side_effect=MemoryError):
+            self.assertEqual(self.session.feed("get status 1", "calculate statistics")[0],
+                             "Ошибка. Команда не выполнена из-за внутренней ошибки (MemoryError)")
+        self.assertEqual(self.session.feed("get status 1"), ['Статус пациента: "Болен"'])
+        self.assertTrue(self.session.running)
+
+    def test_long_line_rejected(self):
+        # Слишком длинная строка не разбирается; ожидающая ввода команда спрашивает снова
+        long_line = "get status " + "1 " * MAX_COMMAND_LINE + "x"
+        error = f"Ошибка. Строка длиннее {MAX_COMMAND_LINE} символов не выполняется"
+        self.assertEqual(self.session.feed(long_line), [error])
+        self.assertEqual(self.session.feed("status up"), ["Введите ID пациента: "])
+        self.assertEqual(self.session.feed(long_line), [error, "Введите ID пациента: "])
+        self.assertEqual(self.session.feed("2"), ['Новый статус пациента: "Слегка болен"'])
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hospital = Hospital(200)
+        self.server = await start_server(self.hospital, port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def request(self, lines):
+        # Отправляет все строки сразу (конвейер) и читает ответ до закрытия соединения
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        return data.decode("utf-8").splitlines()
+
+    async def test_pipelined_commands(self):
+        responses = await self.request([
+            "узнать статус пациента", "200",
+            "status up", "2",
+            "discharge", "4",
+            "рассчитать статистику",
+            "стоп",
+        ])
+        self.assertEqual(responses, [
+            'Статус пациента: "Болен"',
+            'Новый статус пациента: "Слегка болен"',
+            "Пациент выписан из больницы",
+            "В больнице на данный момент находится 199 чел., из них:",
+            '\t- в статусе "Болен": 198 чел.',
+            '\t- в статусе "Слегка болен": 1 чел.',
+            "Сеанс завершён.",
+        ])
+
+    async def test_many_clients_share_hospital(self):
+        await asyncio.gather(*(
+            self.request(["status down", str(patient_id), "stop"])
+            for patient_id in range(1, 101)
+        ))
+        self.assertEqual(self.hospital.calculate_statistics(), {0: 100, 1: 100})
+
+    async def test_slow_client_does_not_block_others(self):
+        # Клиент, оставивший команду незавершённой, не задерживает остальных
+        slow_reader, slow_writer = await asyncio.open_connection("127.0.0.1", self.port)
+        slow_writer.write("status up\n".encode("utf-8"))
+        await slow_writer.drain()
+        self.assertEqual(await slow_reader.readline(), "Введите ID пациента: \n".encode("utf-8"))
+        responses = await asyncio.wait_for(self.request(["get status", "1", "stop"]), 1)
+        self.assertEqual(responses, ['Статус пациента: "Болен"', "Сеанс завершён."])
+        # Медленный клиент дописывает команду следующей пачкой
+        slow_writer.write("2\n".encode("utf-8"))
+        await slow_writer.drain()
+        self.assertEqual(await slow_reader.readline(),
+                         'Новый статус пациента: "Слегка болен"\n'.encode("utf-8"))
+        slow_writer.close()
+        await slow_writer.wait_closed()
+
+    async def test_internal_error_keeps_connection(self):
+        with patch.object(self.hospital, 'discharge', side_effect=RuntimeError("сбой")):
+            responses = await self.request(["discharge 1", "get status 1", "stop"])
+        self.assertEqual(responses, [
+            "Ошибка. Команда не выполнена из-за внутренней ошибки (RuntimeError)",
+            'Статус пациента: "Болен"',
+            "Сеанс завершён.",
+        ])
+
+    async def test_long_batch_does_not_block_others(self):
+        # Длинная пачка тяжёлых команд одного клиента не задерживает ответ другому:
+        # короткий запрос завершается раньше, чем обработка пачки
+        loop = asyncio.get_running_loop()
+        heavy_reader, heavy_writer = await asyncio.open_connection("127.0.0.1", self.port)
+        heavy_writer.write(b"get status 1-200\n" * 2000 + "stop\n".encode("utf-8"))
+        await heavy_writer.drain()
+
+        async def heavy_done():
+            # Пачка заканчивается командой «стоп»: ответ читается до закрытия соединения
+            data = await heavy_reader.read()
+            heavy_writer.close()
+            await heavy_writer.wait_closed()
+            return data, loop.time()
+
+        heavy = asyncio.create_task(heavy_done())
+        await asyncio.sleep(0)
+        responses = await self.request(["get status 1", "stop"])
+        light_finished = loop.time()
+        self.assertEqual(responses, ['Статус пациента: "Болен"', "Сеанс завершён."])
+        data, heavy_finished = await heavy
+        self.assertTrue(data.decode("utf-8").endswith("Сеанс завершён.\n"))
+        self.assertLess(light_finished, heavy_finished)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "нужны Unix-сокеты")
+class TestUnixServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hospital = Hospital(200)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hospital.sock")
+        # Сокет, оставшийся от прежнего запуска, заменяется новым
+        with socket.socket(socket.AF_UNIX) as stale:
+            stale.bind(self.path)
+        self.server = await start_unix_server(self.hospital, self.path)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.tmp.cleanup()
+
+    async def request(self, lines):
+        # Клиент отправляет строки, закрывает соединение на запись и читает ответ до конца
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+        writer.write_eof()
+        data = await asyncio.wait_for(reader.read(), 1)
+        writer.close()
+        await writer.wait_closed()
+        return data.decode("utf-8").splitlines()
+
+    async def test_state_survives_connections(self):
+        self.assertEqual(await self.request(["status up 5"]), ['Новый статус пациента: "Слегка болен"'])
+        self.assertEqual(await self.request(["get status 5", "discharge 1"]),
+                         ['Статус пациента: "Слегка болен"', "Пациент выписан из больницы"])
+        self.assertEqual(len(self.hospital), 199)
+
+    async def test_incomplete_command_gets_prompt(self):
+        # Конец ввода посреди команды: клиент получает приглашение и конец ответа
+        self.assertEqual(await self.request(["status up"]), ["Введите ID пациента: "])
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для сети больниц (модуль sharding).
+"""
+
+import random
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from hospital.app import HospitalApp
+from hospital.models import Hospital
+from hospital.sharding import ShardedHospital, count_statuses
+
+
+class TestShardedHospital(unittest.TestCase):
+    def setUp(self):
+        self.sharded = ShardedHospital(10, shards=3)
+
+    def test_routing(self):
+        # Шарды получают 4, 3 и 3 пациента, глобальные ID сквозные
+        self.assertEqual([len(shard) for shard in self.sharded.shards], [4, 3, 3])
+        self.sharded.set_patient_status(5, 3)
+        self.assertEqual(self.sharded.shards[1].get_patient_status(1), 3)
+        self.assertEqual(self.sharded.get_patient_status(5), 3)
+        with self.assertRaises(ValueError):
+            self.sharded.get_patient_status(11)
+        with self.assertRaises(ValueError):
+            self.sharded.get_patient_status(0)
+
+    def test_routing_after_discharge(self):
+        # После выписки глобальные ID сдвигаются через границы шардов
+        self.sharded.set_patient_status(5, 3)
+        self.sharded.discharge(2)
+        self.assertEqual(len(self.sharded), 9)
+        self.assertEqual(self.sharded.get_patient_status(4), 3)
+        self.assertFalse(self.sharded.has_patient(10))
+
+    def test_matches_single_hospital(self):
+        # Случайная последовательность операций даёт тот же результат, что и один Hospital
+        rng = random.Random(1)
+        single = Hospital(1000)
+        sharded = ShardedHospital(1000, shards=7)
+        for _ in range(500):
+            patient_id = rng.randint(1, len(single))
+            roll = rng.random()
+            if roll < 0.6:
+                status = rng.randrange(4)
+                single.set_patient_status(patient_id, status)
+                sharded.set_patient_status(patient_id, status)
+            elif roll < 0.8:
+                single.discharge(patient_id)
+                sharded.discharge(patient_id)
+            elif roll < 0.9:
+                ids = [rng.randint(1, len(single)) for _ in range(5)]
+                single.discharge_many(ids)
+                sharded.discharge_many(ids)
+            else:
+                ids = [rng.randint(1, len(single)) for _ in range(5)]
+                self.assertEqual(single.change_statuses(ids, -1), sharded.change_statuses(ids, -1))
+        self.assertEqual(len(sharded), len(single))
+        self.assertEqual(sharded.get_statuses(range(1, len(single) + 1)), list(single.patients))
+        self.assertEqual(sharded.calculate_statistics(), single.calculate_statistics())
+
+    def test_bulk_validation_is_atomic(self):
+        with self.assertRaises(ValueError):
+            self.sharded.set_statuses([1, 5, 11], 0)
+        with self.assertRaises(ValueError):
+            self.sharded.set_statuses([1], 9)
+        self.assertEqual(self.sharded.calculate_statistics(), {1: 10})
+        self.sharded.set_statuses([1, 5, 10], 0)
+        self.assertEqual(self.sharded.calculate_statistics(), {0: 3, 1: 7})
+
+    def test_stable_ids(self):
+        sharded = ShardedHospital(10, shards=3, stable_ids=True)
+        sharded.discharge(2)
+        sharded.set_patient_status(5, 2)
+        self.assertFalse(sharded.has_patient(2))
+        self.assertEqual(sharded.get_patient_status(5), 2)
+        self.assertEqual(len(sharded), 9)
+        self.assertFalse(sharded.has_patient(11))
+
+    def test_recalculate_on_process_pool(self):
+        # Map-reduce по шардам в пуле процессов совпадает со счётчиками
+        self.sharded.set_patient_status(1, 0)
+        self.sharded.set_patient_status(9, 2)
+        self.sharded.discharge(6)
+        self.assertEqual(self.sharded.recalculate_statistics(),
+                         self.sharded.calculate_statistics())
+        self.assertEqual(self.sharded.calculate_statistics(), {0: 1, 1: 7, 2: 1})
+
+    def test_count_statuses(self):
+        self.assertEqual(count_statuses(b"\x01\x01\x03"), {1: 2, 3: 1})
+        self.assertEqual(count_statuses(b""), {})
+
+    def test_app_on_sharded_hospital(self):
+        app = HospitalApp(ShardedHospital(200, shards=4))
+        with patch('builtins.input', side_effect=["discharge", "4", "calculate statistics", "stop"]), \
+             patch('sys.stdout', new=StringIO()) as fake_out:
+            app.run()
+        self.assertIn('В больнице на данный момент находится 199 чел., из них:', fake_out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для снимков состояния больницы (модуль snapshot).
+"""
+
+import os
+import tempfile
+import unittest
+from hospital.models import Hospital
+from hospital.snapshot import save_snapshot, load_snapshot, flush_snapshot
+from hospital.storage import ByteArrayStorage, MmapStorage
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "ward.snap")
+        self.hospital = Hospital(6, storage=ByteArrayStorage)
+        self.hospital.set_patient_status(1, 0)
+        self.hospital.set_patient_status(5, 3)
+        self.hospital.discharge(2)
+
+    def test_round_trip(self):
+        save_snapshot(self.hospital, self.path)
+        loaded = load_snapshot(self.path)
+        self.assertIsInstance(loaded.patients, MmapStorage)
+        self.assertEqual(len(loaded.patients), 5)
+        self.assertEqual(list(loaded.patients), [0, 1, 1, 3, 1])
+        self.assertEqual(loaded.calculate_statistics(), {0: 1, 1: 3, 3: 1})
+        self.assertEqual(loaded.recalculate_statistics(), {0: 1, 1: 3, 3: 1})
+
+    def test_copy_on_write_by_default(self):
+        # Изменения загруженной больницы не попадают в файл
+        save_snapshot(self.hospital, self.path)
+        loaded = load_snapshot(self.path)
+        loaded.set_patient_status(2, 2)
+        loaded.discharge(1)
+        self.assertEqual(list(loaded.patients), [2, 1, 3, 1])
+        self.assertEqual(loaded.calculate_statistics(), {1: 2, 2: 1, 3: 1})
+        self.assertEqual(list(load_snapshot(self.path).patients), [0, 1, 1, 3, 1])
+
+    def test_writable_flush(self):
+        # В режиме записи изменения фиксируются явным flush_snapshot
+        save_snapshot(self.hospital, self.path)
+        loaded = load_snapshot(self.path, writable=True)
+        loaded.discharge_many([1, 3])
+        loaded.set_patient_status(1, 2)
+        flush_snapshot(loaded)
+        reloaded = load_snapshot(self.path)
+        self.assertEqual(list(reloaded.patients), [2, 3, 1])
+        self.assertEqual(reloaded.calculate_statistics(), {1: 1, 2: 1, 3: 1})
+
+    def test_stable_ids(self):
+        hospital = Hospital(4, stable_ids=True)
+        hospital.discharge(2)
+        hospital.set_patient_status(4, 2)
+        save_snapshot(hospital, self.path)
+        loaded = load_snapshot(self.path)
+        self.assertTrue(loaded.stable_ids)
+        self.assertEqual(len(loaded.patients), 3)
+        self.assertFalse(loaded.has_patient(2))
+        self.assertEqual(loaded.get_patient_status(4), 2)
+        self.assertEqual(loaded.calculate_statistics(), {1: 2, 2: 1})
+
+    def test_stable_ids_lazy_index(self):
+        # Загрузка берёт число пациентов из заголовка и не строит индекс слотов
+        hospital = Hospital(5, stable_ids=True)
+        hospital.discharge(2)
+        save_snapshot(hospital, self.path)
+        loaded = load_snapshot(self.path)
+        self.assertIsNone(loaded.patients._alive)
+        loaded.discharge(4)
+        self.assertEqual(len(loaded.patients), 3)
+        self.assertIsNone(loaded.patients._alive)
+        # Индекс строится при первом обращении по порядковому номеру
+        self.assertEqual(loaded.patients.slot_of(1), 2)
+        self.assertIsNotNone(loaded.patients._alive)
+        self.assertEqual(len(loaded.patients), 3)
+
+    def test_empty_hospital(self):
+        save_snapshot(Hospital(0), self.path)
+        loaded = load_snapshot(self.path)
+        self.assertEqual(len(loaded.patients), 0)
+        self.assertEqual(loaded.calculate_statistics(), {})
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot at all, just some text bytes here......")
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
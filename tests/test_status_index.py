@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для индекса статусов (модуль status_index).
+"""
+
+import unittest
+from hospital.status_index import StatusIndex
+
+
+class TestStatusIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = StatusIndex(8, range(4))
+
+    def test_initial_status(self):
+        # Изначально все слоты в статусе 1
+        self.assertEqual(list(self.index.slots(1)), list(range(8)))
+        self.assertEqual(list(self.index.slots(0)), [])
+        self.assertEqual(self.index.count(1, 2, 5), 3)
+
+    def test_move(self):
+        self.index.move(3, 1, 3)
+        self.index.move(6, 1, 3)
+        self.index.move(6, 3, 3)
+        self.assertEqual(list(self.index.slots(3)), [3, 6])
+        self.assertEqual(list(self.index.slots(3, start=4)), [6])
+        self.assertEqual(self.index.count(1, 0, 8), 6)
+        self.assertEqual(self.index.count(3, 0, 4), 1)
+
+    def test_remove(self):
+        # Убранный слот не принадлежит ни одному статусу
+        self.index.remove(0, 1)
+        self.index.move(1, 1, 2)
+        self.index.remove(1, 2)
+        self.assertEqual(list(self.index.slots(1)), list(range(2, 8)))
+        self.assertEqual(list(self.index.slots(2)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Unit‑тесты для хранилищ статусов пациентов (модуль storage).
+"""
+
+import mmap
+import unittest
+from unittest.mock import patch
+from hospital.storage import (
+    ListStorage, ByteArrayStorage, MmapStorage, PagedStorage, SparseStorage, TombstoneStorage,
+    DISCHARGED
+)
+
+
+class TestListStorage(unittest.TestCase):
+    storage_class = ListStorage
+
+    def setUp(self):
+        self.storage = self.storage_class(4, 1)
+
+    def test_initial_state(self):
+        # Все пациенты создаются в одном статусе
+        self.assertEqual(len(self.storage), 4)
+        self.assertEqual(list(self.storage), [1, 1, 1, 1])
+
+    def test_set_and_get(self):
+        self.storage[2] = 3
+        self.assertEqual(self.storage[2], 3)
+        self.assertEqual(self.storage.count(3), 1)
+        self.assertEqual(self.storage.count(1), 3)
+
+    def test_delete_shifts(self):
+        # Удаление сдвигает последующих пациентов
+        self.storage[3] = 0
+        del self.storage[1]
+        self.assertEqual(len(self.storage), 3)
+        self.assertEqual(list(self.storage), [1, 1, 0])
+
+    def test_delete_many(self):
+        # Удаление набора индексов за один проход
+        for index in range(4):
+            self.storage[index] = index
+        self.storage.delete_many([0, 2])
+        self.assertEqual(list(self.storage), [1, 3])
+        self.storage.delete_many([])
+        self.assertEqual(len(self.storage), 2)
+
+    def test_tobytes(self):
+        self.storage[1] = 3
+        self.assertEqual(self.storage.tobytes(), b"\x01\x03\x01\x01")
+
+    def test_empty(self):
+        self.assertEqual(len(self.storage_class(0, 1)), 0)
+        self.assertEqual(self.storage_class(0, 1).count(1), 0)
+
+
+class TestByteArrayStorage(TestListStorage):
+    storage_class = ByteArrayStorage
+
+    def test_status_out_of_byte_range(self):
+        # В байт не помещаются коды статусов вне диапазона 0..255
+        with self.assertRaises(ValueError):
+            self.storage[0] = 256
+
+
+class TestMmapStorage(TestListStorage):
+    # Анонимное отображение: 2 байта «заголовка», 4 статуса и запас в конце
+    @staticmethod
+    def storage_class(count, status):
+        mm = mmap.mmap(-1, count + 4)
+        mm[2:2 + count] = bytes([status]) * count
+        return MmapStorage(mm, 2, count)
+
+    def test_bounds_inside_mapping(self):
+        # Байты за пределами базы недоступны, хотя отображение длиннее
+        with self.assertRaises(IndexError):
+            self.storage[4]
+        del self.storage[0]
+        with self.assertRaises(IndexError):
+            self.storage[3]
+
+    def test_count_by_blocks(self):
+        # Подсчёт по блокам даёт тот же результат, что и по всей базе сразу
+        self.storage[1] = 0
+        self.storage[3] = 0
+        with patch("hospital.storage.COUNT_BLOCK", 3):
+            self.assertEqual(self.storage.count(0), 2)
+            self.assertEqual(self.storage.count(1), 2)
+
+
+class TestPagedStorage(TestListStorage):
+    # Маленькие страницы, чтобы база занимала несколько страниц
+    @staticmethod
+    def storage_class(count, status):
+        return PagedStorage(count, status, page_size=3)
+
+    def test_pages(self):
+        storage = PagedStorage(10, 1, page_size=4)
+        self.assertEqual([len(page) for page in storage._pages], [4, 4, 2])
+        storage[9] = 3
+        del storage[0]
+        del storage[4]
+        storage.delete_many([0, 5, 6])
+        self.assertEqual(list(storage), [1, 1, 1, 1, 3])
+        self.assertEqual(storage[4], 3)
+        with self.assertRaises(IndexError):
+            storage[5]
+
+    def test_from_bytes(self):
+        storage = PagedStorage.from_bytes(b"\x00\x01\x02\x03\x00", page_size=2)
+        self.assertEqual(list(storage), [0, 1, 2, 3, 0])
+        self.assertEqual(storage.count(0), 2)
+
+    def test_snapshot_copy_on_write(self):
+        storage = PagedStorage(12, 1, page_size=4)
+        view = storage.snapshot()
+        storage[0] = 3
+        del storage[5]
+        storage.delete_many([0, 1])
+        # Снимок видит базу на момент создания
+        self.assertEqual(list(view), [1] * 12)
+        self.assertEqual(len(view), 12)
+        self.assertEqual(view.count(3), 0)
+        self.assertEqual(list(storage), [1] * 9)
+        # Скопированы только изменённые страницы, третья - общая
+        self.assertIsNot(storage._pages[0], view._pages[0])
+        self.assertIsNot(storage._pages[1], view._pages[1])
+        self.assertIs(storage._pages[2], view._pages[2])
+
+    def test_snapshot_is_read_only(self):
+        view = PagedStorage(4, 1).snapshot()
+        with self.assertRaises(TypeError):
+            view[0] = 2
+        with self.assertRaises(TypeError):
+            del view[0]
+        self.assertEqual(len(view), 4)
+
+    def test_no_copies_after_snapshot_released(self):
+        storage = PagedStorage(8, 1, page_size=4)
+        view = storage.snapshot()
+        del view
+        page = storage._pages[1]
+        storage[5] = 0
+        self.assertIs(storage._pages[1], page)
+
+
+class TestSparseStorage(TestListStorage):
+    @staticmethod
+    def storage_class(count, status):
+        return SparseStorage(count, status, page_size=3)
+
+    def test_pages_on_first_write(self):
+        # Страницы выделяются только при первой записи
+        storage = SparseStorage(10 ** 9, 1)
+        self.assertEqual(storage.materialized(), 0)
+        self.assertEqual(storage[10 ** 9 - 1], 1)
+        storage[123456789] = 3
+        self.assertEqual(storage.materialized(), 1)
+        self.assertEqual(storage[123456789], 3)
+        self.assertEqual(storage.count(3), 1)
+        self.assertEqual(storage.count(1), 10 ** 9 - 1)
+        del storage[0]
+        self.assertEqual(storage.materialized(), 2)
+        self.assertEqual(len(storage), 10 ** 9 - 1)
+        self.assertEqual(storage[123456788], 3)
+
+    def test_densify(self):
+        # После заполнения больше половины базы заполняются все страницы
+        storage = SparseStorage(10, 1, page_size=2, densify_ratio=0.5)
+        storage[0] = 0
+        storage[2] = 0
+        self.assertFalse(storage.dense)
+        self.assertEqual(storage.materialized(), 2)
+        storage[4] = 0
+        self.assertTrue(storage.dense)
+        self.assertEqual(storage.materialized(), 5)
+        self.assertEqual(list(storage), [0, 1, 0, 1, 0, 1, 1, 1, 1, 1])
+
+    def test_snapshot(self):
+        storage = SparseStorage(8, 1, page_size=4)
+        view = storage.snapshot()
+        storage[5] = 2
+        del storage[0]
+        self.assertEqual(view.tobytes(), b"\x01" * 8)
+        self.assertEqual(view.materialized(), 0)
+        self.assertEqual(storage.tobytes(), b"\x01\x01\x01\x01\x02\x01\x01")
+
+
+class TestTombstoneStorage(TestListStorage):
+    # Тот же контракт хранилища поверх обёртки с пометкой выписанных
+    def setUp(self):
+        self.storage = TombstoneStorage(ByteArrayStorage(4, 1))
+
+    def test_empty(self):
+        self.assertEqual(len(TombstoneStorage(ListStorage(0, 1))), 0)
+
+    def test_delete_keeps_slots(self):
+        # Удаление не сдвигает физические слоты
+        self.storage[3] = 0
+        del self.storage[1]
+        self.assertEqual(len(self.storage.slots), 4)
+        self.assertEqual(self.storage.slots[1], DISCHARGED)
+        self.assertEqual(self.storage.slot_of(2), 3)
+        self.assertEqual(self.storage.index_of(3), 2)
+        self.assertFalse(self.storage.is_alive(1))
+        self.assertTrue(self.storage.is_alive(3))
+        self.assertFalse(self.storage.is_alive(4))
+
+    def test_existing_tombstones(self):
+        # Обёртка учитывает слоты, помеченные до её создания
+        slots = ByteArrayStorage(4, 1)
+        slots[0] = DISCHARGED
+        slots[2] = DISCHARGED
+        storage = TombstoneStorage(slots)
+        self.assertEqual(len(storage), 2)
+        self.assertEqual(storage.slot_of(1), 3)
+        self.assertEqual(storage.tobytes(), b"\x01\x01")
+
+    def test_snapshot(self):
+        # Снимок сохраняет и статусы, и соответствие индексов слотам
+        view = self.storage.snapshot()
+        self.storage[0] = 3
+        del self.storage[1]
+        self.assertEqual(list(view), [1, 1, 1, 1])
+        self.assertEqual(view.slot_of(2), 2)
+        self.assertEqual(list(self.storage), [3, 1, 1])
+        paged = TombstoneStorage(PagedStorage(4, 1))
+        self.assertTrue(paged.snapshot().slots.frozen)
+
+    def test_index_out_of_range(self):
+        del self.storage[0]
+        with self.assertRaises(IndexError):
+            self.storage[3]
+        with self.assertRaises(IndexError):
+            self.storage[-1]
+
+
+if __name__ == '__main__':
+    unittest.main()  # pragma: no cover